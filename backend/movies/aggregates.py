@@ -0,0 +1,256 @@
+# movies/aggregates.py
+"""
+비정규화해 둔 집계 컬럼 관리
+
+Movie 평점 집계 (rating_count / rating_sum / rating_avg / rating_histogram)
+- 평점 저장/수정 시에는 apply_rating_changes() 로 증분 갱신 (save_rating / save_ratings)
+- 평점 삭제(유저 삭제 CASCADE 포함)는 signals 에서 같은 함수로 빼기
+- 값이 어긋났을 때는 rebuild_rating_stats() 로 Rating 테이블에서 다시 계산
+
+Review.like_count
+- 좋아요 토글 시 toggle_review_like() 에서 F() 로 +1 / -1
+- 값이 어긋났을 때는 reconcile_like_counts()
+
+Movie.latest_review
+- 리뷰 작성 시 signals 에서 새 리뷰로, 삭제 시 latest_review_subquery() 로 다시 지정 (bulk_create 경로는 직접)
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from . import cache as movie_cache
+from .models import LikeReview, Movie, Rating, Review
+
+SCORE_QUANT = Decimal('0.1')
+
+
+def score_key(score):
+    """히스토그램 키: Decimal('4') / 4 / '4.0' → '4.0'"""
+    return str(Decimal(str(score)).quantize(SCORE_QUANT))
+
+
+def _apply_to_movie(movie, changes):
+    histogram = dict(movie.rating_histogram or {})
+    count = movie.rating_count
+    total = Decimal(movie.rating_sum)
+
+    for old_score, new_score in changes:
+        if old_score is not None:
+            key = score_key(old_score)
+            count -= 1
+            total -= Decimal(key)
+            left = histogram.get(key, 0) - 1
+            if left > 0:
+                histogram[key] = left
+            else:
+                histogram.pop(key, None)
+        if new_score is not None:
+            key = score_key(new_score)
+            count += 1
+            total += Decimal(key)
+            histogram[key] = histogram.get(key, 0) + 1
+
+    movie.rating_count = max(count, 0)
+    movie.rating_sum = total if movie.rating_count else Decimal(0)
+    movie.rating_avg = float(total / count) if count > 0 else 0
+    movie.rating_histogram = histogram
+
+
+def apply_rating_changes(changes):
+    """
+    changes: {movie_id: [(old_score, new_score), ...]}
+      - 새 평점:   (None, 4)
+      - 평점 수정: (3, 4)
+      - 평점 삭제: (3, None)
+
+    Movie row 를 잠그고(select_for_update) 한 번에 갱신한다.
+    반드시 transaction.atomic() 안에서 호출할 것.
+    """
+    if not changes:
+        return
+
+    movies = list(
+        Movie.objects.select_for_update()
+        .filter(id__in=changes.keys())
+        .order_by('id')
+        .only('id', 'rating_count', 'rating_sum', 'rating_avg', 'rating_histogram')
+    )
+    for movie in movies:
+        _apply_to_movie(movie, changes[movie.id])
+
+    Movie.objects.bulk_update(
+        movies,
+        ['rating_count', 'rating_sum', 'rating_avg', 'rating_histogram'],
+    )
+
+
+def save_rating(user, movie_id, score):
+    """평점 생성/수정 + 집계 갱신을 한 트랜잭션으로 처리. (rating, created) 반환"""
+    with transaction.atomic():
+        rating = (
+            Rating.objects.select_for_update()
+            .filter(user=user, movie_id=movie_id)
+            .first()
+        )
+        if rating is None:
+            rating = Rating.objects.create(user=user, movie_id=movie_id, score=score)
+            created, old_score = True, None
+        else:
+            old_score = rating.score
+            rating.score = score
+            rating.save(update_fields=['score', 'updated_at'])
+            created = False
+
+        apply_rating_changes({movie_id: [(old_score, score)]})
+
+    return rating, created
+
+
+def save_ratings(user, scores):
+    """
+    평점 여러 개를 한 트랜잭션으로 upsert + 집계 갱신. (생성 수, 수정 수) 반환
+      scores: {movie_id: score}  (영화 id 는 미리 검증된 것)
+    영화 수와 상관없이 쿼리 수 일정:
+      기존 평점 잠금 조회 1 → bulk_create(update_conflicts) 1 → Movie 잠금 조회 1 → bulk_update 1
+    """
+    if not scores:
+        return 0, 0
+
+    with transaction.atomic():
+        old_scores = dict(
+            Rating.objects.select_for_update()
+            .filter(user=user, movie_id__in=scores.keys())
+            .values_list('movie_id', 'score')
+        )
+        Rating.objects.bulk_create(
+            [Rating(user=user, movie_id=movie_id, score=score) for movie_id, score in scores.items()],
+            update_conflicts=True,
+            unique_fields=['user', 'movie'],
+            update_fields=['score', 'updated_at'],
+        )
+        apply_rating_changes({
+            movie_id: [(old_scores.get(movie_id), score)]
+            for movie_id, score in scores.items()
+            if old_scores.get(movie_id) != score
+        })
+
+        # bulk_create 는 시그널이 없으므로 캐시 버전은 직접 (커밋 직후에 올라감)
+        movie_cache.bump_movies(scores.keys(), orders=('rating_avg',))
+        movie_cache.bump(movie_cache.user_key(user.pk))
+
+    created = len(scores.keys() - old_scores.keys())
+    return created, len(scores) - created
+
+
+def rebuild_rating_stats(movie_ids=None, batch_size=1000):
+    """
+    Rating 테이블에서 (movie, score) 별 GROUP BY 한 번으로 집계를 다시 계산.
+    movie_ids 를 주면 해당 영화만 다시 계산한다. 갱신한 영화 수 반환.
+    """
+    ratings = Rating.objects.all()
+    movies = Movie.objects.all()
+    if movie_ids is not None:
+        ratings = ratings.filter(movie_id__in=movie_ids)
+        movies = movies.filter(id__in=movie_ids)
+
+    histograms = defaultdict(dict)
+    rows = (
+        ratings.values('movie_id', 'score')
+        .annotate(n=Count('id'))
+        .order_by()
+    )
+    for row in rows:
+        histograms[row['movie_id']][score_key(row['score'])] = row['n']
+
+    fields = ['rating_count', 'rating_sum', 'rating_avg', 'rating_histogram']
+    updated = 0
+    batch = []
+    for movie in movies.only('id', *fields).iterator(chunk_size=batch_size):
+        histogram = histograms.get(movie.id, {})
+        count = sum(histogram.values())
+        total = sum((Decimal(k) * n for k, n in histogram.items()), Decimal(0))
+
+        movie.rating_count = count
+        movie.rating_sum = total
+        movie.rating_avg = float(total / count) if count else 0
+        movie.rating_histogram = histogram
+        batch.append(movie)
+
+        if len(batch) >= batch_size:
+            Movie.objects.bulk_update(batch, fields)
+            updated += len(batch)
+            batch = []
+
+    if batch:
+        Movie.objects.bulk_update(batch, fields)
+        updated += len(batch)
+
+    # 평점/평균이 한꺼번에 바뀌므로 응답 캐시 전체 무효화
+    movie_cache.bump_all()
+    return updated
+
+
+def toggle_review_like(user, review_id):
+    """
+    좋아요 토글. (liked, like_count) 반환, 리뷰가 없으면 None
+    LikeReview 행과 Review.like_count 를 한 트랜잭션에서 같이 바꾼다.
+    """
+    reviews = Review.objects.filter(pk=review_id)
+    try:
+        with transaction.atomic():
+            deleted, _ = LikeReview.objects.filter(review_id=review_id, user=user).delete()
+            if deleted:
+                reviews.update(like_count=Greatest(F('like_count') - 1, 0))
+                liked = False
+            else:
+                if not reviews.update(like_count=F('like_count') + 1):
+                    return None
+                LikeReview.objects.create(review_id=review_id, user=user)
+                liked = True
+    except IntegrityError:
+        # 같은 유저가 동시에 두 번 누른 경우: 먼저 들어간 요청 기준으로 응답
+        liked = True
+
+    row = reviews.values_list('like_count', 'movie_id').first()
+    if row is None:
+        # 토글하는 사이에 리뷰가 지워짐 (좋아요 행도 CASCADE 로 같이 사라짐)
+        return None
+    like_count, movie_id = row
+    # 리뷰 목록의 좋아요 수 + 내 좋아요 여부
+    movie_cache.bump(movie_cache.review_key(movie_id), movie_cache.user_key(user.pk))
+    return liked, like_count
+
+
+def reconcile_like_counts():
+    """LikeReview 개수와 다른 Review.like_count 를 UPDATE 한 번으로 맞춘다. 고친 리뷰 수 반환"""
+    actual = Coalesce(
+        Subquery(
+            LikeReview.objects.filter(review=OuterRef('pk'))
+            .order_by()
+            .values('review')
+            .annotate(n=Count('id'))
+            .values('n')
+        ),
+        0,
+    )
+    fixed = (
+        Review.objects.annotate(actual=actual)
+        .exclude(like_count=F('actual'))
+        .update(like_count=actual)
+    )
+    if fixed:
+        movie_cache.bump_all()
+    return fixed
+
+
+def latest_review_subquery():
+    """영화별 최신 리뷰 id ((movie, -created_at, -id) 인덱스 사용)"""
+    return Subquery(
+        Review.objects.filter(movie=OuterRef('pk'))
+        .order_by('-created_at', '-id')
+        .values('id')[:1]
+    )
+
@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class MoviesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'movies'
+
+    def ready(self):
+        from django.conf import settings
+
+        from . import signals  # noqa: F401
+
+        if getattr(settings, 'PROFILING', False):
+            from . import profiling
+            profiling.install()
+
+        if getattr(settings, 'BENCH_DB_LATENCY_MS', 0):
+            from . import benchmark
+            benchmark.simulate_db_latency(settings.BENCH_DB_LATENCY_MS / 1000)
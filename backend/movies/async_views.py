@@ -0,0 +1,323 @@
+# movies/async_views.py
+"""
+ASGI 용 async 뷰 (ASYNC_VIEWS=1 일 때 movies/urls.py 가 같은 경로 앞에 끼운다)
+
+대상: 읽기 위주 엔드포인트의 GET / HEAD
+  영화 목록(+트렌딩 / 평점순), 상세, 리뷰 목록, 비슷한 영화, 내 워치리스트
+  POST / DELETE / OPTIONS 같은 나머지 메서드는 기존 DRF 뷰로 그대로 넘긴다 (sync_to_async)
+
+- 응답은 sync 뷰와 바이트 단위로 같다 (같은 캐시 키 / ETag / 304, 본문은 FastJSONRenderer 로 JSON 만)
+- 쿼리 조립(정렬, cursor, 필터, 권한 없는 기본 queryset)은 DRF 뷰 인스턴스를 만들어 빌려 쓰고
+  (dispatch 는 하지 않는다) 실행만 async ORM / async 캐시 API 로 한다.
+  캐시 미스 때만 도는 무거운 빌드(비슷한 영화 이웃 계산, 패싯 색인)는 기존 sync 코드를 스레드에서.
+- 인증은 JWTAuthentication 과 같은 규칙 (유저 조회만 스레드에서). 실패하면 DRF 와 같은 401 본문
+  (DRF 테스트 클라이언트의 force_authenticate 는 통하지 않는다. 응답도 DRF Response 가 아니라 .data 가 없다)
+- 권한 클래스는 보지 않는다: 대상 뷰가 모두 AllowAny
+
+주의: Django 5.2 의 async ORM 은 아직 요청마다 스레드 하나(thread_sensitive)에서 sync ORM 을 돌린다.
+asyncio.gather 로 묶은 쿼리도 한 요청 안에서는 차례로 실행된다. 이득은 요청 사이에서 나온다:
+워커 하나가 DB / 캐시를 기다리는 동안 다른 요청을 받는다. (bench_asgi 로 WSGI 스레드 워커와 비교)
+"""
+import asyncio
+import functools
+from contextlib import nullcontext
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.db.models import Prefetch, aprefetch_related_objects
+from django.http import Http404, HttpResponse
+from django.urls import path
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated, NotFound
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from . import cache as movie_cache, facets
+from .conditional import not_modified, set_validators
+from .fastpath import FastJSONRenderer, WATCHLIST_ITEM_ROWS
+from .models import LikeReview, Movie, MovieCast, Review
+from .routers import ReplicaReadMixin, replica_reads
+from .serializers import MovieDetailSerializer, ReviewSerializer
+from .views import (
+    MovieDetailAPIView, MovieListAPIView, MyWatchListAPIView, ReviewListCreateAPIView,
+    SimilarMovieAPIView, TopRatedMovieListAPIView, TrendingMovieListAPIView, get_dummy_user,
+)
+
+renderer = FastJSONRenderer()
+
+
+# ──────────────────────────────────────
+# 요청 / 응답
+# ──────────────────────────────────────
+class AsyncJWTAuthentication(JWTAuthentication):
+    async def aauthenticate(self, request):
+        """authenticate 와 같은 순서 / 예외. 토큰 검증은 CPU 작업이라 그대로, 유저 조회만 스레드에서"""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await sync_to_async(self.get_user)(validated_token), validated_token
+
+
+authenticator = AsyncJWTAuthentication()
+
+
+def json_response(data, status=200):
+    return HttpResponse(renderer.render(data), status=status, content_type=renderer.media_type)
+
+
+def exception_response(exc):
+    """DRF exception_handler 와 같은 본문 / 상태 / WWW-Authenticate"""
+    if isinstance(exc, Http404):
+        exc = NotFound(*exc.args)
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+    response = json_response(data, exc.status_code)
+    if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+        response['WWW-Authenticate'] = authenticator.authenticate_header(None)
+    return response
+
+
+def async_api(view_class):
+    """
+    GET / HEAD 는 아래 async 핸들러로, 그 밖의 메서드는 view_class 그대로.
+    핸들러는 (request, view, **kwargs): request 는 DRF Request (query_params 등), view 는 view_class 인스턴스
+    """
+    sync_view = sync_to_async(view_class.as_view())
+
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def view_func(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return await sync_view(request, *args, **kwargs)
+
+            request = Request(request)
+            view = view_class(request=request, args=args, kwargs=kwargs, format_kwarg=None)
+            try:
+                authenticated = await authenticator.aauthenticate(request)
+                request.user = authenticated[0] if authenticated else AnonymousUser()
+                # ReplicaReadMixin 과 같게: 인증은 default 에서, 그 뒤 읽기는 복제본에서
+                use_replica = isinstance(view, ReplicaReadMixin) and view.use_replica(request)
+                with replica_reads() if use_replica else nullcontext():
+                    response = await handler(request, view, **kwargs)
+            except (APIException, Http404) as exc:
+                response = exception_response(exc)
+            # DRF 뷰는 렌더러가 여러 개라 Vary: Accept 를 붙인다 (프록시 캐시 키를 같게)
+            patch_vary_headers(response, ['Accept'])
+            return response
+
+        return csrf_exempt(view_func)
+    return decorator
+
+
+# ──────────────────────────────────────
+# 영화 목록 / 상세
+# ──────────────────────────────────────
+def movie_list_view(view_class):
+    """MovieListAPIView.list 와 같은 순서 (버전 → 페이지 → 영화 버전 → 304 / 카드)"""
+
+    @async_api(view_class)
+    async def movie_list(request, view):
+        paginator = view.paginator
+        field, _ = paginator.orderings[paginator.get_ordering(request)]
+        name = f'movies:{movie_cache.url_key(request)}'
+        view.filters = view.get_filters()
+        with_facets = view.facet_filters and not request.query_params.get(paginator.cursor_query_param)
+
+        names = ['all', movie_cache.order_key(field)]
+        if view.filters or with_facets:
+            names.append(facets.FACETS_KEY)
+        all_versions = await movie_cache.aget_versions(names)
+        order_versions = all_versions if view.filters else all_versions.only(*names[:2])
+
+        index = found = None
+        if view.filters or with_facets:
+            facet_version = (all_versions['all'], all_versions[facets.FACETS_KEY])
+            index = await facets.aget_index(facet_version)
+            found = await index.asearch(view.filters)
+            if index.version == facet_version:
+                view.matched_ids = found[0]
+
+        async def build_page():
+            page = await paginator.apaginate_queryset(view.filter_queryset(view.get_queryset()), request)
+            return {
+                'ids': [movie.id for movie in page],
+                'next': paginator.get_next_link(),
+                'previous': paginator.get_previous_link(),
+            }
+
+        page = await movie_cache.acached(name, order_versions, build_page)
+
+        versions = (all_versions if with_facets else order_versions).merge(
+            await movie_cache.aget_versions(movie_cache.movie_key(movie_id) for movie_id in page['ids'])
+        )
+        etag = versions.etag(name)
+        response = not_modified(request, etag, versions.last_modified)
+        if response is not None:
+            return response
+
+        body = {
+            'next': page['next'],
+            'previous': page['previous'],
+            'results': await movie_cache.acached_cards(
+                view.serializer_class, view.card_queryset, page['ids'], versions=versions,
+            ),
+        }
+        if with_facets:
+            body['count'], body['facets'] = found[1], found[2]
+            if index.version != facet_version:
+                return json_response(body)
+        return set_validators(json_response(body), etag, versions.last_modified)
+
+    return movie_list
+
+
+movie_list = movie_list_view(MovieListAPIView)
+trending_movie_list = movie_list_view(TrendingMovieListAPIView)
+top_rated_movie_list = movie_list_view(TopRatedMovieListAPIView)
+
+
+async def load_movie_detail(request, movie_id):
+    """
+    캐시 미스 때 상세 직렬화. sync 뷰와 같은 쿼리 3번:
+    영화(+로그인 시 내 평점 / 워치리스트 여부 annotate) → 장르 / 출연진 prefetch 는 서로 상관없어서 같이 기다린다
+    """
+    queryset = Movie.objects.all()
+    if request.user.is_authenticated:
+        queryset = MovieDetailAPIView.annotate_user_fields(queryset, request.user)
+    try:
+        movie = await queryset.aget(pk=movie_id)
+    except Movie.DoesNotExist:
+        raise Http404(f'No {Movie._meta.object_name} matches the given query.')
+    await asyncio.gather(
+        aprefetch_related_objects([movie], 'genres'),
+        aprefetch_related_objects(
+            [movie], Prefetch('casts', queryset=MovieCast.objects.select_related('person').order_by('id')),
+        ),
+    )
+    return MovieDetailSerializer(movie, context={'request': request}).data
+
+
+@async_api(MovieDetailAPIView)
+async def movie_detail(request, view, pk):
+    movie_key = movie_cache.movie_key(pk)
+    name = f'movie-detail:{pk}'
+    versions = await movie_cache.aget_versions(['all', movie_key, movie_cache.user_key(request.user.pk)])
+
+    etag = versions.etag(name)
+    response = not_modified(request, etag, versions.last_modified)
+    if response is not None:
+        return response
+
+    built = {}
+
+    async def build():
+        built.update(await load_movie_detail(request, pk))
+        return {k: v for k, v in built.items() if k not in view.user_fields}
+
+    data = await movie_cache.acached(name, versions.only('all', movie_key), build)
+    if built:
+        user_fields = {k: built[k] for k in view.user_fields}
+    elif request.user.is_authenticated:
+        user_fields = view.to_user_fields(await view.user_fields_query(pk, request.user).afirst())
+    else:
+        user_fields = view.to_user_fields(None)
+    return set_validators(json_response({**data, **user_fields}), etag, versions.last_modified)
+
+
+# ──────────────────────────────────────
+# 리뷰 목록 (작성은 DRF 뷰로)
+# ──────────────────────────────────────
+@async_api(ReviewListCreateAPIView)
+async def review_list(request, view, movie_id):
+    versions = await movie_cache.aget_versions([
+        'all',
+        movie_cache.review_key(movie_id),
+        movie_cache.user_key(request.user.pk),
+    ])
+    etag = versions.etag(f'reviews:{movie_cache.url_key(request)}')
+    response = not_modified(request, etag, versions.last_modified)
+    if response is not None:
+        return response
+
+    paginator = view.paginator
+    reviews = await paginator.apaginate_queryset(Review.objects.filter(movie_id=movie_id), request)
+    liked_review_ids = set()
+    if request.user.is_authenticated:
+        liked_review_ids = {
+            review_id async for review_id in LikeReview.objects.filter(
+                user=request.user, review_id__in=[review.id for review in reviews],
+            ).values_list('review_id', flat=True)
+        }
+    data = ReviewSerializer(
+        reviews, many=True, context={'request': request, 'liked_review_ids': liked_review_ids},
+    ).data
+    return set_validators(
+        json_response(paginator.get_paginated_data(data)), etag, versions.last_modified,
+    )
+
+
+# ──────────────────────────────────────
+# 비슷한 영화
+# ──────────────────────────────────────
+@async_api(SimilarMovieAPIView)
+async def similar_movies(request, view, movie_id):
+    ids = await movie_cache.acached(
+        f'similar:{movie_id}',
+        await movie_cache.aget_versions([
+            'all', 'similarity',
+            movie_cache.order_key('trending_score'), movie_cache.order_key('popularity'),
+        ]),
+        # 캐시 미스 때만: 이웃 / 인기순 채우기는 sync 뷰 코드 그대로
+        sync_to_async(view.get_neighbor_ids),
+    )
+    return json_response(await movie_cache.acached_cards(view.serializer_class, view.card_queryset, ids))
+
+
+# ──────────────────────────────────────
+# 내 워치리스트
+# ──────────────────────────────────────
+@async_api(MyWatchListAPIView)
+async def my_watchlist(request, view):
+    user = request.user if request.user.is_authenticated else await sync_to_async(get_dummy_user)()
+    paginator = view.paginator
+    first_page = not request.query_params.get(paginator.cursor_query_param)
+    if user is None:
+        body = {'next': None, 'previous': None, 'results': []}
+        if first_page:
+            body['counts'] = dict.fromkeys(view.statuses, 0)
+        return json_response(body)
+
+    # 버전은 행보다 먼저 (cache.py 의 순서 규칙)
+    versions = await movie_cache.aget_versions(['all', movie_cache.user_key(user.pk)])
+    rows = await paginator.apaginate_queryset(
+        view.get_user_queryset(user).values(*WATCHLIST_ITEM_ROWS.columns), request,
+    )
+    versions = versions.merge(
+        await movie_cache.aget_versions(movie_cache.movie_key(row['movie__id']) for row in rows)
+    )
+    etag = versions.etag(f'watchlist:{user.pk}:{movie_cache.url_key(request)}')
+    response = not_modified(request, etag, versions.last_modified)
+    if response is not None:
+        return response
+
+    body = paginator.get_paginated_data(WATCHLIST_ITEM_ROWS.serialize_many(rows))
+    if first_page:
+        body['counts'] = dict.fromkeys(view.statuses, 0)
+        body['counts'].update([row async for row in view.count_query(user)])
+    return set_validators(json_response(body), etag, versions.last_modified)
+
+
+# movies/urls.py 가 ASYNC_VIEWS=1 일 때 앞에 붙인다 (경로는 movies/urls.py 와 같게)
+urlpatterns = [
+    path('movies/', movie_list),
+    path('movies/trending/', trending_movie_list),
+    path('movies/top-rated/', top_rated_movie_list),
+    path('movies/<int:pk>/', movie_detail),
+    path('movies/<int:movie_id>/reviews/', review_list),
+    path('movies/<int:movie_id>/similar/', similar_movies),
+    path('watchlist/me/', my_watchlist),
+]
@@ -0,0 +1,650 @@
+# movies/benchmark.py
+"""
+API 벤치마크 (seed_benchmark / bench_api 명령)
+
+1) 합성 카탈로그 만들기 (seed_catalogue)
+   - 영화 / 인물 / 출연진 / 유저 / 평점 / 리뷰 / 좋아요 / 워치리스트를 원하는 크기로, 전부 bulk_create
+   - 평점은 인기 영화에 몰리게(순위의 역수 비례) 뽑고, Movie 평점 집계·Review.like_count 는 만들면서 같이 채운다
+   - 끝나면 검색 색인 / 랭킹 / 비슷한 영화까지 만들어 실제 운영과 같은 경로를 타게 한다
+   - 빈 DB 에서 돌리는 용도 (DB_NAME=/tmp/bench.sqlite3 등). 같은 seed 면 같은 데이터
+
+2) 엔드포인트 측정 (build_endpoints → run_client / run_http)
+   - movies/urls.py 의 모든 엔드포인트 (쓰기 포함, 로그인 필요한 건 벤치마크 유저 JWT 로)
+   - run_client : Django 테스트 클라이언트로 한 번에 하나씩. p50/p95/p99, 초당 요청, SQL 쿼리 수
+                  (응답 캐시를 매번 비운 상태가 기본, 트랜잭션 제어문 SAVEPOINT/BEGIN 등은 세지 않는다)
+   - run_http   : 실제 HTTP 서버에 worker 여러 개가 동시에. p50/p95/p99, 초당 요청
+                  (--url 이 없으면 프로세스 안에 스레드 WSGI 서버를 띄운다)
+   - spawn_server / process_rss : gunicorn(WSGI) / uvicorn(ASGI) 를 하위 프로세스로 띄우고 메모리 재기 (bench_asgi)
+
+3) 예산 (bench_budgets.json)
+   {"<엔드포인트 이름>": {"queries": 4, "p95_ms": 40, "http_p95_ms": 120, "http_rps": 50}, ...}
+   - queries / *_ms 는 이 값을 넘으면, *_rps 는 이 값보다 낮으면 실패
+   - 쿼리 수는 데이터 크기·머신과 상관없이 같아야 하므로 테스트에서도 검사한다 (tests.BenchmarkSuiteTests)
+"""
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from decimal import Decimal
+from pathlib import Path
+from urllib.parse import quote, urlencode
+
+import numpy as np
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from . import cache as movie_cache, facets
+from .aggregates import latest_review_subquery, score_key
+from .models import Genre, LikeReview, Movie, MovieCast, MovieGenre, Person, Rating, Review, WatchList
+
+BUDGETS_PATH = Path(__file__).with_name('bench_budgets.json')
+
+USER_PREFIX = 'bench_user_'
+ADMIN_USERNAME = 'bench_admin'
+PASSWORD = 'bench-password'
+
+GENRES = ('액션', '드라마', '코미디', '스릴러', '로맨스', 'SF', '공포', '애니메이션', '범죄', '판타지', '가족', '다큐멘터리')
+COUNTRIES = ('KR', 'US', 'JP', 'FR', 'GB', 'DE', 'IN', 'CN', 'ES', 'IT')
+COUNTRY_WEIGHTS = (0.25, 0.35, 0.1, 0.06, 0.06, 0.04, 0.04, 0.04, 0.03, 0.03)
+WORDS = (
+    '사랑', '전쟁', '도시', '바다', '기억', '비밀', '여름', '겨울', '그림자', '약속', '마지막', '소년',
+    'love', 'night', 'city', 'dream', 'star', 'shadow', 'river', 'ghost', 'king', 'road', 'storm', 'home',
+)
+SURNAMES = ('김', '이', '박', '최', '정', '강', '조', '윤', '장', '임', 'Smith', 'Lee', 'Garcia', 'Martin')
+GIVEN_NAMES = ('민준', '서연', '도윤', '지우', '하준', '서윤', 'Alex', 'Sam', 'Jordan', 'Taylor', 'Chris', 'Morgan')
+EXPORT_ROWS = 1000
+SCORES = np.arange(1, 11) / 2   # 0.5 ~ 5.0
+WATCH_STATUSES = ('WANT', 'DONE', 'DROP')
+WATCH_WEIGHTS = (0.6, 0.3, 0.1)
+
+# 트랜잭션 제어문은 쿼리 수에서 뺀다 (테스트에서는 SAVEPOINT, 실제로는 BEGIN 이라 개수가 달라진다)
+CONTROL_STATEMENTS = ('SAVEPOINT', 'RELEASE', 'ROLLBACK', 'BEGIN', 'COMMIT')
+
+
+# ──────────────────────────────────────
+# 합성 카탈로그
+# ──────────────────────────────────────
+def _skewed(rng, n, size):
+    """0..n-1 에서 size 개, 앞쪽(인기) 일수록 자주 (순위의 역수 비례)"""
+    weights = 1.0 / (np.arange(n) + 10.0)
+    return rng.choice(n, size=size, p=weights / weights.sum())
+
+
+def _unique_pairs(rng, n_left, n_right, target, right_sampler):
+    """중복 없는 (왼쪽, 오른쪽) 위치 쌍 target 개 (가능한 쌍 수의 절반까지). 반환: (left, right) 배열"""
+    target = min(target, n_left * n_right // 2)
+    keys = np.empty(0, dtype=np.int64)
+    while len(keys) < target:
+        size = int((target - len(keys)) * 1.2) + 16
+        left = rng.integers(0, n_left, size=size, dtype=np.int64)
+        right = right_sampler(size).astype(np.int64)
+        keys = np.unique(np.concatenate([keys, left * n_right + right]))
+    keys = rng.permutation(keys)[:target]
+    keys.sort()
+    return keys // n_right, keys % n_right
+
+
+def _words(rng, low, high):
+    return ' '.join(rng.choice(WORDS, size=int(rng.integers(low, high + 1))))
+
+
+def _create(model, objects, batch_size):
+    """bulk_create 를 batch 단위로 (objects 는 제너레이터여도 됨). 만든 객체 리스트(pk 포함) 반환"""
+    created, batch = [], []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            created.extend(model.objects.bulk_create(batch))
+            batch = []
+    if batch:
+        created.extend(model.objects.bulk_create(batch))
+    return created
+
+
+def seed_catalogue(movies=10000, people=8000, casts_per_movie=8, users=3000, ratings=300000,
+                   reviews=30000, likes=60000, watchlist=30000, seed=0, batch_size=5000,
+                   similarity=True, log=None):
+    """합성 카탈로그를 만들고 {테이블: 만든 행 수} 반환. 벤치마크 유저가 이미 있으면 ValueError"""
+    from .ranking import update_rankings
+    from .search import rebuild_search_index
+    from .similarity import build_similarity
+    from .user_similarity import build_user_similarity
+
+    log = log or (lambda msg: None)
+    User = get_user_model()
+    if User.objects.filter(username__startswith=USER_PREFIX).exists():
+        raise ValueError('이미 벤치마크 데이터가 있습니다. 빈 DB(DB_NAME=...)에서 실행해 주세요.')
+    rng = np.random.default_rng(seed)
+    counts = {}
+
+    # 유저 (비밀번호 해시는 한 번만 계산해서 같이 쓴다)
+    password = make_password(PASSWORD)
+    user_objs = _create(User, (
+        User(username=f'{USER_PREFIX}{i}', password=password) for i in range(users)
+    ), batch_size)
+    User.objects.create(username=ADMIN_USERNAME, password=password, is_staff=True)
+    user_ids = np.array([user.pk for user in user_objs], dtype=np.int64)
+    counts['users'] = users
+
+    genre_ids = [Genre.objects.get_or_create(name=name)[0].pk for name in GENRES]
+    person_objs = _create(Person, (
+        Person(name=f'{rng.choice(SURNAMES)} {rng.choice(GIVEN_NAMES)} {i}') for i in range(people)
+    ), batch_size)
+    person_ids = np.array([person.pk for person in person_objs], dtype=np.int64)
+    counts['people'] = people
+    log(f'유저 {users:,}명, 인물 {people:,}명')
+
+    # 평점 (영화 위치 기준으로 먼저 뽑아서 Movie 집계를 같이 채운다)
+    rating_users, rating_movies = _unique_pairs(
+        rng, users, movies, ratings, lambda size: _skewed(rng, movies, size),
+    )
+    quality = rng.normal(3.4, 0.6, size=movies)
+    raw = quality[rating_movies] + rng.normal(0, 0.8, size=len(rating_movies))
+    score_codes = np.clip(np.rint(raw * 2), 1, 10).astype(np.int64) - 1   # SCORES 의 위치
+    histogram = np.bincount(rating_movies * 10 + score_codes, minlength=movies * 10).reshape(movies, 10)
+
+    movie_objs = []
+    years = rng.integers(1960, 2026, size=movies)
+    runtimes = rng.integers(70, 190, size=movies)
+    countries = rng.choice(len(COUNTRIES), size=movies, p=COUNTRY_WEIGHTS)
+    for i in range(movies):
+        row = histogram[i]
+        count = int(row.sum())
+        total = Decimal(str(float((row * SCORES).sum()))).quantize(Decimal('0.1'))
+        movie_objs.append(Movie(
+            title=f'{_words(rng, 1, 3)} {i}',
+            original_title=_words(rng, 1, 3),
+            release_year=int(years[i]),
+            runtime=int(runtimes[i]),
+            country=COUNTRIES[countries[i]],
+            overview=_words(rng, 10, 30),
+            popularity=round(1000.0 / (i + 10), 3),
+            rating_count=count,
+            rating_sum=total,
+            rating_avg=float(total / count) if count else 0,
+            rating_histogram={score_key(SCORES[k]): int(n) for k, n in enumerate(row) if n},
+        ))
+    movie_ids = np.array([movie.pk for movie in _create(Movie, movie_objs, batch_size)], dtype=np.int64)
+    counts['movies'] = movies
+    log(f'영화 {movies:,}편')
+
+    _create(MovieGenre, (
+        MovieGenre(movie_id=int(movie_id), genre_id=int(genre_id))
+        for movie_id in movie_ids
+        for genre_id in rng.choice(genre_ids, size=int(rng.integers(1, 4)), replace=False)
+    ), batch_size)
+
+    def casts():
+        for movie_id in movie_ids:
+            picked = np.unique(_skewed(rng, people, casts_per_movie))
+            yield MovieCast(movie_id=int(movie_id), person_id=int(person_ids[picked[0]]), role='director')
+            for position in picked[1:]:
+                yield MovieCast(
+                    movie_id=int(movie_id), person_id=int(person_ids[position]), role='actor',
+                    character_name=str(rng.choice(GIVEN_NAMES)),
+                )
+    counts['casts'] = len(_create(MovieCast, casts(), batch_size))
+
+    score_values = [Decimal(str(score)) for score in SCORES]
+    _create(Rating, (
+        Rating(user_id=int(user_ids[u]), movie_id=int(movie_ids[m]), score=score_values[s])
+        for u, m, s in zip(rating_users, rating_movies, score_codes)
+    ), batch_size)
+    counts['ratings'] = len(rating_users)
+    log(f'평점 {len(rating_users):,}개')
+
+    # 리뷰 + 좋아요 (like_count 를 미리 세어 둔다)
+    review_movies = _skewed(rng, movies, reviews)
+    like_users, like_reviews = _unique_pairs(
+        rng, users, reviews, likes, lambda size: _skewed(rng, reviews, size),
+    )
+    like_counts = np.bincount(like_reviews, minlength=reviews)
+    review_ids = np.array([review.pk for review in _create(Review, (
+        Review(
+            movie_id=int(movie_ids[review_movies[i]]),
+            author=str(rng.choice(GIVEN_NAMES)),
+            content=_words(rng, 5, 40),
+            like_count=int(like_counts[i]),
+        )
+        for i in range(reviews)
+    ), batch_size)], dtype=np.int64)
+    _create(LikeReview, (
+        LikeReview(user_id=int(user_ids[u]), review_id=int(review_ids[r]))
+        for u, r in zip(like_users, like_reviews)
+    ), batch_size)
+    if len(movie_ids):
+        Movie.objects.filter(id__gte=int(movie_ids.min())).update(latest_review=latest_review_subquery())
+    counts['reviews'] = reviews
+    counts['likes'] = len(like_users)
+
+    watch_users, watch_movies = _unique_pairs(
+        rng, users, movies, watchlist, lambda size: _skewed(rng, movies, size),
+    )
+    statuses = rng.choice(len(WATCH_STATUSES), size=len(watch_users), p=WATCH_WEIGHTS)
+    _create(WatchList, (
+        WatchList(user_id=int(user_ids[u]), movie_id=int(movie_ids[m]), status=WATCH_STATUSES[s])
+        for u, m, s in zip(watch_users, watch_movies, statuses)
+    ), batch_size)
+    counts['watchlist'] = len(watch_users)
+    log(f'리뷰 {reviews:,}개, 좋아요 {len(like_users):,}개, 워치리스트 {len(watch_users):,}개')
+
+    # 운영과 같은 경로를 타도록 파생 데이터까지
+    rebuild_search_index()
+    update_rankings(full=True)
+    if similarity:
+        build_similarity(full=True)
+        build_user_similarity(full=True)
+    movie_cache.bump('all', facets.FACETS_KEY)
+    log('검색 색인 / 랭킹' + (' / 비슷한 영화 / 비슷한 유저' if similarity else '') + ' 생성')
+    return counts
+
+
+# ──────────────────────────────────────
+# 측정할 엔드포인트
+# ──────────────────────────────────────
+# auth: None | 'user' | 'admin',  body: None | dict | (요청 번호 → dict)
+Endpoint = namedtuple('Endpoint', 'name method path auth body', defaults=(None, None))
+
+
+def find_fixtures():
+    """엔드포인트 URL 에 넣을 id 들 (데이터에서 많이 쓰이는 것으로)"""
+    User = get_user_model()
+    movie = Movie.objects.order_by('-rating_count', 'id').values_list('id', flat=True).first()
+    if movie is None:
+        raise ValueError('영화가 없습니다. seed_benchmark 로 먼저 데이터를 만들어 주세요.')
+    person = (
+        MovieCast.objects.filter(role='director').values_list('person_id')
+        .annotate(n=Count('id')).order_by('-n', 'person_id').first()
+    )
+    genre = (
+        MovieGenre.objects.values_list('genre_id')
+        .annotate(n=Count('id')).order_by('-n', 'genre_id').first()
+    )
+    user = (
+        User.objects.filter(username__startswith=USER_PREFIX, ratings__isnull=False)
+        .order_by('id').first()
+        or User.objects.filter(ratings__isnull=False).order_by('id').first()
+        or User.objects.order_by('id').first()
+    )
+    stamps = Rating.objects.order_by('-updated_at').values_list('updated_at', flat=True)
+    return {
+        'movie': movie,
+        'movie_ids': list(Movie.objects.order_by('-popularity', 'id').values_list('id', flat=True)[:40]),
+        'review': Review.objects.filter(movie_id=movie).order_by('-id').values_list('id', flat=True).first(),
+        'person': person[0] if person else None,
+        'genre': genre[0] if genre else None,
+        'word': Movie.objects.values_list('title', flat=True).get(pk=movie).split()[0],
+        # 내보내기는 최근 EXPORT_ROWS 개 정도만 나오도록
+        'export_since': next(iter(stamps[EXPORT_ROWS:EXPORT_ROWS + 1]), None),
+        'user': user,
+        'admin': User.objects.filter(is_staff=True).order_by('id').first(),
+    }
+
+
+def build_endpoints(fixtures, page_size=20):
+    movie, ids = fixtures['movie'], fixtures['movie_ids']
+    endpoints = [
+        Endpoint('movies', 'GET', f'/api/v1/movies/?page_size={page_size}'),
+        Endpoint('movies-ordered', 'GET', f'/api/v1/movies/?ordering=-avg_score&page_size={page_size}'),
+        Endpoint('movies-filtered', 'GET',
+                 f'/api/v1/movies/?genre={fixtures["genre"] or ""}&year_min=1990&runtime_max=150'
+                 f'&page_size={page_size}'),
+        Endpoint('movies-search', 'GET', f'/api/v1/movies/search/?q={quote(fixtures["word"])}'),
+        Endpoint('movies-trending', 'GET', f'/api/v1/movies/trending/?page_size={page_size}'),
+        Endpoint('movies-top-rated', 'GET', f'/api/v1/movies/top-rated/?page_size={page_size}'),
+        Endpoint('movie-detail', 'GET', f'/api/v1/movies/{movie}/'),
+        Endpoint('movie-detail-auth', 'GET', f'/api/v1/movies/{movie}/', 'user'),
+        Endpoint('movie-reviews', 'GET', f'/api/v1/movies/{movie}/reviews/?page_size={page_size}'),
+        Endpoint('movie-similar', 'GET', f'/api/v1/movies/{movie}/similar/'),
+        Endpoint('rating-save', 'POST', f'/api/v1/movies/{movie}/ratings/', 'user',
+                 lambda i: {'score': float(SCORES[i % len(SCORES)])}),
+        Endpoint('ratings-bulk', 'POST', '/api/v1/ratings/bulk/', 'user',
+                 lambda i: {'items': [{'movie': movie_id, 'score': float(SCORES[(i + j) % len(SCORES)])}
+                                      for j, movie_id in enumerate(ids[:20])]}),
+        Endpoint('review-create', 'POST', f'/api/v1/movies/{movie}/reviews/', None,
+                 lambda i: {'author': 'bench', 'content': f'벤치마크 리뷰 {i}'}),
+        Endpoint('watchlist-toggle', 'POST', f'/api/v1/movies/{movie}/watchlist-toggle/', 'user',
+                 lambda i: {'status': WATCH_STATUSES[i % 2]}),
+        Endpoint('watchlist-bulk', 'POST', '/api/v1/watchlist/bulk/', 'user',
+                 lambda i: {'items': [{'movie': movie_id, 'status': WATCH_STATUSES[(i + j) % 2]}
+                                      for j, movie_id in enumerate(ids[20:40])]}),
+        Endpoint('watchlist-me', 'GET', '/api/v1/watchlist/me/', 'user'),
+        Endpoint('recommendations', 'GET', '/api/v1/recommendations/me/', 'user'),
+        Endpoint('feed', 'GET', '/api/v1/feed/me/', 'user'),
+        Endpoint('me-state', 'GET', '/api/v1/me/state/?ids=' + ','.join(map(str, ids)), 'user'),
+        Endpoint('auth-me', 'GET', '/api/v1/auth/me/', 'user'),
+        Endpoint('auth-register', 'POST', '/api/v1/auth/register/', None,
+                 lambda i: {'username': f'bench_reg_{uuid.uuid4().hex[:12]}', 'password': PASSWORD}),
+    ]
+    if fixtures['review'] is not None:
+        endpoints.append(Endpoint('review-like', 'POST', f'/api/v1/reviews/{fixtures["review"]}/like/', 'user'))
+    if fixtures['person'] is not None:
+        endpoints += [
+            Endpoint('person-detail', 'GET', f'/api/v1/persons/{fixtures["person"]}/'),
+            Endpoint('person-movies', 'GET', f'/api/v1/persons/{fixtures["person"]}/movies/?ordering=-year'),
+        ]
+    user = fixtures['user']
+    if user is not None and user.username.startswith(USER_PREFIX):
+        # 비밀번호를 아는 벤치마크 유저만
+        endpoints.append(Endpoint('auth-login', 'POST', '/api/v1/auth/login/', None,
+                                  {'username': user.username, 'password': PASSWORD}))
+    if user is not None:
+        endpoints.append(Endpoint('auth-refresh', 'POST', '/api/v1/auth/refresh/', None,
+                                  {'refresh': str(RefreshToken.for_user(user))}))
+    if fixtures['admin'] is not None:
+        since = fixtures['export_since']
+        query = urlencode({'type': 'csv', 'kinds': 'rating', **({'since': since.isoformat()} if since else {})})
+        endpoints.append(Endpoint('export-interactions', 'GET', f'/api/v1/export/interactions/?{query}', 'admin'))
+    # 로그인이 필요한데 유저가 없으면 뺀다
+    return [
+        endpoint for endpoint in endpoints
+        if endpoint.auth is None or fixtures[endpoint.auth] is not None
+    ]
+
+
+def auth_tokens(fixtures):
+    return {
+        role: str(AccessToken.for_user(fixtures[role]))
+        for role in ('user', 'admin') if fixtures[role] is not None
+    }
+
+
+def _body(endpoint, i):
+    return endpoint.body(i) if callable(endpoint.body) else endpoint.body
+
+
+# ──────────────────────────────────────
+# 측정
+# ──────────────────────────────────────
+def summarize(latencies, elapsed, prefix=''):
+    """초 단위 지연 리스트 → {p50_ms, p95_ms, p99_ms, rps} (prefix 를 붙여서)"""
+    values = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        f'{prefix}p50_ms': round(float(p50), 2),
+        f'{prefix}p95_ms': round(float(p95), 2),
+        f'{prefix}p99_ms': round(float(p99), 2),
+        f'{prefix}rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def count_queries(captured):
+    return sum(
+        1 for context in captured for query in context.captured_queries
+        if not query['sql'].lstrip().upper().startswith(CONTROL_STATEMENTS)
+    )
+
+
+def run_client(endpoints, tokens, requests=50, warmup=1, cold=True, host='localhost'):
+    """
+    테스트 클라이언트로 엔드포인트마다 warmup + requests 번 (warmup 은 통계에서 뺀다)
+    반환: {이름: {p50_ms, p95_ms, p99_ms, rps, queries(요청당 최대), errors, status}}
+    """
+    client = Client(HTTP_HOST=host)
+    results = {}
+    for endpoint in endpoints:
+        headers = {}
+        if endpoint.auth:
+            headers['HTTP_AUTHORIZATION'] = f'Bearer {tokens[endpoint.auth]}'
+        latencies, statuses, queries = [], Counter(), 0
+        for i in range(warmup + requests):
+            if cold:
+                movie_cache.get_cache().clear()
+            body = _body(endpoint, i)
+            with ExitStack() as stack:
+                captured = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections]
+                start = time.perf_counter()
+                if endpoint.method == 'GET':
+                    res = client.get(endpoint.path, **headers)
+                else:
+                    res = client.generic(
+                        endpoint.method, endpoint.path, json.dumps(body or {}),
+                        content_type='application/json', **headers,
+                    )
+                if res.streaming:
+                    b''.join(res.streaming_content)
+                elapsed = time.perf_counter() - start
+            if i < warmup:
+                continue
+            latencies.append(elapsed)
+            statuses[res.status_code] += 1
+            queries = max(queries, count_queries(captured))
+        results[endpoint.name] = {
+            **summarize(latencies, sum(latencies)),
+            'queries': queries,
+            'errors': sum(n for code, n in statuses.items() if code >= 400),
+            'status': dict(statuses),
+        }
+    return results
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def serve(host='127.0.0.1', port=0):
+    """이 프로세스 안에 스레드 WSGI 서버 (runserver 와 같은 서버). base URL 을 돌려준다"""
+    server = ThreadedWSGIServer((host, port), _QuietHandler)
+    server.set_app(get_wsgi_application())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://{host}:{server.server_port}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _http_request(base_url, endpoint, i, headers, timeout):
+    body = _body(endpoint, i)
+    data = json.dumps(body).encode('utf-8') if endpoint.method != 'GET' else None
+    request = urllib.request.Request(base_url + endpoint.path, data=data, method=endpoint.method, headers=headers)
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as res:
+            res.read()
+            status = res.status
+    except urllib.error.HTTPError as exc:
+        exc.read()
+        status = exc.code
+    except OSError:
+        status = 0   # 연결 실패 / 타임아웃
+    return time.perf_counter() - start, status
+
+
+def run_http(endpoints, tokens, base_url, workers=8, requests=200, timeout=30):
+    """
+    HTTP 부하: 엔드포인트마다 worker 여러 개가 합쳐서 requests 번을 동시에 보낸다
+    반환: {이름: {http_p50_ms, http_p95_ms, http_p99_ms, http_rps, http_errors}}
+    """
+    results = {}
+    for endpoint in endpoints:
+        headers = {'Content-Type': 'application/json'}
+        if endpoint.auth:
+            headers['Authorization'] = f'Bearer {tokens[endpoint.auth]}'
+        shares = [requests // workers + (1 if w < requests % workers else 0) for w in range(workers)]
+        offsets = np.cumsum([0, *shares]).tolist()
+
+        def worker(w):
+            return [
+                _http_request(base_url, endpoint, offsets[w] + k, headers, timeout)
+                for k in range(shares[w])
+            ]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = [outcome for chunk in pool.map(worker, range(workers)) for outcome in chunk]
+        elapsed = time.perf_counter() - start
+        results[endpoint.name] = {
+            **summarize([latency for latency, _ in outcomes], elapsed, prefix='http_'),
+            'http_errors': sum(1 for _, code in outcomes if code == 0 or code >= 400),
+        }
+    return results
+
+
+# ──────────────────────────────────────
+# 서버 프로세스 (bench_asgi: 동기 WSGI 워커 vs ASGI 워커)
+# ──────────────────────────────────────
+# 종류 → (필요한 모듈, python -m 인자). 둘 다 선택 설치 (pip install gunicorn uvicorn)
+SERVERS = {
+    # gunicorn 워커 프로세스. threads=1 이면 요청을 하나씩 처리하는 sync 워커
+    'wsgi': ('gunicorn', lambda workers, threads, port: [
+        'gunicorn', 'my_movies.wsgi:application', '--workers', str(workers), '--threads', str(threads),
+        '--bind', f'127.0.0.1:{port}', '--log-level', 'warning',
+    ]),
+    # uvicorn 워커 프로세스 (이벤트 루프 하나씩), ASYNC_VIEWS=1 로 async 뷰
+    'asgi': ('uvicorn', lambda workers, threads, port: [
+        'uvicorn', 'my_movies.asgi:application', '--workers', str(workers),
+        '--host', '127.0.0.1', '--port', str(port), '--no-access-log', '--log-level', 'warning',
+    ]),
+}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def spawn_server(kind, workers=1, threads=1, env=None, timeout=60):
+    """
+    SERVERS[kind] 서버를 하위 프로세스로 띄우고 응답할 때까지 기다린다. (base URL, 루트 pid) 를 돌려준다
+    환경 변수(DB_NAME 등)는 이 프로세스 것을 물려받는다
+    """
+    _, args = SERVERS[kind]
+    port = _free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    with tempfile.TemporaryFile() as log:
+        process = subprocess.Popen(
+            [sys.executable, '-m', *args(workers, threads, port)],
+            cwd=settings.BASE_DIR, env={**os.environ, **(env or {})}, stdout=log, stderr=subprocess.STDOUT,
+        )
+        try:
+            deadline = time.monotonic() + timeout
+            while True:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    log.seek(0)
+                    raise RuntimeError(f'{kind} 서버가 뜨지 않았습니다:\n{log.read().decode(errors="replace")[-2000:]}')
+                try:
+                    with urllib.request.urlopen(f'{base_url}/api/v1/movies/?page_size=1', timeout=5) as res:
+                        res.read()
+                    break
+                except OSError:
+                    time.sleep(0.2)
+            yield base_url, process.pid
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+def process_rss(pid):
+    """pid 와 그 하위 프로세스들의 {pid: RSS 바이트} (리눅스 /proc)"""
+    parents, rss = {}, {}
+    for entry in Path('/proc').iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            status = (entry / 'status').read_text()
+        except OSError:
+            continue
+        fields = dict(line.split(':', 1) for line in status.splitlines() if ':' in line)
+        parents[int(entry.name)] = int(fields['PPid'])
+        if 'VmRSS' in fields:
+            rss[int(entry.name)] = int(fields['VmRSS'].split()[0]) * 1024
+    tree, frontier = {pid}, [pid]
+    while frontier:
+        parent = frontier.pop()
+        children = [child for child, ppid in parents.items() if ppid == parent and child not in tree]
+        tree.update(children)
+        frontier += children
+    return {member: rss.get(member, 0) for member in tree}
+
+
+def simulate_db_latency(seconds):
+    """새 DB 연결마다 쿼리 전에 seconds 만큼 잠깐 멈춘다 (네트워크 너머 DB 의 왕복 시간 흉내, BENCH_DB_LATENCY_MS)"""
+    def delay(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        if delay not in connection.execute_wrappers:
+            connection.execute_wrappers.append(delay)
+
+    connection_created.connect(install, weak=False, dispatch_uid='movies.benchmark.simulate_db_latency')
+
+
+# ──────────────────────────────────────
+# 예산
+# ──────────────────────────────────────
+def load_budgets(path=None):
+    with open(path or BUDGETS_PATH, encoding='utf-8') as fp:
+        return {name: budget for name, budget in json.load(fp).items() if not name.startswith('_')}
+
+
+def check_budgets(results, budgets, latency=True):
+    """
+    예산을 벗어난 항목 [(엔드포인트, 항목, 측정값, 예산)]
+      - 에러 응답이 하나라도 있으면 실패
+      - latency=False 면 쿼리 수만 본다 (머신에 따라 달라지는 시간·처리량은 건너뜀)
+    """
+    violations = []
+    for name, result in results.items():
+        for key in ('errors', 'http_errors'):
+            if result.get(key):
+                violations.append((name, key, result[key], 0))
+        for key, limit in budgets.get(name, {}).items():
+            if key not in result or (not latency and key != 'queries'):
+                continue
+            value = result[key]
+            if value < limit if key.endswith('rps') else value > limit:
+                violations.append((name, key, value, limit))
+    return violations
+
+
+def make_budgets(results, headroom=1.5):
+    """측정값에서 예산 만들기: 쿼리 수는 그대로, 시간은 × headroom, 처리량은 ÷ headroom"""
+    budgets = {}
+    for name, result in results.items():
+        budget = {'queries': result['queries']} if 'queries' in result else {}
+        for key in ('p95_ms', 'http_p95_ms'):
+            if key in result:
+                budget[key] = math.ceil(result[key] * headroom)
+        if 'http_rps' in result:
+            budget['http_rps'] = math.floor(result['http_rps'] / headroom * 10) / 10
+        budgets[name] = budget
+    return budgets
+
+
+def write_budgets(budgets, path=None, comment=None):
+    data = {'_comment': comment} if comment else {}
+    data.update(sorted(budgets.items()))
+    with open(path or BUDGETS_PATH, 'w', encoding='utf-8') as fp:
+        json.dump(data, fp, ensure_ascii=False, indent=2)
+        fp.write('\n')
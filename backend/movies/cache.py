@@ -0,0 +1,283 @@
+# movies/cache.py
+"""
+응답 캐시 + ETag 용 버전 (영화 목록 / 상세 / 비슷한 영화 / 리뷰 / 워치리스트)
+
+저장소: settings.CACHES['movies']
+  MOVIE_CACHE_BACKEND=locmem(기본, 프로세스 메모리 LRU) | file | redis | dummy(끄기)
+
+버전 (CacheVersion 테이블)
+  캐시 키와 ETag 에 "의존하는 데이터의 버전 번호" 를 붙이고, 데이터가 바뀌면 버전만 올린다.
+  옛 캐시 항목은 아무도 읽지 않게 되고 LRU / TIMEOUT 으로 자연히 밀려난다.
+    movie:<id>      영화 한 편 (상세, 카드) - Movie / MovieGenre / MovieCast / Rating 쓰기
+    order:<field>   목록 정렬 순서 (id, release_year, rating_avg, popularity, trending_score, bayesian_avg)
+    reviews:<id>    영화의 리뷰 목록 - Review 쓰기, 좋아요
+    user:<id>       유저별 필드 (내 평점, 워치리스트, 좋아요)
+    similarity      build_similarity 결과
+    facets          목록 필터 / 패싯 색인 (영화 연도·국가·상영 시간, 장르, 출연진)
+    all             전체 (집계 재계산 같은 대량 작업)
+  - 버전은 캐시가 아니라 DB 에 둔다. 캐시가 프로세스마다 따로여도(locmem) import 명령이나
+    다른 워커의 쓰기가 모두에게 보인다. 조회는 필요한 키를 모아 인덱스 쿼리 1번.
+  - 버전은 커밋 직후에 올리고, 읽을 때는 버전을 먼저 읽고 DB 를 읽는다.
+    → 새 버전을 본 요청은 반드시 커밋된 데이터를 읽는다. (옛 버전 키에 새 데이터가 들어가는 건 무해)
+  - 새 행은 현재 시각(ns)에서 시작 → 행이 없어져도 옛 번호를 다시 쓰지 않는다.
+  - updated_at 은 Last-Modified 로 쓴다.
+
+목록 / 비슷한 영화는 "영화 id 목록" 과 "영화 카드" 를 따로 캐시한다.
+평점 하나가 바뀌면 그 영화 카드와 평점순 목록만 다시 만들어진다.
+"""
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .fastpath import row_serializer
+from .models import CacheVersion
+
+CACHE_ALIAS = 'movies'
+
+ORDER_FIELDS = ('id', 'release_year', 'rating_avg', 'popularity', 'trending_score', 'bayesian_avg')
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def _in_process(cache):
+    # 프로세스 메모리 캐시는 기다릴 I/O 가 없다 → async 뷰에서도 바로 부른다 (스레드로 넘기는 비용만 아낌)
+    return isinstance(cache, (LocMemCache, DummyCache))
+
+
+def movie_key(movie_id):
+    return f'movie:{movie_id}'
+
+
+def order_key(field):
+    return f'order:{field}'
+
+
+def review_key(movie_id):
+    return f'reviews:{movie_id}'
+
+
+def user_key(user_id):
+    """유저별 필드용. 익명(user_id None)이면 None → get_versions / bump 에서 건너뜀"""
+    return f'user:{user_id}' if user_id else None
+
+
+def url_key(request):
+    """쿼리스트링(정렬/cursor/page_size)과 호스트(다음 페이지 링크)까지 포함한 요청 키"""
+    return hashlib.sha1(request.build_absolute_uri().encode('utf-8')).hexdigest()
+
+
+# ──────────────────────────────────────
+# 버전
+# ──────────────────────────────────────
+class Versions(dict):
+    """{이름: 버전} + 그중 가장 최근 updated_at (Last-Modified)"""
+    last_modified = None
+
+    def only(self, *names):
+        subset = Versions((name, self[name]) for name in names if name in self)
+        subset.last_modified = self.last_modified
+        return subset
+
+    def merge(self, other):
+        merged = Versions({**self, **other})
+        merged.last_modified = max(
+            (dt for dt in (self.last_modified, other.last_modified) if dt is not None), default=None,
+        )
+        return merged
+
+    def key(self, name):
+        return ':'.join([name, *(f'{self[dep]}' for dep in sorted(self))])
+
+    def etag(self, name):
+        """강한 ETag (버전이 같으면 응답 바이트도 같다)"""
+        return '"%s"' % hashlib.sha1(self.key(name).encode('utf-8')).hexdigest()
+
+
+def _version_names(names):
+    return [name for name in dict.fromkeys(names) if name]
+
+
+def _collect_versions(names, rows):
+    versions = Versions.fromkeys(names, 0)
+    for key, version, updated_at in rows:
+        versions[key] = version
+        if versions.last_modified is None or updated_at > versions.last_modified:
+            versions.last_modified = updated_at
+    return versions
+
+
+def _version_rows(names):
+    return CacheVersion.objects.filter(key__in=names).values_list('key', 'version', 'updated_at')
+
+
+def get_versions(names):
+    """필요한 버전을 쿼리 1번으로. 아직 한 번도 안 올린 이름은 0 (None 은 건너뜀)"""
+    names = _version_names(names)
+    return _collect_versions(names, _version_rows(names))
+
+
+async def aget_versions(names):
+    """get_versions 의 async 버전 (movies.async_views)"""
+    names = _version_names(names)
+    return _collect_versions(names, [row async for row in _version_rows(names)])
+
+
+def _incr(names):
+    now = timezone.now()
+    existing = set(
+        CacheVersion.objects.filter(key__in=names).values_list('key', flat=True)
+    )
+    if existing:
+        CacheVersion.objects.filter(key__in=existing).update(version=F('version') + 1, updated_at=now)
+    missing = [name for name in names if name not in existing]
+    if missing:
+        start = time.time_ns()
+        CacheVersion.objects.bulk_create(
+            [CacheVersion(key=name, version=start, updated_at=now) for name in missing],
+            ignore_conflicts=True,
+        )
+
+
+def bump(*names):
+    """버전 올리기 (트랜잭션 안이면 커밋 직후에, 밖이면 바로)"""
+    names = [name for name in dict.fromkeys(names) if name]
+    if names:
+        transaction.on_commit(lambda: _incr(names))
+
+
+def bump_movies(movie_ids, orders=ORDER_FIELDS):
+    """영화 정보가 바뀜: 그 영화들 + (정렬 값이 바뀌었을 수 있는) 목록 순서"""
+    bump(*(movie_key(movie_id) for movie_id in movie_ids), *(order_key(field) for field in orders))
+
+
+def bump_all():
+    bump('all')
+
+
+_batch = threading.local()
+
+
+@contextmanager
+def batched_bumps():
+    """
+    이 블록 안의 장르/출연진 쓰기는 행마다 bump 하지 않는다 (signals.bump_movie_relation 이 건너뜀).
+    묶음 단위 bump 는 호출한 쪽에서 (tmdb.write_movies)
+    """
+    depth = getattr(_batch, 'depth', 0)
+    _batch.depth = depth + 1
+    try:
+        yield
+    finally:
+        _batch.depth = depth
+
+
+def in_batched_bumps():
+    return getattr(_batch, 'depth', 0) > 0
+
+
+# ──────────────────────────────────────
+# 조회
+# ──────────────────────────────────────
+def cached(name, versions, build):
+    """versions 가 그대로면 캐시된 값, 아니면 build() 결과를 저장해서 반환"""
+    cache = get_cache()
+    key = versions.key(name)
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.set(key, value)
+    return value
+
+
+async def acached(name, versions, build):
+    """cached 의 async 버전 (build 는 코루틴 함수)"""
+    cache = get_cache()
+    key = versions.key(name)
+    value = cache.get(key) if _in_process(cache) else await cache.aget(key)
+    if value is None:
+        value = await build()
+        if _in_process(cache):
+            cache.set(key, value)
+        else:
+            await cache.aset(key, value)
+    return value
+
+
+def _card_keys(serializer_class, movie_ids, versions):
+    prefix = f'{serializer_class.__name__}:{versions["all"]}'
+    return {
+        movie_id: f'{prefix}:{movie_id}:{versions[movie_key(movie_id)]}'
+        for movie_id in movie_ids
+    }
+
+
+def _card_versions(movie_ids):
+    return ['all', *(movie_key(movie_id) for movie_id in movie_ids)]
+
+
+def _build_cards(serializer_class, keys, rows):
+    cards = row_serializer(serializer_class)
+    return {keys[row['id']]: card for row, card in zip(rows, cards.serialize_many(rows))}
+
+
+def _missing_rows(serializer_class, queryset, keys, found):
+    missing = [movie_id for movie_id, key in keys.items() if key not in found]
+    if not missing:
+        return None
+    return queryset.filter(id__in=missing).values(*row_serializer(serializer_class).columns)
+
+
+def cached_cards(serializer_class, queryset, movie_ids, versions=None):
+    """
+    영화 카드(serializer_class 로 직렬화한 dict) 목록을 movie_ids 순서대로.
+    영화마다 movie:<id> 버전으로 캐시하고, 없는 것만 queryset 에서 한 번에 읽는다.
+    (모델 객체 대신 values() 행 → fastpath.RowSerializer, 결과는 serializer_class 와 같다)
+    DB 에 없는 영화는 빠진다. versions 를 이미 읽었으면 넘겨서 쿼리 1번 절약
+    """
+    if not movie_ids:
+        return []
+    if versions is None:
+        versions = get_versions(_card_versions(movie_ids))
+    cache = get_cache()
+    keys = _card_keys(serializer_class, movie_ids, versions)
+    found = cache.get_many(keys.values())
+
+    rows = _missing_rows(serializer_class, queryset, keys, found)
+    if rows is not None:
+        fresh = _build_cards(serializer_class, keys, list(rows))
+        cache.set_many(fresh)
+        found.update(fresh)
+
+    return [found[keys[movie_id]] for movie_id in movie_ids if keys[movie_id] in found]
+
+
+async def acached_cards(serializer_class, queryset, movie_ids, versions=None):
+    """cached_cards 의 async 버전 (캐시 → 없는 카드만 DB, 같은 결과)"""
+    if not movie_ids:
+        return []
+    if versions is None:
+        versions = await aget_versions(_card_versions(movie_ids))
+    cache = get_cache()
+    keys = _card_keys(serializer_class, movie_ids, versions)
+    found = cache.get_many(keys.values()) if _in_process(cache) else await cache.aget_many(keys.values())
+
+    rows = _missing_rows(serializer_class, queryset, keys, found)
+    if rows is not None:
+        fresh = _build_cards(serializer_class, keys, [row async for row in rows])
+        if _in_process(cache):
+            cache.set_many(fresh)
+        else:
+            await cache.aset_many(fresh)
+        found.update(fresh)
+
+    return [found[keys[movie_id]] for movie_id in movie_ids if keys[movie_id] in found]
@@ -0,0 +1,33 @@
+# movies/conditional.py
+"""
+조건부 GET (ETag / Last-Modified → 304)
+
+ETag 는 movies.cache 의 버전(Versions.etag)으로 만들기 때문에 응답 본문을 직렬화하지 않고도
+If-None-Match 를 비교할 수 있다. 같은 버전이면 본문 바이트도 같으므로 강한(strong) ETag.
+Last-Modified 는 버전 행의 updated_at 중 가장 최근 값. (If-None-Match 가 있으면 그쪽이 우선)
+"""
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+
+def set_validators(response, etag, last_modified=None):
+    response['ETag'] = etag
+    # 내 평점 / 좋아요 같은 유저별 필드가 들어가므로 토큰별로 따로 캐시되게
+    patch_vary_headers(response, ['Authorization'])
+    # Last-Modified 만 보고 브라우저가 임의로 캐시해 두지 않도록 매번 재검증(If-None-Match)
+    patch_cache_control(response, private=True, no_cache=True)
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def not_modified(request, etag, last_modified=None):
+    """요청의 If-None-Match / If-Modified-Since 가 맞으면 304 응답, 아니면 None"""
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified is not None else None,
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
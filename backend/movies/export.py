@@ -0,0 +1,274 @@
+# movies/export.py
+"""
+오프라인 학습/분석용 상호작용 내보내기 (export_interactions 명령, /api/v1/export/interactions/)
+
+한 행 = (kind, user_id, movie_id, value, timestamp)
+    rating     value = 평점 (0.5 ~ 5.0)
+    watchlist  value = WANT / DONE / DROP   (npz 에서는 코드 1/2/3, watchlist_value_labels 참고)
+    like       value = 1                    (movie_id 는 좋아요한 리뷰의 영화)
+    timestamp = updated_at (UTC)
+
+형식
+  - csv   : 헤더 + 한 줄에 한 행
+  - jsonl : 한 줄에 JSON 객체 하나
+  - npz   : 컬럼별 .npy 를 묶은 zip (np.load 로 열고 pandas/pyarrow 로 바로 DataFrame/Parquet)
+            <kind>_user_id, <kind>_movie_id (int64), <kind>_value, <kind>_timestamp (datetime64[us])
+
+메모리
+  - 모두 values_list(...).iterator(chunk_size) 로 읽고 청크 단위로 bytes 를 yield
+    → StreamingHttpResponse / 파일 어디로 보내든 행 수와 상관없이 메모리 일정
+  - npz 는 .npy 헤더에 행 수가 먼저 들어가야 해서, 컬럼을 임시 파일에 쌓아 두었다가 zip 으로 흘려보낸다.
+
+증분 (워터마크)
+  - since < updated_at <= until 인 행만. until 은 내보내기 시작 시각.
+  - 다음 번에는 이번 until 을 since 로 넘기면 빠짐·중복 없이 이어진다.
+    (삭제된 행은 증분에 나타나지 않는다. 필요하면 가끔 전체 내보내기)
+"""
+import csv
+import io
+import json
+import tempfile
+import zipfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import numpy as np
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import LikeReview, Rating, WatchList
+
+JOB_NAME = 'export_interactions'
+FORMATS = ('csv', 'jsonl', 'npz')
+COLUMNS = ('kind', 'user_id', 'movie_id', 'value', 'timestamp')
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson',
+    'npz': 'application/zip',
+}
+
+WATCHLIST_CODES = {'WANT': 1, 'DONE': 2, 'DROP': 3}
+
+# kind → (모델, value 로 읽을 필드, movie_id 로 읽을 필드)
+KINDS = {
+    'rating': (Rating, 'score', 'movie_id'),
+    'watchlist': (WatchList, 'status', 'movie_id'),
+    'like': (LikeReview, None, 'review__movie_id'),
+}
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def parse_since(value):
+    """'2025-01-01' / '2025-01-01T12:00:00' / '...+09:00' → aware datetime (시간대 없으면 TIME_ZONE)"""
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f'since 는 ISO 8601 날짜/시각이어야 합니다: {value!r}')
+        parsed = datetime(day.year, day.month, day.day)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def parse_kinds(value):
+    kinds = [kind.strip() for kind in (value or '').split(',') if kind.strip()] or list(KINDS)
+    unknown = [kind for kind in kinds if kind not in KINDS]
+    if unknown:
+        raise ValueError(f'알 수 없는 kind: {", ".join(unknown)} (가능: {", ".join(KINDS)})')
+    return list(dict.fromkeys(kinds))
+
+
+def iter_rows(kind, since=None, until=None, chunk_size=5000):
+    """(user_id, movie_id, value, updated_at) 를 pk 순서로 (since < updated_at <= until)"""
+    model, value_field, movie_field = KINDS[kind]
+    queryset = model.objects.order_by('pk')
+    if since is not None:
+        queryset = queryset.filter(updated_at__gt=since)
+    if until is not None:
+        queryset = queryset.filter(updated_at__lte=until)
+
+    if value_field is None:
+        for user_id, movie_id, updated_at in queryset.values_list(
+            'user_id', movie_field, 'updated_at',
+        ).iterator(chunk_size=chunk_size):
+            yield user_id, movie_id, 1, updated_at
+    else:
+        yield from queryset.values_list(
+            'user_id', movie_field, value_field, 'updated_at',
+        ).iterator(chunk_size=chunk_size)
+
+
+def _text_value(value):
+    # Decimal('4.5') → 4.5 (JSON 숫자), 나머지는 그대로
+    return float(value) if not isinstance(value, (int, str)) else value
+
+
+def _batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ──────────────────────────────────────
+# csv / jsonl
+# ──────────────────────────────────────
+def stream_csv(kinds, since=None, until=None, chunk_size=5000):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(COLUMNS)
+    for kind in kinds:
+        for batch in _batched(iter_rows(kind, since, until, chunk_size), chunk_size):
+            writer.writerows(
+                (kind, user_id, movie_id, _text_value(value), updated_at.isoformat())
+                for user_id, movie_id, value, updated_at in batch
+            )
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def stream_jsonl(kinds, since=None, until=None, chunk_size=5000):
+    for kind in kinds:
+        for batch in _batched(iter_rows(kind, since, until, chunk_size), chunk_size):
+            yield ''.join(
+                json.dumps({
+                    'kind': kind,
+                    'user_id': user_id,
+                    'movie_id': movie_id,
+                    'value': _text_value(value),
+                    'timestamp': updated_at.isoformat(),
+                }, ensure_ascii=False) + '\n'
+                for user_id, movie_id, value, updated_at in batch
+            ).encode('utf-8')
+
+
+# ──────────────────────────────────────
+# npz (컬럼별 .npy 를 zip 으로)
+# ──────────────────────────────────────
+class _Pipe:
+    """ZipFile 이 쓰는 바이트를 모아 두었다가 꺼내 가는 쓰기 전용 스트림 (seek 불가 → zip 스트리밍 모드)"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _npz_columns(kind):
+    value_dtype = np.float32 if kind == 'rating' else np.int8
+    return (
+        ('user_id', np.dtype(np.int64)),
+        ('movie_id', np.dtype(np.int64)),
+        ('value', np.dtype(value_dtype)),
+        ('timestamp', np.dtype('datetime64[us]')),
+    )
+
+
+def _npz_value(kind, value):
+    if kind == 'watchlist':
+        return WATCHLIST_CODES.get(value, 0)
+    return value
+
+
+def _spill(kind, since, until, chunk_size):
+    """한 kind 를 읽어 컬럼별 임시 파일에 raw 바이트로 쌓기 → (행 수, {컬럼: (dtype, 파일)})"""
+    columns = _npz_columns(kind)
+    files = {name: (dtype, tempfile.TemporaryFile()) for name, dtype in columns}
+    count = 0
+    for batch in _batched(iter_rows(kind, since, until, chunk_size), chunk_size):
+        user_ids, movie_ids, values, stamps = zip(*batch)
+        arrays = {
+            'user_id': np.array(user_ids, dtype=np.int64),
+            'movie_id': np.array(movie_ids, dtype=np.int64),
+            'value': np.array([_npz_value(kind, value) for value in values], dtype=files['value'][0]),
+            'timestamp': np.array(
+                [(stamp - EPOCH) // MICROSECOND for stamp in stamps],
+                dtype=np.int64,
+            ).view('datetime64[us]'),
+        }
+        for name, (_, file) in files.items():
+            file.write(arrays[name].tobytes())
+        count += len(batch)
+    return count, files
+
+
+def _npy_header(dtype, count):
+    buffer = io.BytesIO()
+    np.lib.format.write_array_header_1_0(buffer, {
+        'descr': np.lib.format.dtype_to_descr(dtype),
+        'fortran_order': False,
+        'shape': (count,),
+    })
+    return buffer.getvalue()
+
+
+def stream_npz(kinds, since=None, until=None, chunk_size=5000):
+    pipe = _Pipe()
+    with zipfile.ZipFile(pipe, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        if 'watchlist' in kinds:
+            labels = np.array(['', *WATCHLIST_CODES])   # 코드 → 상태 문자열
+            with archive.open('watchlist_value_labels.npy', 'w') as entry:
+                np.lib.format.write_array(entry, labels)
+            yield pipe.drain()
+
+        for kind in kinds:
+            count, files = _spill(kind, since, until, chunk_size)
+            for name, (dtype, file) in files.items():
+                with file, archive.open(f'{kind}_{name}.npy', 'w', force_zip64=True) as entry:
+                    entry.write(_npy_header(dtype, count))
+                    file.seek(0)
+                    while True:
+                        block = file.read(1 << 20)
+                        if not block:
+                            break
+                        entry.write(block)
+                        yield pipe.drain()
+                yield pipe.drain()
+    yield pipe.drain()
+
+
+STREAMS = {
+    'csv': stream_csv,
+    'jsonl': stream_jsonl,
+    'npz': stream_npz,
+}
+
+
+def export_interactions(fmt, kinds=None, since=None, until=None, chunk_size=5000):
+    """형식별 bytes 청크 제너레이터. until 기본값은 지금 (다음 증분의 since 로 쓰기)"""
+    if fmt not in STREAMS:
+        raise ValueError(f'알 수 없는 형식: {fmt} (가능: {", ".join(FORMATS)})')
+    kinds = kinds or list(KINDS)
+    chunks = STREAMS[fmt](kinds, since=since, until=until or timezone.now(), chunk_size=chunk_size)
+    return (chunk for chunk in chunks if chunk)
+
+
+def copy_stream(chunks, fileobj):
+    """청크 제너레이터를 파일에 그대로 쓰기 (명령에서 사용). 쓴 바이트 수 반환"""
+    written = 0
+    for chunk in chunks:
+        fileobj.write(chunk)
+        written += len(chunk)
+    return written
+
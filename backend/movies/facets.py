@@ -0,0 +1,301 @@
+# movies/facets.py
+"""
+영화 목록 필터 + 패싯 카운트 (/api/v1/movies/?genre=&country=&year_min=&year_max=&runtime_min=&runtime_max=&person=&role=)
+
+필터
+  genre=1,2        장르 id (여러 개면 그중 하나라도)
+  country=KR,US    국가 코드 (ISO 3166-1, 여러 개면 그중 하나라도)
+  year_min/max     개봉 연도 범위 (양끝 포함)
+  runtime_min/max  상영 시간(분) 범위 (양끝 포함)
+  person=12&role=director   그 인물이 참여한 영화 (role 생략 시 역할 무관)
+
+패싯 카운트 (첫 페이지 응답의 facets / count)
+  - 프로세스 메모리의 비트맵 색인(FacetIndex)으로 센다. 요청마다 GROUP BY 조인을 하지 않는다.
+      장르   : 장르마다 영화 위치 비트맵 (np.packbits) → AND 후 비트 수
+      국가 / 연대 / 상영 시간 구간 : 영화 위치별 코드 배열 → np.bincount
+  - 패싯마다 "자기 자신을 뺀 나머지 필터" 를 적용한 수를 센다.
+    (장르를 하나 골라도 다른 장르의 수가 0 이 되지 않아 바꿔 고를 수 있게)
+  - 색인은 CacheVersion 'facets' 버전이 바뀌면(import, 영화/장르/출연진 저장) 다시 만든다.
+    다시 만드는 동안 다른 요청은 이전 색인으로 응답한다.
+
+결과 목록
+  - 걸러진 영화가 적으면(MAX_ID_FILTER 이하) 비트맵에서 나온 id 로 id IN (...),
+    많으면 SQL 조건(EXISTS / 범위)으로 키셋 페이지네이션 그대로.
+"""
+import threading
+
+import numpy as np
+from asgiref.sync import sync_to_async
+from django.db.models import Exists, OuterRef
+
+from .models import Genre, Movie, MovieCast, MovieGenre
+
+FACETS_KEY = 'facets'
+
+# 상영 시간 구간 (이상, 미만, 이름)
+RUNTIME_BUCKETS = (
+    (None, 90, '~90'),
+    (90, 120, '90~120'),
+    (120, 150, '120~150'),
+    (150, None, '150~'),
+)
+DECADE = 10
+# 걸러진 영화가 이 이하면 id IN (...) 으로 결과를 가져온다
+MAX_ID_FILTER = 2000
+
+FILTER_PARAMS = ('genre', 'country', 'year_min', 'year_max', 'runtime_min', 'runtime_max', 'person', 'role')
+ROLES = tuple(role for role, _ in MovieCast.ROLE_CHOICES)
+
+
+# ──────────────────────────────────────
+# 요청 파라미터
+# ──────────────────────────────────────
+def _int(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f'{name} 는 숫자여야 합니다.')
+
+
+def _list(params, name, cast=str):
+    values = [part.strip() for part in ','.join(params.getlist(name)).split(',') if part.strip()]
+    try:
+        return list(dict.fromkeys(cast(value) for value in values))
+    except ValueError:
+        raise ValueError(f'{name} 는 쉼표로 구분한 숫자여야 합니다.')
+
+
+def parse_filters(params):
+    """QueryDict → {필터 이름: 값} (주어진 것만). 잘못된 값은 ValueError"""
+    filters = {
+        'genre': _list(params, 'genre', int),
+        'country': [code.upper() for code in _list(params, 'country')],
+        'year_min': _int(params, 'year_min'),
+        'year_max': _int(params, 'year_max'),
+        'runtime_min': _int(params, 'runtime_min'),
+        'runtime_max': _int(params, 'runtime_max'),
+        'person': _int(params, 'person'),
+        'role': params.get('role') or None,
+    }
+    if filters['role'] is not None:
+        if filters['role'] not in ROLES:
+            raise ValueError(f'role 은 {", ".join(ROLES)} 중 하나여야 합니다.')
+        if filters['person'] is None:
+            raise ValueError('role 은 person 과 같이 써야 합니다.')
+    return {name: value for name, value in filters.items() if value not in (None, [])}
+
+
+def apply_filters(queryset, filters):
+    """SQL 조건으로 거르기 (결과가 많을 때)"""
+    if 'genre' in filters:
+        queryset = queryset.filter(Exists(
+            MovieGenre.objects.filter(movie=OuterRef('pk'), genre_id__in=filters['genre'])
+        ))
+    if 'country' in filters:
+        queryset = queryset.filter(country__in=filters['country'])
+    if 'year_min' in filters:
+        queryset = queryset.filter(release_year__gte=filters['year_min'])
+    if 'year_max' in filters:
+        queryset = queryset.filter(release_year__lte=filters['year_max'])
+    if 'runtime_min' in filters:
+        queryset = queryset.filter(runtime__gte=filters['runtime_min'])
+    if 'runtime_max' in filters:
+        queryset = queryset.filter(runtime__lte=filters['runtime_max'])
+    if 'person' in filters:
+        queryset = queryset.filter(Exists(person_casts(filters).filter(movie=OuterRef('pk'))))
+    return queryset
+
+
+def person_casts(filters):
+    # (person, role) 인덱스
+    casts = MovieCast.objects.filter(person_id=filters['person'])
+    if 'role' in filters:
+        casts = casts.filter(role=filters['role'])
+    return casts
+
+
+# ──────────────────────────────────────
+# 비트맵 색인
+# ──────────────────────────────────────
+class FacetIndex:
+    def __init__(self, version=None):
+        self.version = version
+        self.ids = np.empty(0, dtype=np.int64)
+        self.years = np.empty(0, dtype=np.int32)
+        self.runtimes = np.empty(0, dtype=np.int32)
+        self.countries = []
+        self.country_codes = np.empty(0, dtype=np.int32)
+        self.genres = []            # [(id, name)]
+        self.genre_bits = {}        # 장르 id → packbits 비트맵
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, version=None):
+        index = cls(version)
+        rows = list(Movie.objects.order_by('id').values_list('id', 'release_year', 'runtime', 'country'))
+        n = len(rows)
+        if n:
+            ids, years, runtimes, countries = zip(*rows)
+            index.ids = np.array(ids, dtype=np.int64)
+            # NULL 은 0 (범위 필터 / 패싯에서 빠진다)
+            index.years = np.array([year or 0 for year in years], dtype=np.int32)
+            index.runtimes = np.array([runtime or 0 for runtime in runtimes], dtype=np.int32)
+            labels, codes = np.unique(np.array(countries, dtype=object).astype(str), return_inverse=True)
+            index.countries = labels.tolist()
+            index.country_codes = codes.astype(np.int32)
+
+        links = np.array(
+            list(MovieGenre.objects.values_list('genre_id', 'movie_id')), dtype=np.int64,
+        ).reshape(-1, 2)
+        positions = np.searchsorted(index.ids, links[:, 1])
+        index.genres = list(Genre.objects.order_by('id').values_list('id', 'name'))
+        for genre_id, _ in index.genres:
+            mask = np.zeros(n, dtype=bool)
+            mask[positions[links[:, 0] == genre_id]] = True
+            index.genre_bits[genre_id] = np.packbits(mask)
+        return index
+
+    def unpack(self, bits):
+        return np.unpackbits(bits, count=len(self.ids)).view(bool)
+
+    # ── 필터별 마스크 (영화 위치별 bool)
+    def masks(self, filters):
+        masks = {}
+        if 'genre' in filters:
+            bits = np.zeros((len(self.ids) + 7) // 8, dtype=np.uint8)
+            for genre_id in filters['genre']:
+                if genre_id in self.genre_bits:
+                    bits |= self.genre_bits[genre_id]
+            masks['genre'] = self.unpack(bits)
+        if 'country' in filters:
+            wanted = [code for code, label in enumerate(self.countries) if label in filters['country']]
+            masks['country'] = np.isin(self.country_codes, wanted)
+        if 'year_min' in filters or 'year_max' in filters:
+            masks['year'] = self.range_mask(self.years, filters.get('year_min'), filters.get('year_max'))
+        if 'runtime_min' in filters or 'runtime_max' in filters:
+            masks['runtime'] = self.range_mask(
+                self.runtimes, filters.get('runtime_min'), filters.get('runtime_max'),
+            )
+        if 'person' in filters:
+            movie_ids = np.array(list(person_casts(filters).values_list('movie_id', flat=True)), dtype=np.int64)
+            masks['person'] = np.isin(self.ids, movie_ids)
+        return masks
+
+    @staticmethod
+    def range_mask(values, low, high):
+        mask = values > 0
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+        return mask
+
+    @staticmethod
+    def combine(masks, n, skip=None):
+        mask = np.ones(n, dtype=bool)
+        for name, other in masks.items():
+            if name != skip:
+                mask &= other
+        return mask
+
+    # ── 패싯 카운트
+    def genre_counts(self, mask):
+        packed = np.packbits(mask)
+        counts = (
+            (genre_id, name, int(np.bitwise_count(packed & self.genre_bits[genre_id]).sum()))
+            for genre_id, name in self.genres
+        )
+        return sorted(
+            ({'id': genre_id, 'name': name, 'count': count} for genre_id, name, count in counts if count),
+            key=lambda item: (-item['count'], item['id']),
+        )
+
+    def country_counts(self, mask):
+        counts = np.bincount(self.country_codes[mask], minlength=len(self.countries))
+        return sorted(
+            (
+                {'value': label, 'count': int(count)}
+                for label, count in zip(self.countries, counts.tolist()) if count and label
+            ),
+            key=lambda item: (-item['count'], item['value']),
+        )
+
+    def decade_counts(self, mask):
+        years = self.years[mask]
+        decades, counts = np.unique(years[years > 0] // DECADE * DECADE, return_counts=True)
+        return [
+            {'value': int(decade), 'count': int(count)}
+            for decade, count in zip(decades.tolist(), counts.tolist())
+        ]
+
+    def runtime_counts(self, mask):
+        runtimes = self.runtimes[mask]
+        runtimes = runtimes[runtimes > 0]
+        items = []
+        for low, high, label in RUNTIME_BUCKETS:
+            bucket = np.ones(len(runtimes), dtype=bool)
+            if low is not None:
+                bucket &= runtimes >= low
+            if high is not None:
+                bucket &= runtimes < high
+            count = int(bucket.sum())
+            if count:
+                items.append({'value': label, 'min': low, 'max': high, 'count': count})
+        return items
+
+    async def asearch(self, filters):
+        """async 뷰용 search: DB 를 읽는 건 인물 필터뿐이라 그때만 스레드에서"""
+        if 'person' in filters:
+            return await sync_to_async(self.search)(filters)
+        return self.search(filters)
+
+    def search(self, filters):
+        """
+        (걸러진 영화 id 배열, 전체 수, 패싯 카운트)
+        패싯마다 자기 필터만 빼고 센다 (연대 / 상영 시간은 각각 year / runtime 범위를 뺀다)
+        """
+        n = len(self.ids)
+        masks = self.masks(filters)
+        mask = self.combine(masks, n)
+        facets = {
+            'genre': self.genre_counts(self.combine(masks, n, skip='genre')),
+            'country': self.country_counts(self.combine(masks, n, skip='country')),
+            'decade': self.decade_counts(self.combine(masks, n, skip='year')),
+            'runtime': self.runtime_counts(self.combine(masks, n, skip='runtime')),
+        }
+        return self.ids[mask], int(mask.sum()), facets
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index(version):
+    """
+    version(get_versions 의 'facets' 등) 에 맞는 색인. 다른 요청이 다시 만드는 중이면 이전 색인을 그대로
+    """
+    global _index
+    current = _index
+    if current is not None and current.version == version:
+        return current
+    if not _index_lock.acquire(blocking=current is None):
+        return current
+    try:
+        if _index is None or _index.version != version:
+            _index = FacetIndex.build(version)
+        return _index
+    finally:
+        _index_lock.release()
+
+
+async def aget_index(version):
+    """async 뷰용 get_index: 색인이 최신이면 바로, 다시 만들어야 하면 (DB 읽기) 스레드에서"""
+    current = _index
+    if current is not None and current.version == version:
+        return current
+    return await sync_to_async(get_index)(version)
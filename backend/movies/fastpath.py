@@ -0,0 +1,190 @@
+# movies/fastpath.py
+"""
+읽기 전용 목록의 빠른 직렬화 / 렌더링
+
+DRF ModelSerializer 는 응답마다 serializer / 필드 객체를 만들고 필드마다 get_attribute → to_representation 을
+거친다. 목록(영화 카드 / 워치리스트)은 SQL 보다 이쪽이 더 오래 걸려서,
+
+RowSerializer
+  - serializer 클래스 하나를 import 시점에 한 번 "컴파일" → (필드 이름, 값 꺼내기, 변환) 목록
+  - values() 행(dict)이나 모델 객체를 받아 같은 dict 를 만든다 (중첩 serializer 는 movie__title 처럼 조인 컬럼으로)
+  - 변환은 DRF 필드의 to_representation 그대로 (CharField / IntegerField / FloatField 는 str / int / float 로 바로)
+    → 값이 None 이면 None, 나머지는 DRF 와 같은 결과
+  - 모델 property 는 COMPUTED 에 같은 규칙으로 (avg_score: Movie.avg_score)
+
+FastJSONRenderer (settings REST_FRAMEWORK 기본 렌더러)
+  - orjson 이 있으면 orjson, 없으면 DRF JSONRenderer 그대로 (pip install orjson)
+  - DRF 와 바이트 단위로 같게:
+      datetime / Decimal 등은 DRF JSONEncoder.default 로, \\u2028 / \\u2029 는 이스케이프
+      지수 표기 float(1e16, 2.5e-07 ...)는 orjson 표기가 달라서, 그런 모양이 보이면 표준 json 으로 다시
+      indent 요청 / orjson 이 못 쓰는 값(64비트 넘는 정수, 문자열 아닌 키 ...)도 표준 json 으로
+"""
+import re
+from datetime import datetime
+from operator import attrgetter
+
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+from .serializers import MovieListSerializer, MovieSerializer, WatchListItemSerializer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 은 선택
+    orjson = None
+
+# 변환이 str() / int() / float() 하나뿐인 필드 (DRF to_representation 과 같음)
+PLAIN_CONVERTERS = {
+    serializers.CharField: str,
+    serializers.URLField: str,
+    serializers.IntegerField: int,
+    serializers.FloatField: float,
+}
+
+# 모델 property → (읽을 컬럼, 행에서 값 계산)
+COMPUTED = {
+    # Movie.avg_score: 평점이 없으면 None
+    'avg_score': (
+        ('rating_count', 'rating_avg'),
+        lambda row, prefix: row[prefix + 'rating_avg'] if row[prefix + 'rating_count'] else None,
+    ),
+}
+
+
+class RowSerializer:
+    def __init__(self, serializer_class, prefix=''):
+        self.serializer_class = serializer_class
+        self.columns = []   # values() 에 넘길 컬럼
+        self.plan = []      # (이름, 행 → 값, 값 → 표현)
+        self.datetime_fields = []   # (plan 위치, DateTimeField) - bind() 에서 시간대를 정해 바꿔 끼운다
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if type(field) is serializers.DateTimeField:
+                self.datetime_fields.append((len(self.plan), field))
+            self.plan.append(self.compile_field(name, field, prefix))
+        self.columns = list(dict.fromkeys(self.columns))
+        self.getters = [(column, attrgetter(column.replace('__', '.'))) for column in self.columns]
+
+    def compile_field(self, name, field, prefix):
+        if isinstance(field, serializers.BaseSerializer):
+            if isinstance(field, serializers.ListSerializer):
+                raise TypeError(f'{self.serializer_class.__name__}.{name}: many=True 중첩은 지원하지 않습니다.')
+            nested = RowSerializer(type(field), prefix=f'{prefix}{field.source}__')
+            self.columns += nested.columns
+            key = f'{prefix}{field.source}__id'
+            return name, (lambda row: row if row[key] is not None else None), nested.serialize
+        if field.source in COMPUTED:
+            columns, compute = COMPUTED[field.source]
+            self.columns += [prefix + column for column in columns]
+            get = lambda row: compute(row, prefix)   # noqa: E731
+        elif isinstance(field, (serializers.SerializerMethodField, serializers.RelatedField)):
+            raise TypeError(f'{self.serializer_class.__name__}.{name}: {type(field).__name__} 는 지원하지 않습니다.')
+        else:
+            column = prefix + field.source.replace('.', '__')
+            self.columns.append(column)
+            get = lambda row: row[column]   # noqa: E731
+        return name, get, PLAIN_CONVERTERS.get(type(field), field.to_representation)
+
+    def bind(self):
+        """여러 행을 직렬화하기 전에 한 번: 요청 안에서 늘 같은 것(시간대, 출력 형식)을 미리 꺼낸 plan"""
+        if not self.datetime_fields:
+            return self.plan
+        plan = list(self.plan)
+        for index, field in self.datetime_fields:
+            name, get, _ = plan[index]
+            plan[index] = name, get, datetime_converter(field)
+        return plan
+
+    def serialize(self, row, plan=None):
+        data = {}
+        for name, get, convert in plan or self.plan:
+            value = get(row)
+            data[name] = None if value is None else convert(value)
+        return data
+
+    def serialize_many(self, rows):
+        """values(*self.columns) 행들 → dict 리스트"""
+        plan = self.bind()
+        return [self.serialize(row, plan) for row in rows]
+
+    def serialize_objects(self, objects):
+        """이미 읽어 둔 모델 객체들 (중첩은 select_related 해 둘 것)"""
+        getters = self.getters
+        plan = self.bind()
+        return [self.serialize({column: get(obj) for column, get in getters}, plan) for obj in objects]
+
+
+def datetime_converter(field):
+    """
+    DateTimeField.to_representation 에서 값마다 다시 꺼내던 출력 형식 / 현재 시간대를 지금 한 번만.
+    aware datetime → ISO 8601 만 여기서, 나머지(naive, 다른 형식, 범위 초과)는 DRF 그대로
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if not isinstance(output_format, str) or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if not isinstance(value, datetime) or not timezone.is_aware(value):
+            return field.to_representation(value)
+        try:
+            value = value.astimezone(field_timezone).isoformat()
+        except OverflowError:
+            return field.to_representation(value)
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+_compiled = {}
+
+
+def row_serializer(serializer_class):
+    """serializer 클래스별로 한 번만 컴파일"""
+    compiled = _compiled.get(serializer_class)
+    if compiled is None:
+        compiled = _compiled[serializer_class] = RowSerializer(serializer_class)
+    return compiled
+
+
+MOVIE_LIST_ROWS = row_serializer(MovieListSerializer)
+MOVIE_ROWS = row_serializer(MovieSerializer)
+WATCHLIST_ITEM_ROWS = row_serializer(WatchListItemSerializer)
+
+
+# ──────────────────────────────────────
+# JSON 렌더링
+# ──────────────────────────────────────
+# orjson 과 표준 json 의 float 표기가 다른 지수 표기: 숫자 뒤의 e- / e<숫자>
+# (문자열 안의 비슷한 모양도 걸리지만 그땐 표준 json 으로 갈 뿐. 'e' 로 시작해야 re 가 빨리 훑는다)
+EXPONENT = re.compile(rb'e[-\d]')
+LINE_SEPARATOR = re.compile(rb'\xe2\x80[\xa8\xa9]')
+
+
+def has_exponent(ret):
+    return any(ret[match.start() - 1:match.start()].isdigit() for match in EXPONENT.finditer(ret))
+
+
+def escape_line_separator(match):
+    return b'\\u2028' if match.group() == b'\xe2\x80\xa8' else b'\\u2029'
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default, option=orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except (orjson.JSONEncodeError, TypeError):
+            return super().render(data, accepted_media_type, renderer_context)
+        if has_exponent(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+        if LINE_SEPARATOR.search(ret):
+            ret = LINE_SEPARATOR.sub(escape_line_separator, ret)
+        return ret
@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from movies.models import Movie, Person
+from movies.tmdb import TMDBClient
+
+
+class Command(BaseCommand):
+    help = "tmdb_id 가 비어 있는 예전 Movie/Person 을 TMDB 검색으로 찾아 채우기 (결과가 하나로 특정될 때만)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8, help="동시 검색 스레드 수 (기본 8)")
+        parser.add_argument("--batch-size", type=int, default=200, help="한 번에 처리할 행 수 (기본 200)")
+        parser.add_argument("--base-url", default=None, help="TMDB API 주소 (기본 settings.TMDB_API_BASE)")
+        parser.add_argument("--skip-people", action="store_true", help="Person 은 건너뛰기")
+
+    def handle(self, *args, **options):
+        workers = max(1, options["workers"])
+        client = TMDBClient(base_url=options["base_url"], pool_size=workers)
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                filled = self.backfill(
+                    pool, Movie.objects.filter(tmdb_id__isnull=True).only("id", "title", "original_title", "release_year"),
+                    lambda movie: self.match_movie(client, movie), options["batch_size"],
+                )
+                self.stdout.write(f"Movie: {filled}건 연결")
+
+                if not options["skip_people"]:
+                    filled = self.backfill(
+                        pool, Person.objects.filter(tmdb_id__isnull=True).only("id", "name"),
+                        lambda person: self.match_person(client, person), options["batch_size"],
+                    )
+                    self.stdout.write(f"Person: {filled}건 연결")
+        finally:
+            client.close()
+
+        self.stdout.write(self.style.SUCCESS("완료!"))
+
+    def backfill(self, pool, queryset, match, batch_size):
+        model = queryset.model
+        filled = 0
+        last_id = 0
+        while True:
+            rows = list(queryset.filter(id__gt=last_id).order_by("id")[:batch_size])
+            if not rows:
+                return filled
+            last_id = rows[-1].id
+
+            found = {}
+            for row, tmdb_id in zip(rows, pool.map(match, rows)):
+                if tmdb_id is not None:
+                    found.setdefault(tmdb_id, []).append(row)
+
+            # 이미 다른 행이 쓰고 있거나, 같은 묶음에서 겹치는 tmdb_id 는 건너뛰기
+            taken = set(model.objects.filter(tmdb_id__in=found.keys()).values_list("tmdb_id", flat=True))
+            updates = []
+            for tmdb_id, matched in found.items():
+                if tmdb_id in taken or len(matched) > 1:
+                    continue
+                matched[0].tmdb_id = tmdb_id
+                updates.append(matched[0])
+            model.objects.bulk_update(updates, ["tmdb_id"])
+            filled += len(updates)
+
+    @staticmethod
+    def match_movie(client, movie):
+        params = {"year": movie.release_year} if movie.release_year else {}
+        results = [
+            r for r in client.search("movie", movie.title, **params)
+            if movie.title in (r.get("title"), r.get("original_title"))
+            or (movie.original_title and movie.original_title == r.get("original_title"))
+        ]
+        return results[0]["id"] if len(results) == 1 else None
+
+    @staticmethod
+    def match_person(client, person):
+        results = [r for r in client.search("person", person.name) if r.get("name") == person.name]
+        return results[0]["id"] if len(results) == 1 else None
@@ -0,0 +1,105 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from movies import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "API 벤치마크: 모든 엔드포인트를 테스트 클라이언트(쿼리 수 포함)와 동시 HTTP 부하로 측정하고 "
+        "movies/bench_budgets.json 예산을 넘으면 실패 (seed_benchmark 로 만든 DB 에서)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50, help="테스트 클라이언트 엔드포인트별 요청 수 (기본 50)")
+        parser.add_argument("--warm", action="store_true", help="응답 캐시를 비우지 않고 측정 (기본은 매번 비움)")
+        parser.add_argument("--http", action="store_true", help="HTTP 부하도 측정")
+        parser.add_argument("--url", help="부하를 보낼 서버 (예: http://127.0.0.1:8000). 없으면 프로세스 안에 서버를 띄움")
+        parser.add_argument("--workers", type=int, default=8, help="동시에 요청하는 worker 수 (기본 8)")
+        parser.add_argument("--http-requests", type=int, default=200, help="HTTP 엔드포인트별 요청 수 (기본 200)")
+        parser.add_argument("--only", help="이름에 이 문자열이 들어간 엔드포인트만 (쉼표로 여러 개)")
+        parser.add_argument("--budgets", help="예산 파일 (기본 movies/bench_budgets.json)")
+        parser.add_argument("--no-latency", action="store_true", help="예산 중 쿼리 수만 검사 (느린/시끄러운 머신)")
+        parser.add_argument("--write-budgets", action="store_true", help="검사 대신 이번 측정값으로 예산 파일 쓰기")
+        parser.add_argument("--headroom", type=float, default=1.5, help="--write-budgets 때 시간 여유 배수 (기본 1.5)")
+        parser.add_argument("--json", dest="json_path", help="측정 결과를 JSON 으로 저장")
+
+    def handle(self, *args, **options):
+        try:
+            fixtures = benchmark.find_fixtures()
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        endpoints = benchmark.build_endpoints(fixtures)
+        if options["only"]:
+            wanted = [part.strip() for part in options["only"].split(",") if part.strip()]
+            endpoints = [endpoint for endpoint in endpoints if any(part in endpoint.name for part in wanted)]
+        tokens = benchmark.auth_tokens(fixtures)
+
+        self.stdout.write(
+            f"엔드포인트 {len(endpoints)}개, 테스트 클라이언트 {options['requests']}번씩"
+            f" ({'캐시 유지' if options['warm'] else '응답 캐시 비움'})"
+        )
+        results = benchmark.run_client(endpoints, tokens, requests=options["requests"], cold=not options["warm"])
+
+        if options["http"]:
+            self.stdout.write(f"HTTP 부하: worker {options['workers']}개, 엔드포인트별 {options['http_requests']}번")
+            if options["url"]:
+                http = benchmark.run_http(
+                    endpoints, tokens, options["url"].rstrip("/"),
+                    workers=options["workers"], requests=options["http_requests"],
+                )
+            else:
+                with benchmark.serve() as base_url:
+                    http = benchmark.run_http(
+                        endpoints, tokens, base_url,
+                        workers=options["workers"], requests=options["http_requests"],
+                    )
+            for name, values in http.items():
+                results[name].update(values)
+
+        self.report(results)
+        if options["json_path"]:
+            with open(options["json_path"], "w", encoding="utf-8") as fp:
+                json.dump(results, fp, ensure_ascii=False, indent=2)
+
+        if options["write_budgets"]:
+            benchmark.write_budgets(
+                benchmark.make_budgets(results, headroom=options["headroom"]), options["budgets"],
+                comment="bench_api --write-budgets 로 생성. queries 는 요청당 SQL 수(정확히), "
+                        "*_ms 는 넘으면 실패, *_rps 는 밑돌면 실패",
+            )
+            self.stdout.write(self.style.SUCCESS("✅ 예산 파일을 이번 측정값으로 갱신했습니다."))
+            return
+
+        try:
+            budgets = benchmark.load_budgets(options["budgets"])
+        except FileNotFoundError:
+            raise CommandError("예산 파일이 없습니다. --write-budgets 로 먼저 만들어 주세요.")
+        violations = benchmark.check_budgets(results, budgets, latency=not options["no_latency"])
+        missing = sorted(set(results) - set(budgets))
+        if missing:
+            self.stdout.write(self.style.WARNING(f"예산이 없는 엔드포인트: {', '.join(missing)}"))
+        if violations:
+            for name, key, value, limit in violations:
+                self.stderr.write(f"  {name}: {key} {value} (예산 {limit})")
+            raise CommandError(f"예산 초과 {len(violations)}건")
+        self.stdout.write(self.style.SUCCESS("✅ 모든 엔드포인트가 예산 안"))
+
+    def report(self, results):
+        has_http = any("http_p50_ms" in result for result in results.values())
+        header = f"{'endpoint':<22} {'p50':>7} {'p95':>7} {'p99':>7} {'req/s':>7} {'쿼리':>4} {'에러':>4}"
+        if has_http:
+            header += f" │ {'http p50':>8} {'p95':>7} {'p99':>7} {'req/s':>7} {'에러':>4}"
+        self.stdout.write(header)
+        for name, r in results.items():
+            line = (
+                f"{name:<22} {r['p50_ms']:>7.1f} {r['p95_ms']:>7.1f} {r['p99_ms']:>7.1f}"
+                f" {r['rps']:>7.1f} {r['queries']:>4} {r['errors']:>4}"
+            )
+            if "http_p50_ms" in r:
+                line += (
+                    f" │ {r['http_p50_ms']:>8.1f} {r['http_p95_ms']:>7.1f} {r['http_p99_ms']:>7.1f}"
+                    f" {r['http_rps']:>7.1f} {r['http_errors']:>4}"
+                )
+            self.stdout.write(line)
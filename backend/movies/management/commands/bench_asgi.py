@@ -0,0 +1,100 @@
+import importlib.util
+
+from django.core.management.base import BaseCommand, CommandError
+
+from movies import benchmark
+
+# async 뷰(movies.async_views)가 맡는 읽기 엔드포인트
+READ_ENDPOINTS = (
+    "movies", "movies-filtered", "movies-trending", "movie-detail", "movie-detail-auth",
+    "movie-reviews", "movie-similar", "watchlist-me",
+)
+MB = 1024 * 1024
+
+
+class Command(BaseCommand):
+    help = (
+        "동기 WSGI 워커(gunicorn) vs ASGI 워커(uvicorn + async 뷰) 처리량 비교: 같은 메모리 예산 안에 "
+        "들어가는 만큼 워커를 띄우고 읽기 엔드포인트에 동시 HTTP 부하 (seed_benchmark 로 만든 DB 에서)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--memory-mb", type=int, default=512, help="서버 전체(마스터 + 워커) 메모리 예산 MB (기본 512)")
+        parser.add_argument("--workers", type=int, help="메모리 예산 대신 양쪽 모두 이 워커 수로")
+        parser.add_argument("--threads", type=int, default=1, help="WSGI 워커당 스레드 (기본 1: sync 워커)")
+        parser.add_argument("--concurrency", type=int, default=32, help="동시에 요청하는 클라이언트 수 (기본 32)")
+        parser.add_argument("--requests", type=int, default=400, help="엔드포인트별 요청 수 (기본 400)")
+        parser.add_argument(
+            "--db-latency-ms", type=float, default=0,
+            help="쿼리마다 더할 지연 ms (네트워크 너머 DB 흉내, 기본 0: 로컬 SQLite 그대로)",
+        )
+        parser.add_argument("--only", help="이름에 이 문자열이 들어간 엔드포인트만 (쉼표로 여러 개)")
+
+    def handle(self, *args, **options):
+        for kind, (module, _) in benchmark.SERVERS.items():
+            if importlib.util.find_spec(module) is None:
+                raise CommandError(f"{kind} 서버로 {module} 가 필요합니다: pip install {module}")
+        try:
+            fixtures = benchmark.find_fixtures()
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        endpoints = [
+            endpoint for endpoint in benchmark.build_endpoints(fixtures) if endpoint.name in READ_ENDPOINTS
+        ]
+        if options["only"]:
+            wanted = [part.strip() for part in options["only"].split(",") if part.strip()]
+            endpoints = [endpoint for endpoint in endpoints if any(part in endpoint.name for part in wanted)]
+        tokens = benchmark.auth_tokens(fixtures)
+
+        runs = {}
+        for kind in benchmark.SERVERS:
+            env = {
+                "ASYNC_VIEWS": "1" if kind == "asgi" else "0",
+                "BENCH_DB_LATENCY_MS": str(options["db_latency_ms"]),
+            }
+            workers = options["workers"] or self.fit_workers(kind, options, env, endpoints, tokens)
+            self.stdout.write(f"{kind}: 워커 {workers}개로 측정 중...")
+            with benchmark.spawn_server(kind, workers, options["threads"], env) as (base_url, pid):
+                # 워커마다 응답 캐시 / 패싯 색인이 찬 뒤에 잰다
+                benchmark.run_http(endpoints, tokens, base_url, options["concurrency"], options["requests"])
+                results = benchmark.run_http(
+                    endpoints, tokens, base_url, options["concurrency"], options["requests"],
+                )
+                rss = sum(benchmark.process_rss(pid).values())
+            runs[kind] = {"workers": workers, "rss": rss, "results": results}
+        self.report(runs, endpoints)
+
+    def fit_workers(self, kind, options, env, endpoints, tokens):
+        """워커 1개로 한 바퀴 돌린 뒤의 메모리로 예산 안에 들어가는 워커 수 (마스터 프로세스 몫은 따로)"""
+        with benchmark.spawn_server(kind, 1, options["threads"], env) as (base_url, pid):
+            benchmark.run_http(endpoints, tokens, base_url, options["concurrency"], options["requests"])
+            rss = benchmark.process_rss(pid)
+        # 워커 1개면 uvicorn 은 마스터 없이 한 프로세스
+        master = rss[pid] if len(rss) > 1 else 0
+        per_worker = sum(rss.values()) - master
+        workers = max(1, int((options["memory_mb"] * MB - master) // per_worker))
+        self.stdout.write(
+            f"{kind}: 워커당 {per_worker / MB:.0f}MB (마스터 {master / MB:.0f}MB)"
+            f" → 예산 {options['memory_mb']}MB 에 워커 {workers}개"
+        )
+        return workers
+
+    def report(self, runs, endpoints):
+        wsgi, asgi = runs["wsgi"], runs["asgi"]
+        self.stdout.write(
+            f"{'endpoint':<20} {'wsgi req/s':>10} {'p95':>7} {'에러':>4} │ {'asgi req/s':>10} {'p95':>7} {'에러':>4} {'배':>6}"
+        )
+        for endpoint in endpoints:
+            w, a = wsgi["results"][endpoint.name], asgi["results"][endpoint.name]
+            self.stdout.write(
+                f"{endpoint.name:<20} {w['http_rps']:>10.1f} {w['http_p95_ms']:>7.1f} {w['http_errors']:>4}"
+                f" │ {a['http_rps']:>10.1f} {a['http_p95_ms']:>7.1f} {a['http_errors']:>4}"
+                f" {a['http_rps'] / w['http_rps'] if w['http_rps'] else 0:>5.2f}x"
+            )
+        for kind, run in runs.items():
+            rps = [result["http_rps"] for result in run["results"].values()]
+            mean = sum(rps) / len(rps) if rps else 0
+            self.stdout.write(
+                f"{kind}: 워커 {run['workers']}개, 메모리 {run['rss'] / MB:.0f}MB,"
+                f" 평균 {mean:.1f} req/s ({mean / (run['rss'] / MB / 1024):.0f} req/s per GB)"
+            )
@@ -0,0 +1,108 @@
+import random
+import threading
+import time
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+
+from movies.aggregates import rebuild_rating_stats, save_rating
+from movies.models import Movie
+
+BENCH_USER_PREFIX = "bench_writer_"
+
+
+class Command(BaseCommand):
+    help = (
+        "동시 쓰기 벤치마크: 스레드 여러 개가 동시에 평점을 저장할 때 처리량 / 지연 / 'database is locked' 수 "
+        "(DB_ENGINE, SQLITE_TUNING 등 환경 변수를 바꿔 가며 비교. 끝나면 만든 평점은 지움)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8, help="동시에 쓰는 스레드 수 (기본 8)")
+        parser.add_argument("--writes", type=int, default=200, help="스레드당 평점 저장 수 (기본 200)")
+        parser.add_argument("--movies", type=int, default=50, help="평점을 줄 영화 수 (적을수록 같은 행 경합↑, 기본 50)")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        movie_ids = list(Movie.objects.order_by("id").values_list("id", flat=True)[:options["movies"]])
+        if not movie_ids:
+            raise CommandError("영화가 없습니다. import_tmdb 로 먼저 데이터를 넣어 주세요.")
+        n_threads, n_writes = options["threads"], options["writes"]
+
+        User = get_user_model()
+        User.objects.filter(username__startswith=BENCH_USER_PREFIX).delete()
+        User.objects.bulk_create([User(username=f"{BENCH_USER_PREFIX}{i}") for i in range(n_threads)])
+        users = list(User.objects.filter(username__startswith=BENCH_USER_PREFIX).order_by("id"))
+
+        self.stdout.write(self.describe_database())
+        latencies = [[] for _ in range(n_threads)]
+        errors = [0] * n_threads
+        start_gate = threading.Barrier(n_threads + 1)
+
+        def worker(index):
+            rnd = random.Random(options["seed"] * 1000 + index)
+            user = users[index]
+            try:
+                start_gate.wait()
+                for _ in range(n_writes):
+                    movie_id = rnd.choice(movie_ids)
+                    score = rnd.choice([1, 1.5, 2, 2.5, 3, 3.5, 4, 4.5, 5])
+                    began = time.perf_counter()
+                    try:
+                        save_rating(user, movie_id, score)
+                    except OperationalError:
+                        errors[index] += 1
+                        continue
+                    latencies[index].append(time.perf_counter() - began)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(n_threads)]
+        for thread in threads:
+            thread.start()
+        start_gate.wait()
+        began = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - began
+
+        done = np.array([value for values in latencies for value in values]) * 1000
+        total_errors = sum(errors)
+        if len(done):
+            p50, p95, p99 = np.percentile(done, [50, 95, 99])
+            self.stdout.write(
+                f"스레드 {n_threads} × {n_writes}: 성공 {len(done):,} / 실패(locked 등) {total_errors:,}, "
+                f"{len(done) / elapsed:,.0f} writes/s, p50 {p50:.1f}ms p95 {p95:.1f}ms p99 {p99:.1f}ms"
+            )
+        else:
+            self.stdout.write(self.style.WARNING(f"성공한 쓰기 없음 (실패 {total_errors:,})"))
+
+        # 정리: 벤치 유저(와 평점) 삭제 후 영향받은 영화 집계 다시 계산
+        User.objects.filter(username__startswith=BENCH_USER_PREFIX).delete()
+        rebuild_rating_stats(movie_ids)
+        style = self.style.SUCCESS if not total_errors else self.style.WARNING
+        self.stdout.write(style(f"완료 (만든 평점 삭제, 영화 {len(movie_ids)}편 집계 복구)"))
+
+    @staticmethod
+    def describe_database():
+        settings_dict = connection.settings_dict
+        options = settings_dict.get("OPTIONS", {})
+        if connection.vendor != "sqlite":
+            pool = "pool" in options
+            return (
+                f"DB: {connection.vendor} {settings_dict.get('HOST')} "
+                f"(CONN_MAX_AGE={settings_dict.get('CONN_MAX_AGE')}, pool={'on' if pool else 'off'})"
+            )
+        with connection.cursor() as cursor:
+            pragmas = {}
+            for name in ("journal_mode", "synchronous", "busy_timeout", "mmap_size"):
+                cursor.execute(f"PRAGMA {name}")
+                pragmas[name] = cursor.fetchone()[0]
+        return (
+            f"DB: sqlite {settings_dict['NAME']} "
+            f"(journal_mode={pragmas['journal_mode']}, synchronous={pragmas['synchronous']}, "
+            f"busy_timeout={pragmas['busy_timeout']}ms, mmap_size={pragmas['mmap_size']}, "
+            f"transaction_mode={options.get('transaction_mode') or 'DEFERRED'})"
+        )
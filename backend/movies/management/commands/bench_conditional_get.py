@@ -0,0 +1,85 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from rest_framework_simplejwt.tokens import AccessToken
+
+from movies.models import Movie, Review
+
+
+class Command(BaseCommand):
+    help = "ETag 조건부 GET 벤치마크: 같은 요청을 200(본문 전체) / 304(If-None-Match) 로 보내 시간·바이트 비교"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="엔드포인트별 요청 수 (기본 200)")
+        parser.add_argument("--page-size", type=int, default=20, help="목록 page_size (기본 20)")
+        parser.add_argument("--host", default="localhost", help="Host 헤더 (ALLOWED_HOSTS 에 있어야 함)")
+
+    def handle(self, *args, **options):
+        movie = (
+            Movie.objects.filter(id__in=Review.objects.values("movie_id")).order_by("-id").first()
+            or Movie.objects.order_by("-id").first()
+        )
+        if movie is None:
+            raise CommandError("영화가 없습니다. import_tmdb 로 먼저 데이터를 넣어 주세요.")
+
+        # 로그인 유저 기준 (내 평점 / 좋아요 / 워치리스트 버전까지 ETag 에 포함되는 경로)
+        headers = {"HTTP_HOST": options["host"]}
+        user = get_user_model().objects.order_by("id").first()
+        if user is not None:
+            headers["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(user)}"
+        client = Client(**headers)
+
+        page_size = options["page_size"]
+        urls = [
+            f"/api/v1/movies/?page_size={page_size}",
+            f"/api/v1/movies/?ordering=-avg_score&page_size={page_size}",
+            f"/api/v1/movies/{movie.id}/",
+            f"/api/v1/movies/{movie.id}/reviews/?page_size={page_size}",
+            "/api/v1/watchlist/me/",
+        ]
+
+        n = options["requests"]
+        self.stdout.write(f"요청 {n}번씩 (로그인 유저: {user or '없음'})")
+        self.stdout.write(
+            f"{'endpoint':<48} {'200 ms':>8} {'304 ms':>8} {'200 cpu':>8} {'304 cpu':>8}"
+            f" {'200 B':>8} {'304 B':>6} {'절약':>6}"
+        )
+        for url in urls:
+            first = client.get(url)
+            if first.status_code != 200 or "ETag" not in first:
+                self.stdout.write(self.style.WARNING(f"{url}: {first.status_code}, ETag 없음 → 건너뜀"))
+                continue
+
+            full = self.measure(client, url, n)
+            conditional = self.measure(client, url, n, HTTP_IF_NONE_MATCH=first["ETag"])
+            if conditional["status"] != 304:
+                self.stdout.write(self.style.WARNING(f"{url}: 304 가 아님 ({conditional['status']})"))
+                continue
+
+            saved = 1 - conditional["wall"] / full["wall"] if full["wall"] else 0
+            self.stdout.write(
+                f"{url:<48} {full['wall']:>8.2f} {conditional['wall']:>8.2f}"
+                f" {full['cpu']:>8.2f} {conditional['cpu']:>8.2f}"
+                f" {full['bytes']:>8} {conditional['bytes']:>6} {saved:>6.0%}"
+            )
+
+    @staticmethod
+    def measure(client, url, n, **headers):
+        """요청당 평균 (경과 ms, CPU ms, 본문 바이트)"""
+        wall = cpu = size = 0
+        status = None
+        for _ in range(n):
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            res = client.get(url, **headers)
+            wall += time.perf_counter() - wall_start
+            cpu += time.process_time() - cpu_start
+            size += len(res.content)
+            status = res.status_code
+        return {
+            "wall": wall / n * 1000,
+            "cpu": cpu / n * 1000,
+            "bytes": size // n,
+            "status": status,
+        }
@@ -0,0 +1,108 @@
+import time
+from urllib.parse import urlencode
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from movies import cache as movie_cache, facets
+from movies.models import Movie, MovieCast, MovieGenre
+
+
+class Command(BaseCommand):
+    help = "목록 필터 벤치마크: 필터 조합별 첫 페이지(패싯 포함)·다음 페이지 시간과 쿼리 수, 패싯을 GROUP BY 로 셀 때와 비교"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=20, help="조합별 요청 수 (기본 20)")
+        parser.add_argument("--page-size", type=int, default=20, help="page_size (기본 20)")
+        parser.add_argument("--host", default="localhost", help="Host 헤더 (ALLOWED_HOSTS 에 있어야 함)")
+
+    def handle(self, *args, **options):
+        total = Movie.objects.count()
+        if not total:
+            raise CommandError("영화가 없습니다. import_tmdb 로 먼저 데이터를 넣어 주세요.")
+
+        # 데이터에서 흔한 값 / 드문 값을 골라 필터 조합 만들기
+        genres = list(
+            MovieGenre.objects.values_list("genre_id").annotate(n=Count("id")).order_by("-n")[:2]
+        )
+        country = (
+            Movie.objects.exclude(country="").values_list("country")
+            .annotate(n=Count("id")).order_by("-n").first()
+        )
+        director = (
+            MovieCast.objects.filter(role="director").values_list("person_id")
+            .annotate(n=Count("id")).order_by("-n").first()
+        )
+        scenarios = [("필터 없음", {})]
+        if genres:
+            scenarios.append(("장르 1개", {"genre": genres[0][0]}))
+        if len(genres) > 1:
+            scenarios.append(("장르 2개 (OR)", {"genre": f"{genres[0][0]},{genres[1][0]}"}))
+        if country:
+            scenarios.append(("국가 + 연도 범위", {"country": country[0], "year_min": 2000, "year_max": 2015}))
+        scenarios.append(("상영 시간 범위", {"runtime_min": 90, "runtime_max": 120}))
+        if genres and country:
+            scenarios.append(("장르 + 국가 + 연도 + 상영 시간", {
+                "genre": genres[0][0], "country": country[0], "year_min": 1990, "runtime_max": 150,
+            }))
+        if director:
+            scenarios.append(("감독", {"person": director[0], "role": "director"}))
+
+        client = Client(HTTP_HOST=options["host"])
+        n, page_size = options["requests"], options["page_size"]
+        self.stdout.write(f"영화 {total:,}편, 조합별 {n}번 (응답 캐시를 매번 비운 상태)")
+        self.stdout.write(
+            f"{'조합':<28} {'결과 수':>8} {'첫 페이지':>9} {'쿼리':>4} {'다음 페이지':>10}"
+            f" {'패싯(비트맵)':>11} {'패싯(GROUP BY)':>14}"
+        )
+        for label, params in scenarios:
+            url = "/api/v1/movies/?" + urlencode({**params, "page_size": page_size})
+            first = client.get(url)
+            if first.status_code != 200:
+                raise CommandError(f"{url}: {first.status_code} {first.content[:200]!r}")
+            data = first.json()
+
+            first_ms, queries = self.measure(client, url, n)
+            next_ms = self.measure(client, data["next"], n)[0] if data["next"] else 0.0
+
+            filters = facets.parse_filters(first.wsgi_request.GET)
+            versions = movie_cache.get_versions(["all", facets.FACETS_KEY])
+            index = facets.get_index((versions["all"], versions[facets.FACETS_KEY]))
+            bitmap_ms = self.timeit(lambda: index.search(filters), n)
+            group_by_ms = self.timeit(lambda: self.group_by_counts(filters), max(1, n // 4))
+
+            self.stdout.write(
+                f"{label:<28} {data['count']:>8,} {first_ms:>7.1f}ms {queries:>4} {next_ms:>8.1f}ms"
+                f" {bitmap_ms:>9.2f}ms {group_by_ms:>12.1f}ms"
+            )
+
+    @staticmethod
+    def timeit(func, n):
+        start = time.perf_counter()
+        for _ in range(n):
+            func()
+        return (time.perf_counter() - start) / n * 1000
+
+    def measure(self, client, url, n):
+        """요청당 평균 ms (응답 캐시 비우고), 마지막 요청의 쿼리 수"""
+        elapsed = 0.0
+        for _ in range(n):
+            movie_cache.get_cache().clear()
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                client.get(url)
+                elapsed += time.perf_counter() - start
+        return elapsed / n * 1000, len(captured.captured_queries)
+
+    @staticmethod
+    def group_by_counts(filters):
+        """비교용: 같은 패싯을 요청마다 SQL GROUP BY 로 센다면"""
+        movies = facets.apply_filters(Movie.objects.all(), filters)
+        list(MovieGenre.objects.filter(movie__in=movies.values("id")).values("genre_id").annotate(n=Count("id")))
+        list(movies.values("country").annotate(n=Count("id")))
+        list(movies.values("release_year").annotate(n=Count("id")))
+        list(movies.values("runtime").annotate(n=Count("id")))
+        return movies.count()
@@ -0,0 +1,83 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from movies import fastpath
+from movies.models import Movie, WatchList
+from movies.serializers import MovieListSerializer, MovieSerializer, WatchListItemSerializer
+from movies.views import with_user_score
+
+
+class Command(BaseCommand):
+    help = (
+        "읽기 전용 직렬화 벤치마크: DRF(모델 객체 → serializer → JSONRenderer) vs "
+        "fastpath(values() 행 → RowSerializer → orjson) 페이지 크기별 시간·초당 행, 응답 바이트가 같은지"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="20,100,1000", help="페이지 크기 (기본 20,100,1000)")
+        parser.add_argument("--repeat", type=int, default=20, help="크기별 반복 횟수, 가장 빠른 값 (기본 20)")
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options["sizes"].split(",") if size]
+        if not WatchList.objects.exists():
+            raise CommandError("워치리스트가 없습니다. seed_benchmark 로 먼저 데이터를 넣어 주세요.")
+        cases = [
+            ("MovieListSerializer", MovieListSerializer, fastpath.MOVIE_LIST_ROWS, Movie.objects.order_by("-id")),
+            ("MovieSerializer", MovieSerializer, fastpath.MOVIE_ROWS, Movie.objects.order_by("-id")),
+            (
+                "WatchListItemSerializer", WatchListItemSerializer, fastpath.WATCHLIST_ITEM_ROWS,
+                # 여러 유저의 항목을 섞어서 (페이지 크기 1000 용), 평점 조인은 한 유저 기준
+                with_user_score(
+                    WatchList.objects.select_related("movie").order_by("-created_at"),
+                    WatchList.objects.values("user_id").order_by("-id").first()["user_id"],
+                ),
+            ),
+        ]
+        self.stdout.write(f"orjson: {'있음' if fastpath.orjson else '없음 (표준 json)'} / 반복 {options['repeat']}번 중 최솟값")
+        self.stdout.write(
+            f"{'serializer':<24} {'rows':>5} {'drf ms':>8} {'ser':>7} {'render':>7}"
+            f" {'fast ms':>8} {'ser':>7} {'render':>7} {'fast rows/s':>12} {'배속':>6} {'같음':>4}"
+        )
+        for name, serializer_class, rows, queryset in cases:
+            for size in sizes:
+                page = queryset[:size]
+                drf_body, drf = self.measure(
+                    options["repeat"],
+                    lambda: list(page.all()),
+                    lambda objects: serializer_class(objects, many=True).data,
+                    JSONRenderer().render,
+                )
+                fast_body, fast = self.measure(
+                    options["repeat"],
+                    lambda: list(page.values(*rows.columns)),
+                    rows.serialize_many,
+                    fastpath.FastJSONRenderer().render,
+                )
+                total = sum(fast)
+                self.stdout.write(
+                    f"{name:<24} {len(page):>5} {sum(drf) * 1000:>8.2f} {drf[1] * 1000:>7.2f} {drf[2] * 1000:>7.2f}"
+                    f" {total * 1000:>8.2f} {fast[1] * 1000:>7.2f} {fast[2] * 1000:>7.2f}"
+                    f" {len(page) / total if total else 0:>12,.0f} {sum(drf) / total if total else 0:>5.1f}x"
+                    f" {'✓' if drf_body == fast_body else '✗':>4}"
+                )
+                if drf_body != fast_body:
+                    raise CommandError(f"{name} ({size}행): fastpath 응답 바이트가 DRF 와 다릅니다.")
+
+    @staticmethod
+    def measure(repeat, fetch, serialize, render):
+        """단계별(읽기, 직렬화, 렌더링) 최소 시간(초)과 마지막 응답 바이트"""
+        best = [float("inf")] * 3
+        body = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fetched = fetch()
+            fetched_at = time.perf_counter()
+            data = serialize(fetched)
+            serialized_at = time.perf_counter()
+            body = render(data)
+            rendered_at = time.perf_counter()
+            for i, elapsed in enumerate((fetched_at - start, serialized_at - fetched_at, rendered_at - serialized_at)):
+                best[i] = min(best[i], elapsed)
+        return body, best
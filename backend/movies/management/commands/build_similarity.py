@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from movies.similarity import build_similarity
+
+
+class Command(BaseCommand):
+    help = "장르/감독/배우/국가/공동 평점 기반 영화별 top-K 유사 영화 계산 (기본: 지난 빌드 이후 바뀐 영화만)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="워터마크 무시하고 전체 다시 계산",
+        )
+        parser.add_argument(
+            "--movie",
+            type=int,
+            action="append",
+            dest="movie_ids",
+            help="바뀐 것으로 간주할 영화 id (여러 번 지정 가능)",
+        )
+        parser.add_argument(
+            "--top-k",
+            type=int,
+            default=None,
+            help="영화당 저장할 이웃 수 (기본 settings.SIMILARITY_TOP_K 또는 20)",
+        )
+
+    def handle(self, *args, **options):
+        written = build_similarity(
+            full=options["full"],
+            movie_ids=options["movie_ids"],
+            top_k=options["top_k"],
+            log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(f"유사도 저장 완료: 영화 {written}편"))
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from movies.user_similarity import METRICS, build_user_similarity
+
+
+class Command(BaseCommand):
+    help = "평점 기반 유저-유저 유사도(평균 중심화 코사인) top-K 계산 → /api/v1/feed/me/ (기본: 지난 빌드 이후 평점이 바뀐 유저만)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="워터마크 무시하고 전체 다시 계산",
+        )
+        parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            dest="user_ids",
+            help="바뀐 것으로 간주할 유저 id (여러 번 지정 가능)",
+        )
+        parser.add_argument(
+            "--top-k",
+            type=int,
+            default=None,
+            help="유저당 저장할 이웃 수 (기본 settings.USER_SIMILARITY_TOP_K 또는 50)",
+        )
+        parser.add_argument(
+            "--metric",
+            choices=METRICS,
+            default=None,
+            help="pearson(평균 중심화) | cosine (기본 settings.USER_SIMILARITY_METRIC)",
+        )
+        parser.add_argument(
+            "--shrinkage",
+            type=float,
+            default=None,
+            help="공동 평점 수 n 에 n/(n+shrinkage) 가중 (0 이면 끄기, 기본 settings.USER_SIMILARITY_SHRINKAGE)",
+        )
+
+    def handle(self, *args, **options):
+        if not options["full"] and (options["metric"] or options["shrinkage"] is not None or options["top_k"]):
+            raise CommandError("--top-k / --metric / --shrinkage 를 바꾸면 저장된 이웃과 섞이지 않도록 --full 로 실행해 주세요.")
+        written = build_user_similarity(
+            full=options["full"],
+            user_ids=options["user_ids"],
+            top_k=options["top_k"],
+            metric=options["metric"],
+            shrinkage=options["shrinkage"],
+            log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(f"유저 유사도 저장 완료: 유저 {written}명"))
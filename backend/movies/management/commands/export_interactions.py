@@ -0,0 +1,52 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from movies.export import FORMATS, JOB_NAME, copy_stream, export_interactions, parse_kinds, parse_since
+from movies.models import JobState
+
+
+class Command(BaseCommand):
+    help = "Rating/WatchList/LikeReview 를 (user, movie, value, timestamp) 로 내보내기 (csv / jsonl / npz, 메모리 일정)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=FORMATS, default="csv", help="출력 형식 (기본 csv)")
+        parser.add_argument("--kinds", default="", help="rating,watchlist,like 중 쉼표로 (기본 전부)")
+        parser.add_argument("--output", "-o", default="-", help="출력 파일 경로 (기본 '-' = 표준 출력)")
+        parser.add_argument("--since", default=None, help="이 시각 이후 바뀐 행만 (ISO 8601)")
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="--since 대신 지난 --incremental 실행 시각부터, 끝나면 워터마크 저장",
+        )
+        parser.add_argument("--chunk-size", type=int, default=5000, help="DB 에서 한 번에 읽을 행 수 (기본 5000)")
+
+    def handle(self, *args, **options):
+        try:
+            kinds = parse_kinds(options["kinds"])
+            since = parse_since(options["since"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        if options["incremental"] and since is None:
+            since = JobState.get_watermark(JOB_NAME)
+
+        until = timezone.now()
+        chunks = export_interactions(
+            options["format"], kinds=kinds, since=since, until=until, chunk_size=options["chunk_size"],
+        )
+        if options["output"] == "-":
+            written = copy_stream(chunks, sys.stdout.buffer)
+            sys.stdout.buffer.flush()
+        else:
+            with open(options["output"], "wb") as f:
+                written = copy_stream(chunks, f)
+
+        if options["incremental"]:
+            JobState.set_watermark(JOB_NAME, until)
+        # 표준 출력으로 데이터를 내보낼 때는 안내 문구를 stderr 로
+        out = self.stderr if options["output"] == "-" else self.stdout
+        out.write(self.style.SUCCESS(
+            f"내보내기 완료: {', '.join(kinds)} → {options['output']} ({written:,} bytes, "
+            f"{since.isoformat() if since else '처음'} ~ {until.isoformat()})"
+        ))
@@ -1,11 +1,14 @@
-import requests
-from django.core.management.base import BaseCommand
-from django.conf import settings
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-from movies.models import Movie, Genre, Person, MovieCast
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
 
-TMDB_API_KEY = settings.TMDB_API_KEY
-TMDB_IMAGE_BASE = getattr(settings, "TMDB_IMAGE_BASE", "https://image.tmdb.org/t/p/w500")
+from movies.search import index_movies
+from movies.tmdb import TMDBClient, parse_movie, write_movies
 
 
 class Command(BaseCommand):
@@ -18,143 +21,92 @@ class Command(BaseCommand):
             default=1,
             help="가져올 TMDB 인기 영화 페이지 수 (기본 1페이지)",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=8,
+            help="영화 상세를 동시에 가져올 스레드 수 (기본 8, 1이면 순차)",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="체크포인트에 기록된 마지막 페이지 다음부터 이어서 가져오기",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default=None,
+            help="체크포인트 파일 경로 (기본 var/import_tmdb.json)",
+        )
+        parser.add_argument(
+            "--base-url",
+            default=None,
+            help="TMDB API 주소 (기본 settings.TMDB_API_BASE, 테스트용 로컬 서버 지정 가능)",
+        )
+        parser.add_argument(
+            "--similarity",
+            action="store_true",
+            help="가져온 뒤 바뀐 영화만 유사도 증분 계산 (build_similarity)",
+        )
 
     def handle(self, *args, **options):
         pages = options["pages"]
-        self.stdout.write(self.style.SUCCESS(f"TMDB에서 인기 영화 {pages}페이지 가져오기 시작"))
+        workers = max(1, options["workers"])
+        checkpoint = Path(options["checkpoint"] or settings.BASE_DIR / "var" / "import_tmdb.json")
 
-        for page in range(1, pages + 1):
-            self.import_popular_page(page)
+        start_page = 1
+        if options["resume"]:
+            start_page = self.load_checkpoint(checkpoint) + 1
+            if start_page > 1:
+                self.stdout.write(f"체크포인트: {start_page - 1}페이지까지 완료 → {start_page}페이지부터 이어서")
 
-        self.stdout.write(self.style.SUCCESS("완료!"))
-
-    # ──────────────────────────────────────
-    # 한 페이지(20편) 가져오기
-    # ──────────────────────────────────────
-    def import_popular_page(self, page: int):
-        url = "https://api.themoviedb.org/3/movie/popular"
-        params = {
-            "api_key": TMDB_API_KEY,
-            "language": "ko-KR",
-            "page": page,
-        }
-
-        res = requests.get(url, params=params)
-        res.raise_for_status()
-        data = res.json()
-
-        for result in data.get("results", []):
-            tmdb_id = result["id"]
-            self.import_movie_detail(tmdb_id)
+        self.stdout.write(self.style.SUCCESS(f"TMDB에서 인기 영화 {pages}페이지 가져오기 시작"))
 
-    # ──────────────────────────────────────
-    # 영화 상세 + 크레딧까지 가져와서 DB에 저장
-    # ──────────────────────────────────────
-    def import_movie_detail(self, tmdb_id: int):
-        url = f"https://api.themoviedb.org/3/movie/{tmdb_id}"
-        params = {
-            "api_key": TMDB_API_KEY,
-            "language": "ko-KR",
-            "append_to_response": "credits",
-        }
-
-        res = requests.get(url, params=params)
-        if res.status_code != 200:
-            self.stdout.write(self.style.WARNING(f"영화 {tmdb_id} 불러오기 실패: {res.status_code}"))
-            return
-
-        data = res.json()
-
-        title = data.get("title") or data.get("original_title")
-        original_title = data.get("original_title") or title
-        overview = data.get("overview") or ""
-        runtime = data.get("runtime")
-        release_date = data.get("release_date")  # '2016-12-25'
-        release_year = int(release_date.split("-")[0]) if release_date else None
-
-        # country: 첫 번째 production_countries 기준
-        countries = data.get("production_countries") or []
-        country = countries[0]["iso_3166_1"] if countries else ""
-
-        poster_path = data.get("poster_path")
-        poster_url = TMDB_IMAGE_BASE + poster_path if poster_path else ""
-
-        # Movie 생성/갱신
-        movie, created = Movie.objects.update_or_create(
-            title=title,
-            release_year=release_year,
-            defaults={
-                "original_title": original_title,
-                "overview": overview,
-                "runtime": runtime,
-                "country": country,
-                "poster_url": poster_url,
-            },
-        )
+        client = TMDBClient(base_url=options["base_url"], pool_size=workers)
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for page in range(start_page, pages + 1):
+                    self.import_popular_page(client, pool, page)
+                    self.save_checkpoint(checkpoint, page, pages)
+        finally:
+            client.close()
 
-        msg = "생성" if created else "업데이트"
-        self.stdout.write(f"{msg}: {movie.title} ({release_year})")
+        # 끝까지 다 가져왔으면 체크포인트 정리
+        checkpoint.unlink(missing_ok=True)
 
-        # 장르 처리
-        self.attach_genres(movie, data.get("genres") or [])
+        if options["similarity"]:
+            call_command("build_similarity", stdout=self.stdout)
 
-        # 크레딧(감독/배우) 처리
-        credits = data.get("credits") or {}
-        self.attach_credits(movie, credits)
+        self.stdout.write(self.style.SUCCESS("완료!"))
 
     # ──────────────────────────────────────
-    # 장르 연결 (MovieGenre through 이용)
+    # 한 페이지(20편): 상세는 스레드 풀로 동시에, 저장은 트랜잭션 한 번
     # ──────────────────────────────────────
-    def attach_genres(self, movie: Movie, genres_data):
-        # ManyToMany through라서 바로 movie.genres.set([...]) 는 안 쓰고,
-        # Genre만 생성 → movie.genres.add(...) 로 연결
-        genre_objs = []
-        for g in genres_data:
-            name = g.get("name")
-            if not name:
+    def import_popular_page(self, client, pool, page: int):
+        tmdb_ids = client.popular(page)
+
+        parsed = []
+        for tmdb_id, (data, status) in zip(tmdb_ids, pool.map(client.movie_detail, tmdb_ids)):
+            if data is None:
+                self.stdout.write(self.style.WARNING(f"영화 {tmdb_id} 불러오기 실패: {status}"))
                 continue
-            genre_obj, _ = Genre.objects.get_or_create(name=name)
-            genre_objs.append(genre_obj)
+            parsed.append(parse_movie(data))
 
-        # 기존 장르 교체
-        movie.genres.set(genre_objs)
+        created, updated, movie_ids = write_movies(parsed)
+        # 검색 색인은 이번 페이지에서 바뀐 영화만
+        index_movies(movie_ids)
+        self.stdout.write(f"{page}페이지: 생성 {created}편, 업데이트 {updated}편")
 
     # ──────────────────────────────────────
-    # 크레딧에서 감독 + 배우 상위 몇 명만 저장
+    # 체크포인트 (중단돼도 --resume 으로 이어서)
     # ──────────────────────────────────────
-    def attach_credits(self, movie: Movie, credits_data):
-        # 기존 캐스트 제거 후 다시 채우기 (중복 방지)
-        movie.casts.all().delete()
-
-        cast_list = credits_data.get("cast") or []
-        crew_list = credits_data.get("crew") or []
-
-        # 감독: crew에서 job == 'Director'
-        for crew in crew_list:
-            if crew.get("job") != "Director":
-                continue
-            name = crew.get("name")
-            if not name:
-                continue
-            person, _ = Person.objects.get_or_create(name=name)
-            MovieCast.objects.get_or_create(
-                movie=movie,
-                person=person,
-                role="director",
-                defaults={"character_name": ""},
-            )
-
-        # 배우: 상위 5명만
-        for cast in cast_list[:5]:
-            name = cast.get("name")
-            character = cast.get("character") or ""
-            if not name:
-                continue
-
-            person, _ = Person.objects.get_or_create(name=name)
-            MovieCast.objects.get_or_create(
-                movie=movie,
-                person=person,
-                role="actor",
-                defaults={"character_name": character},
-            )
+    def load_checkpoint(self, path: Path) -> int:
+        try:
+            return int(json.loads(path.read_text()).get("last_page", 0))
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def save_checkpoint(self, path: Path, page: int, pages: int):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"last_page": page, "pages": pages}))
+        os.replace(tmp, path)
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from movies.aggregates import rebuild_rating_stats
+
+
+class Command(BaseCommand):
+    help = "Rating 테이블 기준으로 Movie 평점 집계(count/sum/avg/histogram) 다시 계산"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--movie",
+            type=int,
+            action="append",
+            dest="movie_ids",
+            help="특정 영화만 다시 계산 (여러 번 지정 가능)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="bulk_update 한 번에 저장할 영화 수 (기본 1000)",
+        )
+
+    def handle(self, *args, **options):
+        updated = rebuild_rating_stats(
+            movie_ids=options["movie_ids"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"평점 집계 재계산 완료: 영화 {updated}편"))
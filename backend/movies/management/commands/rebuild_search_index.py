@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from movies.search import get_backend, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "영화 검색 색인(제목/원제/줄거리/출연진) 전체 다시 만들기"
+
+    def handle(self, *args, **options):
+        count = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f"검색 색인 완료 ({get_backend().name}): 영화 {count}편"))
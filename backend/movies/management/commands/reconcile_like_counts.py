@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from movies.aggregates import reconcile_like_counts
+
+
+class Command(BaseCommand):
+    help = "LikeReview 개수와 어긋난 Review.like_count 바로잡기"
+
+    def handle(self, *args, **options):
+        fixed = reconcile_like_counts()
+        self.stdout.write(self.style.SUCCESS(f"좋아요 수 보정 완료: 리뷰 {fixed}건"))
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from movies.benchmark import seed_catalogue
+
+
+class Command(BaseCommand):
+    help = (
+        "벤치마크용 합성 카탈로그 만들기 (영화/인물/출연진/유저/평점/리뷰/좋아요/워치리스트, bulk_create). "
+        "빈 DB 에서 실행: DB_NAME=/tmp/bench.sqlite3 python manage.py migrate && ... seed_benchmark"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--movies", type=int, default=10000)
+        parser.add_argument("--people", type=int, default=8000)
+        parser.add_argument("--casts-per-movie", type=int, default=8, help="영화당 감독 1 + 배우 (기본 8)")
+        parser.add_argument("--users", type=int, default=3000)
+        parser.add_argument("--ratings", type=int, default=300000)
+        parser.add_argument("--reviews", type=int, default=30000)
+        parser.add_argument("--likes", type=int, default=60000)
+        parser.add_argument("--watchlist", type=int, default=30000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--no-similarity", action="store_true", help="비슷한 영화 / 유저 계산 건너뛰기")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            counts = seed_catalogue(
+                movies=options["movies"],
+                people=options["people"],
+                casts_per_movie=options["casts_per_movie"],
+                users=options["users"],
+                ratings=options["ratings"],
+                reviews=options["reviews"],
+                likes=options["likes"],
+                watchlist=options["watchlist"],
+                seed=options["seed"],
+                batch_size=options["batch_size"],
+                similarity=not options["no_similarity"],
+                log=self.stdout.write,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        summary = ", ".join(f"{name} {count:,}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ 벤치마크 데이터 생성 완료 ({time.perf_counter() - started:.1f}s): {summary}"
+        ))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from movies.recommend import save_model, train_als
+
+
+class Command(BaseCommand):
+    help = "Rating/WatchList 로 ALS 행렬 분해 학습 → 유저/영화 잠재 벡터 .npy 저장"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--factors", type=int, default=64, help="잠재 벡터 차원 (기본 64)")
+        parser.add_argument("--iterations", type=int, default=15, help="ALS 반복 횟수 (기본 15)")
+        parser.add_argument("--regularization", type=float, default=0.1, help="L2 정규화 (기본 0.1)")
+        parser.add_argument("--alpha", type=float, default=20.0, help="신뢰도 가중치 alpha (기본 20)")
+        parser.add_argument("--output", default=None, help="저장 경로 (기본 settings.RECOMMEND_MODEL_DIR)")
+
+    def handle(self, *args, **options):
+        try:
+            user_ids, item_ids, user_factors, item_factors = train_als(
+                factors=options["factors"],
+                iterations=options["iterations"],
+                regularization=options["regularization"],
+                alpha=options["alpha"],
+                log=self.stdout.write,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        meta = save_model(user_ids, item_ids, user_factors, item_factors, model_dir=options["output"])
+        self.stdout.write(self.style.SUCCESS(
+            f"추천 모델 저장 완료: 유저 {meta['users']}명, 영화 {meta['items']}편, {meta['factors']}차원"
+        ))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from movies.ranking import update_rankings
+
+
+class Command(BaseCommand):
+    help = "트렌딩(시간 감쇠 활동 점수) / 베이즈 평균 평점 갱신 (기본: 지난 실행 이후 활동이 생긴 영화만, cron 등으로 주기 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="워터마크 무시하고 트렌딩 점수 전체 다시 계산 (취소된 좋아요/워치리스트까지 반영)",
+        )
+
+    def handle(self, *args, **options):
+        result = update_rankings(full=options["full"], log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(
+            f"랭킹 갱신 완료: 트렌딩 {result['trending']}편, 베이즈 평균 {result['bayesian_avg']}편"
+        ))
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:42
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_rating_stats(apps, schema_editor):
+    Movie = apps.get_model('movies', 'Movie')
+    Rating = apps.get_model('movies', 'Rating')
+
+    histograms = defaultdict(dict)
+    rows = Rating.objects.values('movie_id', 'score').annotate(n=Count('id')).order_by()
+    for row in rows:
+        key = str(Decimal(str(row['score'])).quantize(Decimal('0.1')))
+        histograms[row['movie_id']][key] = row['n']
+
+    movies = []
+    for movie in Movie.objects.filter(id__in=histograms.keys()):
+        histogram = histograms[movie.id]
+        count = sum(histogram.values())
+        total = sum((Decimal(k) * n for k, n in histogram.items()), Decimal(0))
+        movie.rating_count = count
+        movie.rating_sum = total
+        movie.rating_avg = float(total / count)
+        movie.rating_histogram = histogram
+        movies.append(movie)
+
+    Movie.objects.bulk_update(
+        movies,
+        ['rating_count', 'rating_sum', 'rating_avg', 'rating_histogram'],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0002_alter_review_options_remove_review_spoiler_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='rating_avg',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='rating_histogram',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='rating_sum',
+            field=models.DecimalField(decimal_places=1, default=0, max_digits=12),
+        ),
+        migrations.RunPython(fill_rating_stats, migrations.RunPython.noop),
+    ]
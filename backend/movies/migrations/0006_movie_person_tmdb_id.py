@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0005_movie_similarity_jobstate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='tmdb_id',
+            field=models.PositiveIntegerField(blank=True, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='person',
+            name='tmdb_id',
+            field=models.PositiveIntegerField(blank=True, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:50
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_like_count(apps, schema_editor):
+    Review = apps.get_model('movies', 'Review')
+    LikeReview = apps.get_model('movies', 'LikeReview')
+    counts = (
+        LikeReview.objects.filter(review=OuterRef('pk'))
+        .order_by()
+        .values('review')
+        .annotate(n=Count('id'))
+        .values('n')
+    )
+    Review.objects.update(like_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0006_movie_person_tmdb_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_like_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_latest_review(apps, schema_editor):
+    Movie = apps.get_model('movies', 'Movie')
+    Review = apps.get_model('movies', 'Review')
+    latest = (
+        Review.objects.filter(movie=OuterRef('pk'))
+        .order_by('-created_at', '-id')
+        .values('id')[:1]
+    )
+    Movie.objects.update(latest_review=Subquery(latest))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0007_review_like_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='latest_review',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='movies.review'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['movie', '-created_at', '-id'], name='review_movie_created_idx'),
+        ),
+        migrations.RunPython(fill_latest_review, migrations.RunPython.noop),
+    ]
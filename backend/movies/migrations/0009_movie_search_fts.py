@@ -0,0 +1,45 @@
+from django.db import migrations
+
+FTS_TABLE = 'movies_search'
+
+
+def fts5_available(connection):
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+def create_search_table(apps, schema_editor):
+    # SQLite(FTS5) 에서만 만든다. 다른 DB 는 movies.search 의 python 역색인 사용
+    if not fts5_available(schema_editor.connection):
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+        "title, original_title, overview, cast_names, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '1 2 3')"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {FTS_TABLE}(rowid, title, original_title, overview, cast_names) "
+        "SELECT m.id, m.title, m.original_title, m.overview, "
+        "  COALESCE((SELECT group_concat(p.name, ' ') FROM movies_moviecast c "
+        "            JOIN movies_person p ON p.id = c.person_id WHERE c.movie_id = m.id), '') "
+        "FROM movies_movie m"
+    )
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0008_review_index_movie_latest_review'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
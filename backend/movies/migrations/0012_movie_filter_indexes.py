@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0011_movie_rankings'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['country', 'id'], name='movie_country_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['runtime', 'id'], name='movie_runtime_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='moviecast',
+            index=models.Index(fields=['person', 'role'], name='moviecast_person_role_idx'),
+        ),
+    ]
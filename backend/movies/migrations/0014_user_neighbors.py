@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-18 18:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('movies', '0013_watchlist_user_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserNeighbors',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='taste_neighbors', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('neighbor_ids', models.BinaryField()),
+                ('scores', models.BinaryField()),
+                ('computed_at', models.DateTimeField()),
+            ],
+        ),
+    ]
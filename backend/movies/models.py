@@ -13,6 +13,7 @@ class TimeStampedModel(models.Model):
 
 
 class Movie(TimeStampedModel):
+    tmdb_id = models.PositiveIntegerField(null=True, blank=True, unique=True)  # import 시 upsert 키
     title = models.CharField(max_length=255)
     original_title = models.CharField(max_length=255, blank=True)
     release_year = models.IntegerField(null=True, blank=True)
@@ -20,6 +21,21 @@ class Movie(TimeStampedModel):
     runtime = models.IntegerField(null=True, blank=True)
     poster_url = models.URLField(max_length=500, blank=True)
     overview = models.TextField(blank=True)
+    popularity = models.FloatField(default=0)  # TMDB popularity
+    # 가장 최근 리뷰 (short_review 에서 영화마다 최신 리뷰 쿼리 안 하도록)
+    latest_review = models.ForeignKey(
+        'Review', on_delete=models.SET_NULL, null=True, blank=True, related_name='+',
+    )
+
+    # 평점 집계 (Rating 저장 시 movies.aggregates 에서 같이 갱신)
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.DecimalField(max_digits=12, decimal_places=1, default=0)
+    rating_avg = models.FloatField(default=0)
+    rating_histogram = models.JSONField(default=dict, blank=True)  # {"4.0": 3, ...}
+
+    # 랭킹 (update_rankings 배치에서 갱신, movies.ranking 참고)
+    trending_score = models.FloatField(default=0)   # 시간 감쇠 활동 점수 (기준 시각 대비 상대값)
+    bayesian_avg = models.FloatField(default=0)     # 베이즈 가중 평균 평점 (평점 없으면 0)
 
     genres = models.ManyToManyField(
         'Genre',
@@ -35,18 +51,33 @@ class Movie(TimeStampedModel):
         blank=True,
     )
 
+    class Meta:
+        # 목록 키셋 페이지네이션용 (정렬값, id) 복합 인덱스
+        indexes = [
+            models.Index(fields=['release_year', 'id'], name='movie_year_id_idx'),
+            models.Index(fields=['rating_avg', 'id'], name='movie_avg_id_idx'),
+            models.Index(fields=['popularity', 'id'], name='movie_popularity_id_idx'),
+            models.Index(fields=['trending_score', 'id'], name='movie_trending_id_idx'),
+            models.Index(fields=['bayesian_avg', 'id'], name='movie_bayesian_id_idx'),
+            # 목록 필터 (country=, runtime 범위) - release_year 는 위 (release_year, id) 인덱스로
+            models.Index(fields=['country', 'id'], name='movie_country_id_idx'),
+            models.Index(fields=['runtime', 'id'], name='movie_runtime_id_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
     @property
     def avg_score(self):
-        agg = self.ratings.aggregate(avg=models.Avg('score'))
-        return agg['avg']
+        # 매번 AVG 쿼리 대신 row 에 저장된 값 사용
+        if not self.rating_count:
+            return None
+        return self.rating_avg
 
     @property
     def short_review(self):
-        """가장 최근 리뷰 기준 한 줄 요약"""
-        review = self.reviews.order_by('-created_at').first()
+        """가장 최근 리뷰 기준 한 줄 요약 (목록에서는 select_related('latest_review') 와 같이)"""
+        review = self.latest_review
         if not review:
             return None
 
@@ -64,6 +95,7 @@ class Genre(models.Model):
 
 
 class Person(TimeStampedModel):
+    tmdb_id = models.PositiveIntegerField(null=True, blank=True, unique=True)  # 동명이인 구분
     name = models.CharField(max_length=100)
     profile = models.TextField(blank=True)
 
@@ -95,6 +127,10 @@ class MovieCast(models.Model):
 
     class Meta:
         unique_together = ('movie', 'person', 'role')
+        indexes = [
+            # 인물 필터 (person=, role=) → 그 인물의 영화
+            models.Index(fields=['person', 'role'], name='moviecast_person_role_idx'),
+        ]
 
     def __str__(self):
         return f'{self.movie} - {self.person} ({self.role})'
@@ -107,6 +143,10 @@ class Rating(TimeStampedModel):
 
     class Meta:
         unique_together = ('user', 'movie')
+        indexes = [
+            # 랭킹 / 내보내기 증분 (updated_at > 워터마크)
+            models.Index(fields=['updated_at'], name='rating_updated_idx'),
+        ]
 
     def __str__(self):
         return f'{self.user} - {self.movie} ({self.score})'
@@ -116,10 +156,16 @@ class Review(models.Model):
     movie = models.ForeignKey('Movie', on_delete=models.CASCADE, related_name='reviews')
     author = models.CharField(max_length=50, blank=True)   # 닉네임 (로그인 붙이면 User FK로 바꿔도 됨)
     content = models.TextField()
+    like_count = models.PositiveIntegerField(default=0)  # LikeReview 개수 (좋아요 토글 시 F() 로 갱신)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['-id']
+        indexes = [
+            # 영화별 최신순 목록 (filter movie_id + order by -created_at, -id)
+            models.Index(fields=['movie', '-created_at', '-id'], name='review_movie_created_idx'),
+            models.Index(fields=['created_at'], name='review_created_idx'),
+        ]
 
     def __str__(self):
         return f'{self.movie.title} - {self.author}'
@@ -132,6 +178,9 @@ class LikeReview(TimeStampedModel):
 
     class Meta:
         unique_together = ('review', 'user')
+        indexes = [
+            models.Index(fields=['created_at'], name='likereview_created_idx'),
+        ]
 
     def __str__(self):
         return f'{self.user} likes {self.review_id}'
@@ -149,6 +198,74 @@ class WatchList(TimeStampedModel):
 
     class Meta:
         unique_together = ('user', 'movie')
+        indexes = [
+            models.Index(fields=['updated_at'], name='watchlist_updated_idx'),
+            # 내 워치리스트 최신순 (상태별 / 전체)
+            models.Index(fields=['user', 'status', 'created_at'], name='watchlist_user_status_idx'),
+            models.Index(fields=['user', 'created_at'], name='watchlist_user_created_idx'),
+        ]
 
     def __str__(self):
         return f'{self.user} - {self.movie} ({self.status})'
+
+
+class MovieSimilarity(models.Model):
+    """오프라인(build_similarity)으로 계산해 둔 영화별 top-K 이웃"""
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='similarities')
+    similar = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='neighbor_of')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        unique_together = ('movie', 'similar')
+        indexes = [
+            models.Index(fields=['movie', 'rank'], name='similarity_movie_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.movie_id} ~ {self.similar_id} ({self.score:.3f})'
+
+
+class UserNeighbors(models.Model):
+    """
+    오프라인(build_user_similarity)으로 계산해 둔 유저별 취향이 비슷한 유저 top-K.
+    유저당 한 행: 이웃 id(int32) / 유사도(float32) 배열을 바이트로 (movies.user_similarity.pack / unpack)
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='taste_neighbors')
+    neighbor_ids = models.BinaryField()
+    scores = models.BinaryField()
+    computed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f'{self.user_id} ~ {len(self.neighbor_ids) // 4} users'
+
+
+class JobState(models.Model):
+    """오프라인 배치 작업(유사도 계산 등)이 마지막으로 반영한 시점"""
+    name = models.CharField(max_length=50, unique=True)
+    watermark = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.name} @ {self.watermark}'
+
+    @classmethod
+    def get_watermark(cls, name):
+        return cls.objects.filter(name=name).values_list('watermark', flat=True).first()
+
+    @classmethod
+    def set_watermark(cls, name, watermark):
+        cls.objects.update_or_create(name=name, defaults={'watermark': watermark})
+
+
+class CacheVersion(models.Model):
+    """
+    응답 캐시 키 / ETag 에 들어가는 버전 카운터 (movies.cache)
+    캐시 저장소(프로세스별 LRU 등)와 달리 모든 프로세스가 같은 값을 보도록 DB 에 둔다.
+    """
+    key = models.CharField(max_length=100, unique=True)   # 'movie:12', 'order:rating_avg', 'user:3' ...
+    version = models.BigIntegerField()
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return f'{self.key} v{self.version}'
@@ -0,0 +1,284 @@
+# movies/pagination.py
+"""
+키셋(cursor) 페이지네이션
+
+DRF CursorPagination 은 정렬 첫 필드만 cursor 에 담고 동점은 OFFSET 으로 넘기기 때문에
+release_year 처럼 중복/NULL 이 많은 컬럼에서는 느려지거나 깨진다.
+여기서는 (정렬 값, id) 두 개를 cursor 에 담아서 항상 `WHERE (값, id) < (...) LIMIT n`
+형태의 쿼리 한 번으로 페이지를 가져온다. (COUNT 쿼리 없음)
+"""
+import base64
+import json
+from datetime import date, datetime
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import ParseError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    # 정렬 이름 → (필드, 내림차순 여부). 동점은 항상 id 로 같은 방향 정렬
+    orderings = {
+        '-id': ('id', True),
+        'id': ('id', False),
+    }
+    default_ordering = '-id'
+
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = '잘못된 cursor 입니다.'
+    invalid_ordering_message = '지원하지 않는 정렬입니다.'
+
+    def get_default_page_size(self):
+        return getattr(settings, 'API_PAGE_SIZE', 20)
+
+    def get_max_page_size(self):
+        return getattr(settings, 'API_MAX_PAGE_SIZE', 100)
+
+    # ──────────────────────────────────────
+    # 요청 파라미터 해석
+    # ──────────────────────────────────────
+    def get_page_size(self, request):
+        value = request.query_params.get(self.page_size_query_param)
+        try:
+            size = int(value) if value else self.get_default_page_size()
+        except ValueError:
+            size = self.get_default_page_size()
+        return max(1, min(size, self.get_max_page_size()))
+
+    def get_ordering(self, request):
+        ordering = request.query_params.get(self.ordering_query_param) or self.default_ordering
+        if ordering not in self.orderings:
+            raise ParseError(self.invalid_ordering_message)
+        return ordering
+
+    def decode_cursor(self, request):
+        """(정렬, 값, id, 역방향) 또는 None. 깨졌거나 손으로 만든 cursor 는 400"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            cursor = data['o'], data['v'], int(data['id']), bool(data.get('r'))
+        except (TypeError, ValueError, KeyError):
+            raise ParseError(self.invalid_cursor_message)
+        # 값은 encode_cursor 가 만드는 스칼라만 (dict / list 는 WHERE 절에 못 넣음)
+        if not isinstance(cursor[1], (str, int, float, type(None))):
+            raise ParseError(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, ordering, value, pk, reverse=False):
+        # 날짜는 마이크로초까지 그대로 (DjangoJSONEncoder 는 밀리초로 잘라서 키셋이 어긋남)
+        if isinstance(value, (date, datetime)):
+            value = value.isoformat()
+        data = {'o': ordering, 'v': value, 'id': pk}
+        if reverse:
+            data['r'] = 1
+        raw = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+
+    # ──────────────────────────────────────
+    # 쿼리 조립
+    # ──────────────────────────────────────
+    @staticmethod
+    def order_by_clause(field, descending):
+        if field == 'id':
+            return ['-id' if descending else 'id']
+        expr = F(field).desc(nulls_last=True) if descending else F(field).asc(nulls_last=True)
+        return [expr, '-id' if descending else 'id']
+
+    @staticmethod
+    def after_filter(field, descending, value, pk):
+        """(value, pk) 다음에 오는 행들 (NULL 은 항상 맨 뒤)"""
+        op = 'lt' if descending else 'gt'
+        if field == 'id':
+            return Q(**{f'id__{op}': pk})
+        if value is None:
+            return Q(**{f'{field}__isnull': True, f'id__{op}': pk})
+        return (
+            Q(**{f'{field}__{op}': value})
+            | Q(**{field: value, f'id__{op}': pk})
+            | Q(**{f'{field}__isnull': True})
+        )
+
+    @staticmethod
+    def before_filter(field, descending, value, pk):
+        """(value, pk) 앞에 오는 행들 (이전 페이지용)"""
+        op = 'gt' if descending else 'lt'
+        if field == 'id':
+            return Q(**{f'id__{op}': pk})
+        if value is None:
+            return Q(**{f'{field}__isnull': False}) | Q(**{f'{field}__isnull': True, f'id__{op}': pk})
+        return (
+            Q(**{f'{field}__{op}': value})
+            | Q(**{field: value, f'id__{op}': pk})
+        )
+
+    @staticmethod
+    def reverse_order_by_clause(field, descending):
+        if field == 'id':
+            return ['id' if descending else '-id']
+        expr = F(field).asc(nulls_first=True) if descending else F(field).desc(nulls_first=True)
+        return [expr, 'id' if descending else '-id']
+
+    def get_position(self, item, field):
+        if isinstance(item, dict):
+            return item.get(field), item['id']
+        return getattr(item, field), item.pk
+
+    def page_queryset(self, queryset, request):
+        """요청의 정렬 / cursor 를 적용한 "한 페이지 + 1개" 쿼리 (아직 실행하지 않음)"""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request)
+        field, descending = self.orderings[self.ordering]
+
+        self.cursor = cursor = self.decode_cursor(request)
+        self.reverse = reverse = False
+        if cursor is not None:
+            ordering, value, pk, reverse = cursor
+            self.reverse = reverse
+            if ordering != self.ordering:
+                raise ParseError(self.invalid_cursor_message)
+            position_filter = self.before_filter if reverse else self.after_filter
+            try:
+                queryset = queryset.filter(position_filter(field, descending, value, pk))
+            except (TypeError, ValueError, ValidationError):
+                # 필드 타입과 안 맞는 값 (숫자 정렬에 문자열 등)
+                raise ParseError(self.invalid_cursor_message)
+
+        if reverse:
+            queryset = queryset.order_by(*self.reverse_order_by_clause(field, descending))
+        else:
+            queryset = queryset.order_by(*self.order_by_clause(field, descending))
+
+        self.field = field
+        # 한 개 더 가져와서 다음 페이지 존재 여부 판단 (COUNT 쿼리 없이)
+        return queryset[:self.page_size + 1]
+
+    def finish_page(self, rows):
+        """page_queryset 을 실행한 결과 → 이 페이지 행들 (이전/다음 링크 상태도 여기서)"""
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if self.reverse:
+            rows.reverse()
+            self.has_next = self.cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        self.page = rows
+        return rows
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.finish_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request):
+        """async 뷰용 (movies.async_views)"""
+        return self.finish_page([row async for row in self.page_queryset(queryset, request)])
+
+    # ──────────────────────────────────────
+    # 응답
+    # ──────────────────────────────────────
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        value, pk = self.get_position(self.page[-1], self.field)
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.ordering, value, pk),
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        url = self.request.build_absolute_uri()
+        if not self.page:
+            return remove_query_param(url, self.cursor_query_param)
+        value, pk = self.get_position(self.page[0], self.field)
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.ordering, value, pk, reverse=True),
+        )
+
+    def get_paginated_data(self, data):
+        return {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class MovieCursorPagination(KeysetPagination):
+    """
+    GET /api/v1/movies/?ordering=-release_year&page_size=40&cursor=...
+    """
+    orderings = {
+        '-id': ('id', True),
+        'id': ('id', False),
+        '-release_year': ('release_year', True),
+        'release_year': ('release_year', False),
+        '-avg_score': ('rating_avg', True),
+        'avg_score': ('rating_avg', False),
+        '-popularity': ('popularity', True),
+        'popularity': ('popularity', False),
+    }
+    default_ordering = '-id'
+
+
+class ReviewCursorPagination(KeysetPagination):
+    """
+    GET /api/v1/movies/<movie_id>/reviews/?cursor=...
+    (movie, -created_at, -id) 복합 인덱스를 그대로 타는 최신순
+    """
+    orderings = {
+        '-created_at': ('created_at', True),
+    }
+    default_ordering = '-created_at'
+
+
+class TrendingCursorPagination(KeysetPagination):
+    """GET /api/v1/movies/trending/ (movies.ranking 의 시간 감쇠 점수, 높은 순)"""
+    orderings = {
+        '-trending': ('trending_score', True),
+    }
+    default_ordering = '-trending'
+
+
+class TopRatedCursorPagination(KeysetPagination):
+    """GET /api/v1/movies/top-rated/ (베이즈 평균 평점, 높은 순)"""
+    orderings = {
+        '-top_rated': ('bayesian_avg', True),
+    }
+    default_ordering = '-top_rated'
+
+
+class WatchListCursorPagination(KeysetPagination):
+    """
+    GET /api/v1/watchlist/me/?status=WANT&cursor=...
+    (user, status, created_at) / (user, created_at) 인덱스를 그대로 타는 최신순
+    """
+    orderings = {
+        '-created_at': ('created_at', True),
+    }
+    default_ordering = '-created_at'
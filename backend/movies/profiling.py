@@ -0,0 +1,364 @@
+# movies/profiling.py
+"""
+요청별 프로파일링 (settings.PROFILING=1 일 때만 미들웨어 / 패치 / /metrics 가 붙는다)
+
+표본 요청 (PROFILING_SAMPLE_RATE)
+  - SQL   : connection.execute_wrapper 로 쿼리 수 / 시간, 같은 쿼리 반복(duplicate) / N+1 모양 찾기
+              duplicate : SQL 과 파라미터까지 같은 쿼리가 두 번 이상
+              N+1       : IN (...) 길이를 무시한 같은 SQL 이 파라미터만 바꿔 PROFILING_N_PLUS_ONE 번 이상
+  - 직렬화 : BaseSerializer.data (중첩 serializer / SerializerMethodField 안의 쿼리도 여기 포함)
+  - 렌더링 : DRF Response.rendered_content (JSON 인코딩)
+  → 응답 헤더 Server-Timing: total;dur=.., sql;dur=..;desc="N queries", serialize;dur=.., render;dur=..
+  → /metrics 의 Prometheus 히스토그램 (view 는 URL 패턴 단위, 프로세스마다 따로 모인다)
+  → N+1 / duplicate 는 logging 'movies.profiling' 경고로 SQL 모양까지
+
+cProfile 표본 (PROFILING_CPROFILE_RATE)
+  - 요청 전체를 cProfile 로 떠서 PROFILING_DIR/<view>/<시각>.prof (view 마다 최근 PROFILING_KEEP 개)
+  - python -m pstats / snakeviz 로 열기
+
+오버헤드
+  - PROFILING=0 (기본): 미들웨어도 패치도 없음
+  - 켜고 표본이 아닌 요청: 난수 한 번 + serializer/렌더링마다 ContextVar 조회 한 번
+"""
+import cProfile
+import functools
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('movies_request_profile', default=None)
+
+# 트랜잭션 제어문은 쿼리 수 / 중복 검사에서 뺀다
+CONTROL_STATEMENTS = ('SAVEPOINT', 'RELEASE', 'ROLLBACK', 'BEGIN', 'COMMIT')
+IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+PHASES = ('serialize', 'render')
+
+
+def get_sample_rate():
+    return getattr(settings, 'PROFILING_SAMPLE_RATE', 1.0)
+
+
+def get_cprofile_rate():
+    return getattr(settings, 'PROFILING_CPROFILE_RATE', 0.0)
+
+
+def get_n_plus_one():
+    return getattr(settings, 'PROFILING_N_PLUS_ONE', 5)
+
+
+def query_signature(sql):
+    """IN (%s, %s, ...) 길이가 달라도 같은 모양으로"""
+    return IN_LIST.sub('IN (...)', sql)
+
+
+# ──────────────────────────────────────
+# 요청 하나의 기록
+# ──────────────────────────────────────
+class RequestProfile:
+    def __init__(self):
+        self.phase = None               # 지금 재는 단계 ('serialize' / 'render')
+        self.total = 0.0
+        self.sql_time = 0.0
+        self.query_count = 0
+        self.phase_time = dict.fromkeys(PHASES, 0.0)
+        self.phase_queries = Counter()  # 단계별 쿼리 수 (직렬화 중 쿼리 = N+1 후보)
+        self.exact = Counter()          # (sql, params) → 횟수
+        self.shapes = defaultdict(set)  # 모양 → 서로 다른 params
+
+    def record_query(self, execute, sql, params, many, context):
+        """connection.execute_wrapper 용"""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            if not sql.lstrip().upper().startswith(CONTROL_STATEMENTS):
+                self.sql_time += elapsed
+                self.query_count += 1
+                self.phase_queries[self.phase] += 1
+                if not many:
+                    key = repr(params)
+                    self.exact[(sql, key)] += 1
+                    self.shapes[query_signature(sql)].add(key)
+
+    def duplicates(self):
+        """[(sql, 횟수)] 파라미터까지 같은 쿼리"""
+        return [(sql, n) for (sql, _), n in self.exact.items() if n > 1]
+
+    def n_plus_one(self, threshold=None):
+        """[(모양, 서로 다른 파라미터 수)] 파라미터만 바꿔 반복된 쿼리"""
+        threshold = threshold or get_n_plus_one()
+        return [(shape, len(keys)) for shape, keys in self.shapes.items() if len(keys) >= threshold]
+
+    def server_timing(self):
+        parts = [
+            f'total;dur={self.total * 1000:.1f}',
+            f'sql;dur={self.sql_time * 1000:.1f};desc="{self.query_count} queries"',
+        ]
+        for phase in PHASES:
+            part = f'{phase};dur={self.phase_time[phase] * 1000:.1f}'
+            if self.phase_queries[phase]:
+                part += f';desc="{self.phase_queries[phase]} queries"'
+            parts.append(part)
+        duplicates, repeated = self.duplicates(), self.n_plus_one()
+        if duplicates:
+            parts.append(f'dup;desc="{sum(n - 1 for _, n in duplicates)} duplicate queries"')
+        if repeated:
+            parts.append(f'nplus1;desc="{len(repeated)} repeated query shapes"')
+        return ', '.join(parts)
+
+
+def _timed(prop, phase):
+    """property 를 감싸 표본 요청일 때 phase 시간을 잰다 (중첩 호출은 바깥 것만)"""
+    def fget(self):
+        profile = _current.get()
+        if profile is None or profile.phase is not None:
+            return prop.fget(self)
+        profile.phase = phase
+        start = time.perf_counter()
+        try:
+            return prop.fget(self)
+        finally:
+            profile.phase_time[phase] += time.perf_counter() - start
+            profile.phase = None
+    return property(fget, prop.fset, prop.fdel, prop.__doc__)
+
+
+def _timed_call(method, phase):
+    """_timed 의 일반 메서드판"""
+    def wrapper(self, *args, **kwargs):
+        profile = _current.get()
+        if profile is None or profile.phase is not None:
+            return method(self, *args, **kwargs)
+        profile.phase = phase
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            profile.phase_time[phase] += time.perf_counter() - start
+            profile.phase = None
+    return functools.wraps(method)(wrapper)
+
+
+_installed = False
+
+
+def install():
+    """직렬화 / 렌더링 시간 재기 (PROFILING 일 때 MoviesConfig.ready() 에서 한 번)"""
+    global _installed
+    if _installed:
+        return
+    from rest_framework.response import Response
+    from rest_framework.serializers import BaseSerializer
+
+    from .fastpath import RowSerializer
+
+    BaseSerializer.data = _timed(BaseSerializer.data, 'serialize')
+    RowSerializer.serialize_many = _timed_call(RowSerializer.serialize_many, 'serialize')
+    RowSerializer.serialize_objects = _timed_call(RowSerializer.serialize_objects, 'serialize')
+    Response.rendered_content = _timed(Response.rendered_content, 'render')
+    _installed = True
+
+
+# ──────────────────────────────────────
+# Prometheus 히스토그램 (프로세스 메모리)
+# ──────────────────────────────────────
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets, labels=('view', 'method')):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.labels = labels
+        self.series = {}    # 라벨 값 → [버킷별 수..., 합, 개수]
+
+    def observe(self, label_values, value):
+        row = self.series.get(label_values)
+        if row is None:
+            row = self.series[label_values] = [0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                row[i] += 1
+        row[-2] += value
+        row[-1] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for label_values, row in sorted(self.series.items()):
+            for bound, count in zip((*self.buckets, '+Inf'), (*row[:-2], row[-1])):
+                bucket_labels = _labels(self.labels, label_values, f'le="{bound}"')
+                lines.append(f'{self.name}_bucket{bucket_labels} {count}')
+            lines.append(f'{self.name}_sum{_labels(self.labels, label_values)} {row[-2]}')
+            lines.append(f'{self.name}_count{_labels(self.labels, label_values)} {row[-1]}')
+        return lines
+
+
+class CounterMetric:
+    def __init__(self, name, help_text, labels=('view', 'method')):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.series = Counter()
+
+    def inc(self, label_values, amount=1):
+        self.series[label_values] += amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        lines += [
+            f'{self.name}{_labels(self.labels, label_values)} {value}'
+            for label_values, value in sorted(self.series.items())
+        ]
+        return lines
+
+
+REQUEST_SECONDS = Histogram('movies_request_duration_seconds', '표본 요청 전체 시간', SECONDS_BUCKETS)
+SQL_SECONDS = Histogram('movies_request_sql_seconds', '표본 요청의 SQL 시간 합', SECONDS_BUCKETS)
+SQL_QUERIES = Histogram('movies_request_sql_queries', '표본 요청의 SQL 쿼리 수', QUERY_BUCKETS)
+PHASE_SECONDS = Histogram(
+    'movies_request_phase_seconds', '표본 요청의 직렬화 / 렌더링 시간', SECONDS_BUCKETS,
+    labels=('view', 'method', 'phase'),
+)
+DUPLICATE_QUERIES = CounterMetric('movies_duplicate_queries_total', '파라미터까지 같은 쿼리의 반복 횟수')
+N_PLUS_ONE = CounterMetric(
+    'movies_n_plus_one_total', 'N+1 모양 쿼리가 나온 요청 수', labels=('view', 'method', 'query'),
+)
+SAMPLED_REQUESTS = CounterMetric('movies_profiled_requests_total', '표본 요청 수', labels=('view', 'method', 'status'))
+METRICS = (REQUEST_SECONDS, SQL_SECONDS, SQL_QUERIES, PHASE_SECONDS, DUPLICATE_QUERIES, N_PLUS_ONE, SAMPLED_REQUESTS)
+_metrics_lock = threading.Lock()
+
+
+def record_metrics(view, method, status, profile):
+    labels = (view, method)
+    duplicates, repeated = profile.duplicates(), profile.n_plus_one()
+    with _metrics_lock:
+        SAMPLED_REQUESTS.inc((view, method, str(status)))
+        REQUEST_SECONDS.observe(labels, profile.total)
+        SQL_SECONDS.observe(labels, profile.sql_time)
+        SQL_QUERIES.observe(labels, profile.query_count)
+        for phase in PHASES:
+            PHASE_SECONDS.observe((view, method, phase), profile.phase_time[phase])
+        if duplicates:
+            DUPLICATE_QUERIES.inc(labels, sum(n - 1 for _, n in duplicates))
+        for shape, _ in repeated:
+            N_PLUS_ONE.inc((view, method, shape[:200]))
+
+
+def render_metrics():
+    with _metrics_lock:
+        lines = [line for metric in METRICS for line in metric.render()]
+    return '\n'.join(lines) + '\n'
+
+
+def reset_metrics():
+    with _metrics_lock:
+        for metric in METRICS:
+            metric.series.clear()
+
+
+def metrics_view(request):
+    """
+    GET /metrics (Prometheus text)
+    PROFILING_METRICS_TOKEN 이 있으면 Authorization: Bearer <token>, 없으면 로컬(127.0.0.1 / ::1)에서만
+    """
+    token = getattr(settings, 'PROFILING_METRICS_TOKEN', '')
+    if token:
+        allowed = request.headers.get('Authorization') == f'Bearer {token}'
+    else:
+        allowed = request.META.get('REMOTE_ADDR') in ('127.0.0.1', '::1')
+    if not allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+# ──────────────────────────────────────
+# cProfile 덤프
+# ──────────────────────────────────────
+def get_profile_dir():
+    return Path(getattr(settings, 'PROFILING_DIR', settings.BASE_DIR / 'var' / 'profiles'))
+
+
+def dump_profile(profiler, view):
+    """PROFILING_DIR/<view>/<시각>.prof 로 저장, view 마다 최근 PROFILING_KEEP 개만"""
+    directory = get_profile_dir() / (re.sub(r'[^A-Za-z0-9_-]+', '_', view).strip('_') or 'root')
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f'{time.time_ns()}.prof'
+    profiler.dump_stats(path)
+    for old in sorted(directory.glob('*.prof'))[:-getattr(settings, 'PROFILING_KEEP', 20)]:
+        old.unlink(missing_ok=True)
+    return path
+
+
+# ──────────────────────────────────────
+# 미들웨어
+# ──────────────────────────────────────
+def view_label(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.route if match is not None else 'unmatched'
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sample_rate, cprofile_rate = get_sample_rate(), get_cprofile_rate()
+        instrument = sample_rate > 0 and random.random() < sample_rate
+        profiler = cProfile.Profile() if cprofile_rate > 0 and random.random() < cprofile_rate else None
+        if not instrument and profiler is None:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(profile.record_query))
+                start = time.perf_counter()
+                if profiler is not None:
+                    profiler.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    if profiler is not None:
+                        profiler.disable()
+                profile.total = time.perf_counter() - start
+        finally:
+            _current.reset(token)
+
+        view = view_label(request)
+        if profiler is not None:
+            dump_profile(profiler, view)
+        response['Server-Timing'] = profile.server_timing()
+        record_metrics(view, request.method, response.status_code, profile)
+
+        for shape, n in profile.n_plus_one():
+            logger.warning('N+1 의심 %s %s: %d번 반복 %s', request.method, view, n, shape)
+        for sql, n in profile.duplicates():
+            logger.warning('중복 쿼리 %s %s: %d번 %s', request.method, view, n, sql)
+        return response
@@ -0,0 +1,190 @@
+# movies/ranking.py
+"""
+랭킹 (update_rankings 명령, 주기 실행) → Movie.trending_score / Movie.bayesian_avg
+
+트렌딩 (시간 감쇠 활동 점수)
+  영화별 Σ 가중치 × 2^(-(지금 - 이벤트 시각) / 반감기)
+    이벤트: Rating(updated_at), Review(created_at), LikeReview(created_at), WatchList(updated_at, DROP 제외)
+  - 모든 영화가 같은 비율로 감쇠하므로 순서는 "기준 시각(anchor)" 으로 환산한 값만 저장해도 같다.
+      저장값 = Σ 가중치 × 2^((이벤트 시각 - anchor) / 반감기)
+    → 매 실행마다 전체 영화를 감쇠시킬 필요 없이, 워터마크 이후 이벤트가 생긴 영화만 다시 계산
+  - anchor 가 WINDOW_HALF_LIVES 반감기보다 오래되면 저장값 전체에 감쇠 비율을 곱해서(UPDATE) 기준을 지금으로 옮긴다.
+  - 다시 계산할 때는 최근 WINDOW_HALF_LIVES 반감기 안의 이벤트만 읽는다. (그 이전 기여는 0.4% 미만)
+  - 취소(좋아요 취소, 워치리스트 삭제)는 그 영화에 새 이벤트가 생길 때 또는 --full 때 반영
+
+베이즈 평균 (top-rated)
+  (C × m + 평점 합) / (C + 평점 수)
+    m = 전체 평균 평점 (소수 둘째 자리로 반올림 → 평점 하나로 모든 행이 바뀌지 않게)
+    C = settings.RANKING_PRIOR_VOTES (평점이 적은 영화는 전체 평균 쪽으로 당겨진다)
+  - Movie 의 rating_count / rating_sum 으로 UPDATE 1번. 값이 바뀐 행만 쓴다.
+"""
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from . import cache as movie_cache
+from .models import JobState, LikeReview, Movie, Rating, Review, WatchList
+
+JOB_NAME = 'trending'
+ANCHOR_JOB_NAME = 'trending_anchor'
+
+# 이벤트 종류별 가중치
+EVENT_WEIGHTS = {
+    'rating': 3.0,
+    'review': 4.0,
+    'like': 1.0,
+    'watchlist': 2.0,
+}
+# 이만큼의 반감기 안의 이벤트만 읽고, anchor 도 이만큼 지나면 옮긴다 (2^-8 ≈ 0.4%)
+WINDOW_HALF_LIVES = 8
+# anchor 를 옮긴 뒤 이보다 작아진 점수는 0 으로 (트렌딩 목록에서 빠짐)
+MIN_SCORE = min(EVENT_WEIGHTS.values()) * 2.0 ** -WINDOW_HALF_LIVES
+# 다시 계산할 영화가 이보다 많으면 IN (...) 대신 창 안의 이벤트를 전부 읽어서 거른다
+MAX_IN_IDS = 500
+
+
+def get_half_life():
+    return timedelta(days=getattr(settings, 'TRENDING_HALF_LIFE_DAYS', 3))
+
+
+def get_prior_votes():
+    return getattr(settings, 'RANKING_PRIOR_VOTES', 10)
+
+
+def event_sources():
+    """(이름, 쿼리셋, 영화 id 필드, 시각 필드)"""
+    return (
+        ('rating', Rating.objects.all(), 'movie_id', 'updated_at'),
+        ('review', Review.objects.all(), 'movie_id', 'created_at'),
+        ('like', LikeReview.objects.all(), 'review__movie_id', 'created_at'),
+        ('watchlist', WatchList.objects.exclude(status='DROP'), 'movie_id', 'updated_at'),
+    )
+
+
+# ──────────────────────────────────────
+# 트렌딩
+# ──────────────────────────────────────
+def touched_movie_ids(since):
+    """since 이후 이벤트가 생긴 영화 id (시각 컬럼 인덱스로 범위 조회)"""
+    touched = set()
+    for _, queryset, movie_field, time_field in event_sources():
+        touched.update(
+            queryset.filter(**{f'{time_field}__gt': since})
+            .values_list(movie_field, flat=True).distinct()
+        )
+    return touched
+
+
+def trending_scores(anchor, window_start, movie_ids=None):
+    """{영화 id: anchor 기준 점수} (movie_ids 가 없으면 창 안의 모든 영화)"""
+    half_life = get_half_life().total_seconds()
+    # 영화가 많으면 IN 대신 창 전체를 읽고 걸러낸다
+    in_sql = movie_ids is not None and len(movie_ids) <= MAX_IN_IDS
+    movie_parts, score_parts = [], []
+    for name, queryset, movie_field, time_field in event_sources():
+        queryset = queryset.filter(**{f'{time_field}__gte': window_start})
+        if in_sql:
+            queryset = queryset.filter(**{f'{movie_field}__in': movie_ids})
+        rows = list(queryset.values_list(movie_field, time_field))
+        if not rows:
+            continue
+        movies, stamps = zip(*rows)
+        offsets = np.array([(stamp - anchor).total_seconds() for stamp in stamps])
+        movie_parts.append(np.array(movies, dtype=np.int64))
+        score_parts.append(EVENT_WEIGHTS[name] * np.exp2(offsets / half_life))
+
+    if movie_ids is not None and not in_sql:
+        keep = [np.isin(movies, movie_ids) for movies in movie_parts]
+        movie_parts = [movies[mask] for movies, mask in zip(movie_parts, keep)]
+        score_parts = [scores[mask] for scores, mask in zip(score_parts, keep)]
+    if not movie_parts or not sum(len(movies) for movies in movie_parts):
+        return {}
+    movies = np.concatenate(movie_parts)
+    unique, inverse = np.unique(movies, return_inverse=True)
+    totals = np.bincount(inverse, weights=np.concatenate(score_parts))
+    return dict(zip(unique.tolist(), totals.tolist()))
+
+
+def rebase_trending(anchor, now):
+    """저장된 점수를 새 기준 시각(now)으로 환산 (UPDATE 2번)"""
+    factor = 2.0 ** (-(now - anchor).total_seconds() / get_half_life().total_seconds())
+    Movie.objects.filter(trending_score__gt=0).update(trending_score=F('trending_score') * factor)
+    Movie.objects.filter(trending_score__gt=0, trending_score__lt=MIN_SCORE).update(trending_score=0)
+
+
+def update_trending(full=False, now=None, log=None):
+    """트렌딩 점수 갱신. 다시 쓴 영화 수 반환"""
+    log = log or (lambda msg: None)
+    now = now or timezone.now()
+    window_start = now - get_half_life() * WINDOW_HALF_LIVES
+    watermark = JobState.get_watermark(JOB_NAME)
+    anchor = JobState.get_watermark(ANCHOR_JOB_NAME)
+    if watermark is None or anchor is None:
+        full = True
+
+    rebased = False
+    with transaction.atomic():
+        if full:
+            anchor = now
+            scores = trending_scores(anchor, window_start)
+            Movie.objects.filter(trending_score__gt=0).update(trending_score=0)
+        else:
+            if now - anchor > get_half_life() * WINDOW_HALF_LIVES:
+                rebase_trending(anchor, now)
+                anchor, rebased = now, True
+                log("트렌딩 기준 시각 이동")
+            touched = touched_movie_ids(watermark)
+            scores = dict.fromkeys(touched, 0.0)
+            if touched:
+                scores.update(trending_scores(anchor, window_start, list(touched)))
+
+        # bulk_update 의 CASE WHEN 보다 단순 UPDATE executemany 가 훨씬 빠르다 (전체 계산 시 수만 행)
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'UPDATE {Movie._meta.db_table} SET trending_score = %s WHERE id = %s',
+                [(score, movie_id) for movie_id, score in scores.items()],
+            )
+        JobState.set_watermark(ANCHOR_JOB_NAME, anchor)
+        JobState.set_watermark(JOB_NAME, now)
+        # 기준 시각을 옮기면 다시 쓴 영화가 없어도 저장값 전체가 바뀜 (0 이 된 영화, 예전 기준의 cursor)
+        if scores or full or rebased:
+            movie_cache.bump(movie_cache.order_key('trending_score'))
+
+    log(f"트렌딩 {'전체' if full else '증분'}: 영화 {len(scores)}편")
+    return len(scores)
+
+
+# ──────────────────────────────────────
+# 베이즈 평균
+# ──────────────────────────────────────
+def update_bayesian_avg(log=None):
+    """베이즈 평균 갱신 (값이 바뀐 행만). 다시 쓴 영화 수 반환"""
+    log = log or (lambda msg: None)
+    totals = Movie.objects.aggregate(count=Sum('rating_count'), total=Sum('rating_sum'))
+    mean = round(float(totals['total'] or 0) / totals['count'], 2) if totals['count'] else 0.0
+    prior = get_prior_votes()
+
+    value = Case(
+        When(rating_count=0, then=Value(0.0)),
+        default=(prior * mean + Cast('rating_sum', FloatField())) / (prior + F('rating_count')),
+        output_field=FloatField(),
+    )
+    with transaction.atomic():
+        updated = Movie.objects.exclude(bayesian_avg=value).update(bayesian_avg=value)
+        if updated:
+            movie_cache.bump(movie_cache.order_key('bayesian_avg'))
+
+    log(f"베이즈 평균 (전체 평균 {mean}, C={prior}): 영화 {updated}편")
+    return updated
+
+
+def update_rankings(full=False, log=None):
+    return {
+        'trending': update_trending(full=full, log=log),
+        'bayesian_avg': update_bayesian_avg(log=log),
+    }
@@ -0,0 +1,277 @@
+# movies/recommend.py
+"""
+개인화 추천 (implicit ALS 행렬 분해)
+
+학습(train_recommender 명령, 오프라인)
+  - Rating / WatchList 를 유저 × 영화 희소 행렬로 만든다.
+      선호 p = 1 : 평점 >= RECOMMEND_POSITIVE_SCORE, 보고싶어요(WANT), 봤어요(DONE)
+      선호 p = 0 : 그보다 낮은 평점, 중단(DROP)  (관측된 "싫어요")
+      신뢰도 c = 1 + alpha * weight
+        평점 p = 1 : weight = score / 5                       (높을수록 확신)
+        평점 p = 0 : weight = (positive_score - score) / 5    (기준에서 멀수록 확신 → 0.5점이 2.5점보다 강한 "싫어요")
+        워치리스트 : 상태별 고정 가중치 (WATCHLIST_WEIGHTS)
+  - Hu et al. 2008 의 implicit ALS 로 유저/영화 잠재 벡터를 번갈아 푼다.
+  - 결과를 RECOMMEND_MODEL_DIR/versions/<버전>/ 에 .npy 로 저장한 뒤
+    meta.json(현재 버전 이름)을 os.replace 로 바꿔서 한 번에 전환. 예전 버전은 KEEP_VERSIONS 개만 남김
+
+서빙
+  - meta.json 이 가리키는 버전 디렉터리의 .npy 를 mmap 으로 열어 두고
+    (프로세스당 1번, meta.json 이 바뀌면 다시 로드) → 서로 다른 모델의 배열이 섞여 읽히지 않는다
+    점수 = item_factors @ user_factor → 이미 본 영화 제외 → argpartition 으로 top N
+"""
+import json
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Movie, Rating, WatchList
+from .similarity import values_array
+
+FILES = ('user_factors', 'item_factors', 'user_ids', 'item_ids')
+
+# 전환 직전에 meta.json 을 읽은 프로세스가 아직 열 수 있도록 바로 전 버전까지 남긴다
+KEEP_VERSIONS = 2
+
+WATCHLIST_WEIGHTS = {
+    'WANT': (1, 0.5),   # (선호, 가중치)
+    'DONE': (1, 0.8),
+    'DROP': (0, 0.5),
+}
+
+
+def get_model_dir():
+    return Path(getattr(settings, 'RECOMMEND_MODEL_DIR', settings.BASE_DIR / 'var' / 'recommend'))
+
+
+# ──────────────────────────────────────
+# 학습
+# ──────────────────────────────────────
+def build_interactions(positive_score=None):
+    """
+    (유저 id 배열, 영화 id 배열, 행 인덱스, 열 인덱스, 선호, 가중치) 반환
+    (유저, 영화) 쌍은 중복 없이 한 번씩
+    """
+    positive_score = positive_score or getattr(settings, 'RECOMMEND_POSITIVE_SCORE', 3.0)
+
+    ratings = values_array(Rating.objects.all(), ['user_id', 'movie_id', 'score'], dtype=np.float64)
+    watch = list(WatchList.objects.values_list('user_id', 'movie_id', 'status').iterator(chunk_size=10000))
+
+    users = [ratings[:, 0]]
+    movies = [ratings[:, 1]]
+    scores = ratings[:, 2]
+    positive = scores >= positive_score
+    prefs = [positive.astype(np.float32)]
+    # 선호는 점수가 높을수록, 비선호는 기준 점수에서 낮게 멀어질수록 신뢰도가 크다
+    weights = [(np.where(positive, scores, positive_score - scores) / 5.0).astype(np.float32)]
+    if watch:
+        w_users, w_movies, statuses = zip(*watch)
+        pw = np.array([WATCHLIST_WEIGHTS.get(s, (1, 0.5)) for s in statuses], dtype=np.float32)
+        users.append(np.array(w_users, dtype=np.float64))
+        movies.append(np.array(w_movies, dtype=np.float64))
+        prefs.append(pw[:, 0])
+        weights.append(pw[:, 1])
+
+    users = np.concatenate(users).astype(np.int64)
+    movies = np.concatenate(movies).astype(np.int64)
+    prefs = np.concatenate(prefs)
+    weights = np.concatenate(weights)
+
+    user_ids, user_index = np.unique(users, return_inverse=True)
+    item_ids, item_index = np.unique(movies, return_inverse=True)
+
+    # 같은 (유저, 영화) 에 평점 + 워치리스트가 같이 있으면 가중치는 더하고 선호는 최대값
+    keys, inverse = np.unique(user_index * len(item_ids) + item_index, return_inverse=True)
+    weight = np.bincount(inverse, weights=weights).astype(np.float32)
+    pref = np.zeros(len(keys), dtype=np.float32)
+    np.maximum.at(pref, inverse, prefs)
+    rows, cols = np.divmod(keys, len(item_ids))
+    return user_ids, item_ids, rows, cols, pref, weight
+
+
+def paired_csr(rows, cols, n_rows, *values):
+    """
+    (rows, cols) 좌표가 같은 값 배열 여러 개를 같은 희소 구조의 csr 로.
+    ALS 에서 신뢰도 C 와 선호 P 를 같은 인덱스로 읽기 위해 사용.
+    """
+    order = np.lexsort((cols, rows))
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n_rows))])
+    n_cols = int(cols.max()) + 1 if len(cols) else 0
+    return [
+        sparse.csr_matrix((v[order], cols[order], indptr), shape=(n_rows, n_cols))
+        for v in values
+    ]
+
+
+def als_step(C, P, fixed, regularization):
+    """fixed(상대편 벡터) 를 고정하고 C/P 의 각 행 벡터를 푼다"""
+    n, f = C.shape[0], fixed.shape[1]
+    YtY = fixed.T @ fixed
+    reg = regularization * np.eye(f, dtype=np.float64)
+    out = np.zeros((n, f), dtype=np.float32)
+    for row in range(n):
+        start, end = C.indptr[row], C.indptr[row + 1]
+        if start == end:
+            continue
+        cols = C.indices[start:end]
+        conf = C.data[start:end].astype(np.float64)      # c_ui
+        pref = P.data[start:end].astype(np.float64)      # p_ui (C 와 같은 희소 패턴)
+        Y = fixed[cols].astype(np.float64)
+        A = YtY + (Y.T * (conf - 1)) @ Y + reg
+        b = (Y.T * conf) @ pref
+        out[row] = np.linalg.solve(A, b)
+    return out
+
+
+def train_als(factors=64, iterations=15, regularization=0.1, alpha=20.0, seed=42, log=None):
+    log = log or (lambda msg: None)
+    user_ids, item_ids, rows, cols, pref, weight = build_interactions()
+    log(f"상호작용 행렬: 유저 {len(user_ids)}명 × 영화 {len(item_ids)}편, {len(pref)}건")
+    if not len(pref):
+        raise ValueError("학습할 평점/워치리스트 데이터가 없습니다.")
+
+    conf = (1 + alpha * weight).astype(np.float32)
+    C, P = paired_csr(rows, cols, len(user_ids), conf, pref)
+    Ct, Pt = paired_csr(cols, rows, len(item_ids), conf, pref)
+
+    rng = np.random.default_rng(seed)
+    item_factors = (rng.standard_normal((len(item_ids), factors)) * 0.01).astype(np.float32)
+    user_factors = np.zeros((len(user_ids), factors), dtype=np.float32)
+    for it in range(iterations):
+        user_factors = als_step(C, P, item_factors, regularization)
+        item_factors = als_step(Ct, Pt, user_factors, regularization)
+        log(f"ALS {it + 1}/{iterations}")
+
+    return user_ids, item_ids, user_factors, item_factors
+
+
+def save_model(user_ids, item_ids, user_factors, item_factors, model_dir=None):
+    """
+    새 버전 디렉터리에 배열을 다 쓴 다음 meta.json 을 os.replace 로 교체 → 모델 전환은 그 한 번뿐.
+    서빙 중인 프로세스는 meta.json 이 바뀐 걸 보고 새 버전 디렉터리에서 다시 로드
+    """
+    model_dir = Path(model_dir or get_model_dir())
+    # 이름순 = 학습순
+    version = f"{timezone.now():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+    version_dir = model_dir / 'versions' / version
+    version_dir.mkdir(parents=True)
+    arrays = {
+        'user_factors': np.ascontiguousarray(user_factors, dtype=np.float32),
+        'item_factors': np.ascontiguousarray(item_factors, dtype=np.float32),
+        'user_ids': np.asarray(user_ids, dtype=np.int64),
+        'item_ids': np.asarray(item_ids, dtype=np.int64),
+    }
+    for name, array in arrays.items():
+        np.save(version_dir / f'{name}.npy', array)
+
+    meta = {
+        'version': version,
+        'trained_at': timezone.now().isoformat(),
+        'users': int(len(user_ids)),
+        'items': int(len(item_ids)),
+        'factors': int(user_factors.shape[1]),
+    }
+    tmp = model_dir / f'meta.{version}.tmp.json'
+    tmp.write_text(json.dumps(meta))
+    os.replace(tmp, model_dir / 'meta.json')
+
+    for old in sorted((model_dir / 'versions').iterdir())[:-KEEP_VERSIONS]:
+        shutil.rmtree(old, ignore_errors=True)
+    return meta
+
+
+# ──────────────────────────────────────
+# 서빙
+# ──────────────────────────────────────
+def meta_stamp(model_dir):
+    """meta.json 이 교체됐는지 비교할 값 (os.replace 마다 inode 가 바뀜). 모델 없으면 FileNotFoundError"""
+    stat = (Path(model_dir) / 'meta.json').stat()
+    return stat.st_ino, stat.st_mtime_ns
+
+
+class FactorModel:
+    def __init__(self, model_dir):
+        self.model_dir = Path(model_dir)
+        # stamp 를 먼저 → 그 사이에 전환되면 다음 get_model 에서 한 번 더 로드될 뿐
+        self.meta_stamp = meta_stamp(self.model_dir)
+        self.meta = json.loads((self.model_dir / 'meta.json').read_text())
+        version_dir = self.model_dir / 'versions' / self.meta['version']
+        for name in FILES:
+            setattr(self, name, np.load(version_dir / f'{name}.npy', mmap_mode='r'))
+
+    def user_row(self, user_id):
+        pos = int(np.searchsorted(self.user_ids, user_id))
+        if pos < len(self.user_ids) and self.user_ids[pos] == user_id:
+            return pos
+        return None
+
+    def recommend(self, user_id, exclude_ids=(), limit=20):
+        """(영화 id, 점수) 리스트. 모델에 없는 유저면 None"""
+        row = self.user_row(user_id)
+        if row is None:
+            return None
+
+        scores = self.item_factors @ self.user_factors[row]
+        if exclude_ids:
+            exclude = np.fromiter(exclude_ids, dtype=np.int64)
+            pos = np.searchsorted(self.item_ids, exclude)
+            valid = pos < len(self.item_ids)
+            pos, exclude = pos[valid], exclude[valid]
+            scores[pos[self.item_ids[pos] == exclude]] = -np.inf
+
+        limit = min(limit, len(scores))
+        if limit <= 0:
+            return []
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        top = top[np.isfinite(scores[top])]
+        return list(zip(self.item_ids[top].tolist(), scores[top].tolist()))
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_model():
+    """프로세스당 한 번 mmap 으로 로드. meta.json 이 바뀌면(재학습) 다시 로드. 모델 없으면 None"""
+    global _model
+    model_dir = get_model_dir()
+    try:
+        stamp = meta_stamp(model_dir)
+    except FileNotFoundError:
+        return None
+
+    if _model is None or _model.model_dir != model_dir or _model.meta_stamp != stamp:
+        with _model_lock:
+            if _model is None or _model.model_dir != model_dir or _model.meta_stamp != stamp:
+                _model = FactorModel(model_dir)
+    return _model
+
+
+def seen_movie_ids(user):
+    """평점 남겼거나 워치리스트에 넣은 영화 id (UNION 쿼리 1번)"""
+    rated = Rating.objects.filter(user=user).values_list('movie_id', flat=True)
+    listed = WatchList.objects.filter(user=user).values_list('movie_id', flat=True)
+    return set(rated.union(listed))
+
+
+def recommend_for_user(user, limit=20):
+    """추천 영화 리스트 (Movie 인스턴스, 순서 유지). 모델이 없거나 신규 유저면 인기순"""
+    seen = seen_movie_ids(user)
+    model = get_model()
+    ranked = model.recommend(user.id, exclude_ids=seen, limit=limit) if model else None
+
+    if not ranked:
+        return list(
+            Movie.objects.exclude(id__in=seen).order_by('-popularity', '-id')[:limit]
+        )
+
+    movie_ids = [movie_id for movie_id, _ in ranked]
+    movies = Movie.objects.in_bulk(movie_ids)
+    return [movies[movie_id] for movie_id in movie_ids if movie_id in movies]
@@ -0,0 +1,69 @@
+# movies/routers.py
+"""
+읽기 복제본 라우터 (settings.DATABASE_REPLICAS 가 있을 때만 DATABASE_ROUTERS 에 들어간다)
+
+복제본은 지연이 있으므로 모든 읽기를 보내지 않고, "방금 쓴 걸 바로 다시 읽지 않는"
+읽기 전용 카탈로그 뷰(목록 / 검색 / 비슷한 영화 / 인물 / 비로그인 상세)만 ReplicaReadMixin 으로 표시한다.
+  - 표시된 요청 안의 ORM 읽기만 복제본으로, 쓰기와 그 밖의 요청은 항상 default
+  - 요청마다 복제본 하나를 골라 끝까지 같은 곳에서 읽는다 (캐시 버전과 데이터가 같은 시점)
+  - 인증(JWT → User 조회)은 표시하기 전에 끝나므로 default 에서
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_replica = ContextVar('movies_read_replica', default=None)
+
+
+def pick_replica():
+    replicas = getattr(settings, 'DATABASE_REPLICAS', [])
+    return random.choice(replicas) if replicas else None
+
+
+@contextmanager
+def replica_reads(alias=None):
+    """이 블록 안의 ORM 읽기를 복제본(alias, 기본은 무작위 하나)으로"""
+    token = _replica.set(alias or pick_replica())
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _replica.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # 복제본은 default 와 같은 데이터
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+class ReplicaReadMixin:
+    """
+    DRF 뷰용: 인증이 끝난 뒤부터 응답을 만들 때까지의 읽기를 복제본으로.
+    use_replica() 를 바꾸면 요청별로 끌 수 있다 (예: 로그인 유저의 "내 평점" 이 들어가는 상세)
+    """
+
+    def use_replica(self, request):
+        return True
+
+    def dispatch(self, request, *args, **kwargs):
+        token = _replica.set(None)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _replica.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.use_replica(request):
+            _replica.set(pick_replica())
@@ -0,0 +1,359 @@
+# movies/search.py
+"""
+영화 검색 (제목 / 원제 / 줄거리 / 출연진 이름)
+
+백엔드 두 가지 (settings.MOVIE_SEARCH_BACKEND)
+  - 'fts5'   : SQLite FTS5 가상 테이블 movies_search (rowid = Movie.id, 0009 마이그레이션에서 생성)
+               bm25 로 순위, 단어마다 접두어 검색("기생"* → 기생충, 기생충은 ...)
+               prefix='1 2 3' 접두어 색인으로 자동완성 첫 글자도 빠르게
+  - 'python' : 프로세스 메모리에 역색인(단어 → {영화 id: 가중치})을 만들어 검색
+               FTS5 를 못 쓰는 DB(PostgreSQL 등)에서도 동작. 첫 검색 때 한 번 빌드.
+
+색인 유지
+  - import_tmdb(write_movies) / Movie 저장·삭제 시그널에서 index_movies(ids) 호출
+  - 그때마다 JobState 'search' 워터마크를 올려 두면, 다른 프로세스의 python 색인은
+    다음 검색 때 워터마크 이후 바뀐 영화만 다시 읽고, DB 에서 사라진 영화는 뺀다.
+  - python 색인은 copy-on-write: 복사본을 고친 뒤 참조만 바꿔 끼우므로 검색은 락 없이 읽는다.
+  - 전체 다시 만들기: rebuild_search_index 명령
+"""
+import bisect
+import heapq
+import math
+import re
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import JobState, Movie, MovieCast
+
+JOB_NAME = 'search'
+FTS_TABLE = 'movies_search'
+
+# 필드별 가중치 (bm25 컬럼 가중치와 python 색인에 같이 사용)
+FIELD_WEIGHTS = {
+    'title': 10.0,
+    'original_title': 5.0,
+    'overview': 1.0,
+    'cast_names': 3.0,
+}
+FIELDS = tuple(FIELD_WEIGHTS)
+
+# 검색어는 앞에서부터 이만큼 단어만
+MAX_QUERY_TERMS = 8
+# 한 글자 검색어(자동완성 첫 글자)는 이 필드에서만 찾는다 (fts5)
+SHORT_TERM_FIELDS = ('title', 'original_title')
+# python 색인에서 접두어 하나가 펼쳐지는 최대 단어 수 (한 글자 접두어 폭주 방지)
+MAX_PREFIX_EXPANSION = 200
+
+# FTS5 unicode61 토크나이저와 같은 기준: 글자/숫자 연속 구간 (한글 포함), 소문자로
+_TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall((text or '').lower())
+
+
+def query_terms(q):
+    """검색어 → 중복 없는 단어 목록 (마지막 단어뿐 아니라 모든 단어를 접두어로 취급)"""
+    return list(dict.fromkeys(tokenize(q)))[:MAX_QUERY_TERMS]
+
+
+def fts5_available():
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+# ──────────────────────────────────────
+# 색인에 넣을 문서 읽기
+# ──────────────────────────────────────
+def iter_documents(movie_ids=None, since=None, chunk_size=2000):
+    """
+    (movie_id, {필드: 텍스트}) 를 id 순서로. 출연진 이름은 영화별로 공백으로 이어 붙인다.
+    movie_ids / since 가 없으면 전체
+    """
+    movies = Movie.objects.order_by('id')
+    if movie_ids is not None:
+        movies = movies.filter(id__in=list(movie_ids))
+    if since is not None:
+        movies = movies.filter(updated_at__gt=since)
+    rows = list(movies.values_list('id', 'title', 'original_title', 'overview'))
+
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        names = {}
+        for movie_id, name in (
+            MovieCast.objects.filter(movie_id__in=[row[0] for row in chunk])
+            .order_by('movie_id', 'id')
+            .values_list('movie_id', 'person__name')
+        ):
+            names.setdefault(movie_id, []).append(name)
+
+        for movie_id, title, original_title, overview in chunk:
+            yield movie_id, {
+                'title': title,
+                'original_title': original_title,
+                'overview': overview,
+                'cast_names': ' '.join(names.get(movie_id, ())),
+            }
+
+
+# ──────────────────────────────────────
+# SQLite FTS5
+# ──────────────────────────────────────
+class FTS5Backend:
+    name = 'fts5'
+
+    def index(self, movie_ids):
+        movie_ids = list(movie_ids)
+        with transaction.atomic(), connection.cursor() as cursor:
+            for start in range(0, len(movie_ids), 500):
+                chunk = movie_ids[start:start + 500]
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})', chunk)
+            self._insert(cursor, iter_documents(movie_ids))
+
+    def rebuild(self):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            count = self._insert(cursor, iter_documents())
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+        return count
+
+    def _insert(self, cursor, documents):
+        rows = [(movie_id, *(doc[field] or '' for field in FIELDS)) for movie_id, doc in documents]
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE}(rowid, {", ".join(FIELDS)}) VALUES (%s, %s, %s, %s, %s)',
+            rows,
+        )
+        return len(rows)
+
+    def search(self, terms, limit):
+        # 단어마다 "단어"* (접두어), 공백은 AND. 단어에 따옴표가 들어갈 일은 없다(tokenize).
+        # 한 글자 접두어는 거의 모든 줄거리에 걸려 bm25 정렬이 비싸지므로 제목 컬럼에서만
+        short = '{%s} : ' % ' '.join(SHORT_TERM_FIELDS)
+        match = ' '.join(
+            (short if len(term) == 1 else '') + f'"{term}"*' for term in terms
+        )
+        weights = ', '.join(str(FIELD_WEIGHTS[field]) for field in FIELDS)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+                f'ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s',
+                [match, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+# ──────────────────────────────────────
+# 순수 Python 역색인
+# ──────────────────────────────────────
+class InvertedIndex:
+    """
+    postings : 단어 → {영화 id: 필드 가중치 합}
+    terms    : 정렬된 단어 목록 (bisect 로 접두어 범위 찾기)
+    점수     : 단어마다 idf × tf/(tf + K) 의 합 (bm25 에서 문서 길이 보정만 뺀 꼴)
+    copy() 한 색인은 posting 을 원본과 같이 쓰다가 고칠 때만 그 posting 을 복사한다 (owned)
+    """
+    K = 1.2
+
+    def __init__(self):
+        self.postings = {}
+        self.doc_terms = {}
+        self.terms = []
+        self.owned = set()
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    def copy(self):
+        """단어 / 문서 수에 비례하는 얕은 복사 (posting 내용은 고칠 때 복사)"""
+        other = InvertedIndex()
+        other.postings = dict(self.postings)
+        other.doc_terms = dict(self.doc_terms)
+        other.terms = list(self.terms)
+        return other
+
+    def _writable(self, term):
+        if term not in self.owned:
+            self.postings[term] = dict(self.postings[term])
+            self.owned.add(term)
+        return self.postings[term]
+
+    def add(self, movie_id, fields):
+        self.remove(movie_id)
+        weights = {}
+        for field, text in fields.items():
+            weight = FIELD_WEIGHTS[field]
+            for term in tokenize(text):
+                weights[term] = weights.get(term, 0.0) + weight
+
+        for term, weight in weights.items():
+            if term in self.postings:
+                posting = self._writable(term)
+            else:
+                posting = self.postings[term] = {}
+                self.owned.add(term)
+                bisect.insort(self.terms, term)
+            posting[movie_id] = weight
+        self.doc_terms[movie_id] = tuple(weights)
+
+    def remove(self, movie_id):
+        for term in self.doc_terms.pop(movie_id, ()):
+            posting = self._writable(term)
+            posting.pop(movie_id, None)
+            if not posting:
+                del self.postings[term]
+                self.owned.discard(term)
+                del self.terms[bisect.bisect_left(self.terms, term)]
+
+    def expand(self, prefix):
+        start = bisect.bisect_left(self.terms, prefix)
+        end = bisect.bisect_left(self.terms, prefix + '\U0010ffff', start)
+        return self.terms[start:min(end, start + MAX_PREFIX_EXPANSION)]
+
+    def term_scores(self, prefix):
+        """접두어에 걸리는 모든 단어의 점수를 영화별로 합친 {영화 id: 점수}"""
+        n = len(self.doc_terms) or 1
+        scores = {}
+        for term in self.expand(prefix):
+            posting = self.postings[term]
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for movie_id, tf in posting.items():
+                scores[movie_id] = scores.get(movie_id, 0.0) + idf * tf / (tf + self.K)
+        return scores
+
+    def search(self, terms, limit):
+        # 결과가 적은 단어부터 교집합 (AND)
+        per_term = sorted((self.term_scores(term) for term in terms), key=len)
+        if not per_term or not per_term[0]:
+            return []
+        scores = dict(per_term[0])
+        for other in per_term[1:]:
+            scores = {
+                movie_id: score + other[movie_id]
+                for movie_id, score in scores.items() if movie_id in other
+            }
+            if not scores:
+                return []
+        ranked = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [movie_id for movie_id, _ in ranked]
+
+
+class PythonBackend:
+    name = 'python'
+
+    def __init__(self):
+        # 검색은 이 참조를 한 번 읽어서 쓰고, 갱신은 (lock 안에서) 새 색인으로 바꿔 끼운다
+        self.index_data = None
+        self.synced_at = None
+        self.lock = threading.Lock()
+
+    def _load(self):
+        started = timezone.now()
+        index = InvertedIndex()
+        for movie_id, fields in iter_documents():
+            index.add(movie_id, fields)
+        self.index_data, self.synced_at = index, started
+
+    def _sync(self):
+        """다른 프로세스(import 등)가 색인을 갱신했으면 그 뒤로 바뀐 영화만 다시 읽기"""
+        watermark = JobState.get_watermark(JOB_NAME)
+        if self.index_data is not None and (watermark is None or watermark <= self.synced_at):
+            return
+        with self.lock:
+            if self.index_data is None:
+                self._load()
+                return
+            if watermark is None or watermark <= self.synced_at:
+                return
+            started = timezone.now()
+            index = self.index_data.copy()
+            for movie_id, fields in iter_documents(since=self.synced_at):
+                index.add(movie_id, fields)
+            # 다른 프로세스에서 삭제된 영화 (삭제는 updated_at 으로 안 보임)
+            for movie_id in index.doc_terms.keys() - set(Movie.objects.values_list('id', flat=True)):
+                index.remove(movie_id)
+            self.index_data, self.synced_at = index, started
+
+    def index(self, movie_ids):
+        if self.index_data is None:
+            return
+        with self.lock:
+            index = self.index_data.copy()
+            movie_ids = set(movie_ids)
+            for movie_id, fields in iter_documents(movie_ids):
+                index.add(movie_id, fields)
+                movie_ids.discard(movie_id)
+            # DB 에 없는 id 는 삭제된 영화
+            for movie_id in movie_ids:
+                index.remove(movie_id)
+            self.index_data = index
+
+    def rebuild(self):
+        with self.lock:
+            self._load()
+        return len(self.index_data)
+
+    def search(self, terms, limit):
+        self._sync()
+        # 갱신은 새 색인으로 바꿔 끼우므로 읽는 쪽은 락 없이 (읽는 동안 그 색인은 아무도 안 고침)
+        return self.index_data.search(terms, limit)
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def _fts5_ready():
+    """SQLite + FTS5 컴파일 옵션 + movies_search 테이블 (DB 별로 한 번만 확인)"""
+    key = ('fts5', connection.alias)
+    if key not in _backends:
+        _backends[key] = fts5_available() and FTS_TABLE in connection.introspection.table_names()
+    return _backends[key]
+
+
+def get_backend():
+    """
+    settings.MOVIE_SEARCH_BACKEND ('fts5' 기본, 'python')
+    fts5 를 골랐어도 SQLite 가 아니거나 FTS5 를 못 쓰면 python 으로
+    """
+    name = getattr(settings, 'MOVIE_SEARCH_BACKEND', 'fts5')
+    if name == 'fts5' and _fts5_ready():
+        return FTS5Backend()
+
+    if 'python' not in _backends:
+        with _backends_lock:
+            if 'python' not in _backends:
+                _backends['python'] = PythonBackend()
+    return _backends['python']
+
+
+# ──────────────────────────────────────
+# 외부에서 쓰는 함수
+# ──────────────────────────────────────
+def search_movie_ids(q, limit=20):
+    """검색어 → 순위대로 영화 id 목록"""
+    terms = query_terms(q)
+    if not terms:
+        return []
+    return get_backend().search(terms, limit)
+
+
+def index_movies(movie_ids):
+    """추가/수정/삭제된 영화만 색인에 반영하고 워터마크 올리기"""
+    movie_ids = list(movie_ids)
+    if not movie_ids:
+        return
+    get_backend().index(movie_ids)
+    JobState.set_watermark(JOB_NAME, timezone.now())
+
+
+def rebuild_search_index():
+    count = get_backend().rebuild()
+    JobState.set_watermark(JOB_NAME, timezone.now())
+    return count
@@ -69,17 +69,23 @@ class MovieDetailSerializer(serializers.ModelSerializer):
             'is_in_watchlist',
         )
 
+    # MovieDetailAPIView 에서 user_score / in_watchlist 를 annotate 해 두면 추가 쿼리 없음
     def get_user_score(self, obj):
         request = self.context.get('request')
         if not request or request.user.is_anonymous:
             return None
-        rating = obj.ratings.filter(user=request.user).first()
-        return float(rating.score) if rating else None
+        if hasattr(obj, 'user_score'):
+            score = obj.user_score
+        else:
+            score = obj.ratings.filter(user=request.user).values_list('score', flat=True).first()
+        return float(score) if score is not None else None
 
     def get_is_in_watchlist(self, obj):
         request = self.context.get('request')
         if not request or request.user.is_anonymous:
             return False
+        if hasattr(obj, 'in_watchlist'):
+            return obj.in_watchlist
         return obj.watchlist_entries.filter(user=request.user).exists()
 
 
@@ -90,9 +96,49 @@ class RatingSerializer(serializers.ModelSerializer):
         read_only_fields = ('user', 'movie', 'created_at', 'updated_at')
 
 
+# ─────────────────────────────────────────────
+# 일괄 저장 (온보딩에서 평점/워치리스트 여러 개를 요청 한 번에)
+# ─────────────────────────────────────────────
+
+BULK_MAX_ITEMS = 100
+
+
+class BulkRatingItemSerializer(serializers.Serializer):
+    movie = serializers.IntegerField(min_value=1)
+    score = serializers.DecimalField(
+        max_digits=Rating._meta.get_field('score').max_digits,
+        decimal_places=Rating._meta.get_field('score').decimal_places,
+    )
+
+
+class BulkWatchListItemSerializer(serializers.Serializer):
+    movie = serializers.IntegerField(min_value=1)
+    status = serializers.ChoiceField(choices=WatchList.STATUS_CHOICES, default='WANT')
+
+
+class BulkMovieItemsSerializer(serializers.Serializer):
+    """items 의 영화 id 를 쿼리 한 번으로 검증. 같은 영화가 여러 번 오면 마지막 것"""
+
+    def validate_items(self, items):
+        movie_ids = {item['movie'] for item in items}
+        found = set(Movie.objects.filter(id__in=movie_ids).values_list('id', flat=True))
+        missing = sorted(movie_ids - found)
+        if missing:
+            raise serializers.ValidationError(f'없는 영화 id: {missing}')
+        return items
+
+
+class BulkRatingSerializer(BulkMovieItemsSerializer):
+    items = BulkRatingItemSerializer(many=True, allow_empty=False, max_length=BULK_MAX_ITEMS)
+
+
+class BulkWatchListSerializer(BulkMovieItemsSerializer):
+    items = BulkWatchListItemSerializer(many=True, allow_empty=False, max_length=BULK_MAX_ITEMS)
+
+
 class ReviewSerializer(serializers.ModelSerializer):
-    # LikeReview 에서 related_name='likes' 이므로 사용 가능
-    like_count = serializers.IntegerField(source='likes.count', read_only=True)
+    # 내가 좋아요 눌렀는지: 목록에서는 context['liked_review_ids'] 로 한 번에 넘겨받음
+    is_liked = serializers.SerializerMethodField()
 
     class Meta:
         model = Review
@@ -102,9 +148,19 @@ class ReviewSerializer(serializers.ModelSerializer):
             'author',
             'content',
             'like_count',
+            'is_liked',
             'created_at',
         )
-        read_only_fields = ('movie', 'created_at')
+        read_only_fields = ('movie', 'like_count', 'created_at')
+
+    def get_is_liked(self, obj):
+        liked_ids = self.context.get('liked_review_ids')
+        if liked_ids is not None:
+            return obj.id in liked_ids
+        request = self.context.get('request')
+        if not request or request.user.is_anonymous:
+            return False
+        return obj.likes.filter(user=request.user).exists()
 
 class MovieSerializer(serializers.ModelSerializer):
     # 비슷한 영화 추천용: 간단 카드용 데이터
@@ -131,10 +187,12 @@ class WatchListSerializer(serializers.ModelSerializer):
 # ✅ 마이페이지용: 영화 정보까지 같이 주는 시리얼라이저
 class WatchListItemSerializer(serializers.ModelSerializer):
     movie = MovieSerializer(read_only=True)
+    # 내 평점: 목록 쿼리에서 annotate (with_user_score) 해 둔 값, 없으면 None
+    user_score = serializers.FloatField(read_only=True, default=None)
 
     class Meta:
         model = WatchList
-        fields = ('id', 'movie', 'status', 'created_at')
+        fields = ('id', 'movie', 'status', 'user_score', 'created_at')
         
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,142 @@
+# movies/signals.py
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import cache as movie_cache
+from .aggregates import apply_rating_changes, latest_review_subquery
+from .models import Movie, MovieCast, MovieGenre, Rating, Review, WatchList
+from .search import index_movies
+
+
+def origin_model(origin):
+    """post_delete 의 origin (삭제를 시작한 인스턴스 또는 QuerySet) 의 모델"""
+    return getattr(origin, 'model', type(origin))
+
+
+@receiver(post_save, sender=Review)
+def set_latest_review(sender, instance, created, **kwargs):
+    # 어디서 만들든(API / admin / shell) 새 리뷰가 그 영화의 최신 리뷰
+    if created:
+        Movie.objects.filter(pk=instance.movie_id).update(latest_review=instance)
+
+
+@receiver(post_delete, sender=Review)
+def repoint_latest_review(sender, instance, **kwargs):
+    # 최신 리뷰가 지워져서 SET_NULL 된 영화만 그 다음 최신 리뷰로
+    Movie.objects.filter(pk=instance.movie_id, latest_review__isnull=True).update(
+        latest_review=latest_review_subquery()
+    )
+
+
+@receiver(post_save, sender=Movie)
+@receiver(post_delete, sender=Movie)
+def reindex_movie(sender, instance, **kwargs):
+    # admin 등에서 한 편씩 저장/삭제할 때 검색 색인 반영 (import 는 write_movies 쪽에서 묶어서)
+    index_movies([instance.pk])
+
+
+# ─────────────────────────────────────────────
+# 응답 캐시 / ETag 버전 (movies.cache) - 바뀐 데이터에 걸린 키만
+# bulk_create / bulk_update 경로(import, 집계 재계산, 좋아요)는 거기서 직접 bump
+# ─────────────────────────────────────────────
+
+@receiver(post_save, sender=Movie)
+@receiver(post_delete, sender=Movie)
+def bump_movie(sender, instance, **kwargs):
+    movie_cache.bump_movies([instance.pk])
+    movie_cache.bump('facets')
+
+
+@receiver(post_save, sender=MovieGenre)
+@receiver(post_delete, sender=MovieGenre)
+@receiver(post_save, sender=MovieCast)
+@receiver(post_delete, sender=MovieCast)
+def bump_movie_relation(sender, instance, origin=None, **kwargs):
+    # 영화 삭제의 CASCADE 로 지워지는 행이면 bump_movie 가, import 면 write_movies 가 묶어서 올림
+    # (행마다 올리면 출연진 수만큼 쿼리)
+    if origin_model(origin) is Movie or movie_cache.in_batched_bumps():
+        return
+    # 장르/출연진은 상세와 목록 필터(facets)에만 쓰이고 목록 순서와는 무관
+    movie_cache.bump(movie_cache.movie_key(instance.movie_id), 'facets')
+
+
+@receiver(post_save, sender=Rating)
+@receiver(post_delete, sender=Rating)
+def bump_rating(sender, instance, origin=None, **kwargs):
+    # 유저 삭제의 CASCADE 면 drop_user_ratings 가 묶어서 올림
+    if origin_model(origin) is get_user_model():
+        return
+    # 평균 평점(카드/상세) + 평점순 목록 + 그 유저의 "내 평점"
+    movie_cache.bump_movies([instance.movie_id], orders=('rating_avg',))
+    movie_cache.bump(movie_cache.user_key(instance.user_id))
+
+
+# ─────────────────────────────────────────────
+# 평점 삭제 → Movie 평점 집계에서 빼기 (저장 쪽은 aggregates.save_rating / save_ratings)
+# ─────────────────────────────────────────────
+
+@receiver(post_delete, sender=Rating)
+def drop_rating(sender, instance, origin=None, **kwargs):
+    # 영화 삭제면 집계할 영화가 같이 사라지고, 유저 삭제면 drop_user_ratings 가 묶어서 처리
+    if origin_model(origin) in (Movie, get_user_model()):
+        return
+    with transaction.atomic():
+        apply_rating_changes({instance.movie_id: [(instance.score, None)]})
+        # 지운 평점의 영화 + 그 유저 평균이 바뀌어 평점 벡터가 달라진 영화들
+        touch_movies(
+            Q(pk=instance.movie_id) | Q(pk__in=Rating.objects.filter(user_id=instance.user_id).values('movie_id'))
+        )
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def drop_user_ratings(sender, instance, **kwargs):
+    # CASCADE 로 지워질 평점들을 영화별로 묶어서 한 번에 (평점 수와 상관없이 쿼리 3번, 삭제와 같은 트랜잭션)
+    changes = defaultdict(list)
+    for movie_id, score in Rating.objects.filter(user=instance).values_list('movie_id', 'score'):
+        changes[movie_id].append((score, None))
+    if not changes:
+        return
+    apply_rating_changes(changes)
+    touch_movies(Q(pk__in=changes.keys()))
+    movie_cache.bump_movies(changes.keys(), orders=('rating_avg',))
+    movie_cache.bump(movie_cache.user_key(instance.pk))
+
+
+@receiver(post_save, sender=WatchList)
+@receiver(post_delete, sender=WatchList)
+def bump_watchlist(sender, instance, **kwargs):
+    movie_cache.bump(movie_cache.user_key(instance.user_id))
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def bump_review(sender, instance, **kwargs):
+    # 리뷰는 영화 상세/목록 응답에 들어가지 않으므로 그 영화의 리뷰 버전만
+    movie_cache.bump(movie_cache.review_key(instance.movie_id))
+
+
+# ─────────────────────────────────────────────
+# Movie.updated_at: 유사도 증분 빌드(similarity.changed_movie_ids)가 보는 "특징이 바뀐 영화"
+# (집계 갱신은 bulk_update 라 auto_now 가 안 돈다 / write_movies 는 직접 넣음)
+# ─────────────────────────────────────────────
+
+def touch_movies(condition):
+    Movie.objects.filter(condition).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=MovieGenre)
+@receiver(post_delete, sender=MovieGenre)
+@receiver(post_save, sender=MovieCast)
+@receiver(post_delete, sender=MovieCast)
+def touch_movie_relation(sender, instance, origin=None, **kwargs):
+    # admin / shell 에서 장르·출연진만 고친 경우 (영화 삭제 CASCADE / import 묶음은 제외)
+    if origin_model(origin) is Movie or movie_cache.in_batched_bumps():
+        return
+    touch_movies(Q(pk=instance.movie_id))
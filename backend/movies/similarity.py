@@ -0,0 +1,320 @@
+# movies/similarity.py
+"""
+아이템-아이템 유사도 (오프라인 계산 → MovieSimilarity 테이블)
+
+영화 한 편 = 희소 벡터 [장르 | 감독 | 배우 | 국가 | 유저 평점(유저 평균 보정)]
+블록마다 L2 정규화 후 sqrt(가중치)를 곱해 두면, 두 영화 벡터의 내적이
+"블록별 코사인 유사도의 가중합" 이 된다. 이걸 행 묶음 단위로 X @ X.T 해서
+영화마다 top-K 이웃만 저장한다.
+
+증분 빌드 (기본):
+  마지막 빌드(JobState 'similarity') 이후 바뀐 영화 집합 C 에 대해
+  1) C 의 행, 그리고 기존 top-K 에 C 가 들어 있던 행은 전체 영화와 다시 계산
+     (C 가 빠진 자리는 저장 안 된 K+1 번째 이웃이 채워야 하므로)
+  2) 나머지 영화는 기존 top-K 가 그대로 유효 → C 와의 새 점수만 합쳐서 다시 top-K
+  → 바뀐 영화 수(× K)에 비례하는 비용만 든다.
+  C (changed_movie_ids) = Movie.updated_at 이 워터마크 이후인 영화 + 그 이후 평점을 남긴 유저가 평점 준 모든 영화
+    (유저 평균이 바뀌면 그 유저의 평점이 든 영화 벡터가 전부 바뀌므로)
+    Movie.updated_at 은 import / admin 저장 외에 signals 에서도 올린다: 장르·출연진 행 수정, 평점 삭제
+    (지운 영화 + 그 유저가 평점 준 영화), 유저 삭제
+  이 경로로 쓴 변경은 결과가 전체 재계산과 같다. signals 를 거치지 않는 bulk 쓰기(seed_benchmark,
+  직접 SQL)나 영화 삭제(이웃 목록에서 빠진 자리)는 --full 로 다시 계산할 것.
+  워터마크가 없으면(첫 빌드) movie_ids 를 주지 않는 한 전체 계산.
+"""
+import numpy as np
+from scipy import sparse
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import cache as movie_cache
+from .models import JobState, Movie, MovieCast, MovieGenre, MovieSimilarity, Rating
+
+JOB_NAME = 'similarity'
+
+DEFAULT_WEIGHTS = {
+    'genre': 1.0,
+    'director': 0.5,
+    'actor': 1.0,
+    'country': 0.3,
+    'rating': 1.5,
+}
+
+
+def get_weights():
+    weights = dict(DEFAULT_WEIGHTS)
+    weights.update(getattr(settings, 'SIMILARITY_WEIGHTS', {}))
+    return weights
+
+
+def get_top_k():
+    return getattr(settings, 'SIMILARITY_TOP_K', 20)
+
+
+def get_chunk_rows(n_cols):
+    """X @ X.T 를 dense 로 펼칠 때 한 번에 처리할 행 수 (기본 셀 2천만개 ≈ 80MB)"""
+    budget = getattr(settings, 'SIMILARITY_CHUNK_CELLS', 20_000_000)
+    return max(1, budget // max(n_cols, 1))
+
+
+# ──────────────────────────────────────
+# 특징 행렬
+# ──────────────────────────────────────
+def values_array(queryset, fields, dtype=np.int64, chunk_size=10000):
+    """values_list 결과를 (행 수 × 필드 수) numpy 배열로 (iterator 로 메모리 일정하게)"""
+    parts, buf = [], []
+    for row in queryset.values_list(*fields).iterator(chunk_size=chunk_size):
+        buf.append(row)
+        if len(buf) >= chunk_size:
+            parts.append(np.array(buf, dtype=dtype))
+            buf = []
+    if buf:
+        parts.append(np.array(buf, dtype=dtype))
+    if not parts:
+        return np.empty((0, len(fields)), dtype=dtype)
+    return np.vstack(parts)
+
+
+def normalized_block(rows, cols, values, n_rows, weight):
+    """희소 블록 하나를 만들고 행 단위 L2 정규화 × sqrt(weight)"""
+    if weight <= 0 or len(rows) == 0:
+        return None
+    _, col_index = np.unique(cols, return_inverse=True)
+    block = sparse.csr_matrix(
+        (np.asarray(values, dtype=np.float32), (rows, col_index)),
+        shape=(n_rows, int(col_index.max()) + 1),
+    )
+    block.sum_duplicates()
+    block.eliminate_zeros()
+    norms = np.sqrt(np.asarray(block.multiply(block).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    scale = (np.sqrt(weight) / norms).astype(np.float32)
+    return sparse.diags(scale) @ block
+
+
+def build_feature_matrix(weights=None):
+    """(영화 id 배열(오름차순), 희소 특징 행렬 X) 반환"""
+    weights = weights or get_weights()
+    movie_ids = values_array(Movie.objects.order_by('id'), ['id']).ravel()
+    n = len(movie_ids)
+
+    def index_of(ids):
+        return np.searchsorted(movie_ids, ids)
+
+    blocks = []
+
+    pairs = values_array(MovieGenre.objects.all(), ['movie_id', 'genre_id'])
+    blocks.append(normalized_block(index_of(pairs[:, 0]), pairs[:, 1], np.ones(len(pairs)), n,
+                                   weights['genre']))
+
+    for role in ('director', 'actor'):
+        pairs = values_array(MovieCast.objects.filter(role=role), ['movie_id', 'person_id'])
+        blocks.append(normalized_block(index_of(pairs[:, 0]), pairs[:, 1], np.ones(len(pairs)), n,
+                                       weights[role]))
+
+    countries = list(Movie.objects.exclude(country='').values_list('id', 'country'))
+    if countries:
+        ids, codes = zip(*countries)
+        blocks.append(normalized_block(index_of(np.array(ids)), np.array(codes), np.ones(len(ids)), n,
+                                       weights['country']))
+
+    # 공동 평점: 유저별 평균을 빼서(adjusted cosine) 점수 성향 차이 보정
+    ratings = values_array(Rating.objects.all(), ['movie_id', 'user_id', 'score'], dtype=np.float64)
+    if len(ratings):
+        user_index = np.unique(ratings[:, 1], return_inverse=True)[1]
+        means = np.bincount(user_index, weights=ratings[:, 2]) / np.bincount(user_index)
+        centered = ratings[:, 2] - means[user_index]
+        blocks.append(normalized_block(index_of(ratings[:, 0].astype(np.int64)), user_index, centered, n,
+                                       weights['rating']))
+
+    blocks = [b for b in blocks if b is not None]
+    if not blocks:
+        return movie_ids, sparse.csr_matrix((n, 1), dtype=np.float32)
+    return movie_ids, sparse.hstack(blocks, format='csr', dtype=np.float32)
+
+
+# ──────────────────────────────────────
+# top-K
+# ──────────────────────────────────────
+def top_k_of(scores, k):
+    """dense (b × m) 점수에서 행마다 점수 내림차순 top-k (인덱스, 점수)"""
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(np.int64), empty.astype(np.float32)
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind='stable')
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+
+def iter_top_k(X, rows, k):
+    """
+    rows 의 각 행에 대해 X 의 모든 행과 내적 → 자기 자신 제외 top-k
+    (행 인덱스, 이웃 인덱스 배열, 점수 배열) 을 yield. 점수 0 이하는 버린다.
+    """
+    XT = X.T.tocsc()
+    step = get_chunk_rows(X.shape[0])
+    for start in range(0, len(rows), step):
+        block_rows = np.asarray(rows[start:start + step])
+        scores = (X[block_rows] @ XT).toarray().astype(np.float32, copy=False)
+        scores[np.arange(len(block_rows)), block_rows] = -np.inf
+        top_idx, top_scores = top_k_of(scores, k)
+        for row, idx, vals in zip(block_rows, top_idx, top_scores):
+            keep = vals > 0
+            yield int(row), idx[keep], vals[keep]
+
+
+def merge_changed_columns(X, changed, current_idx, current_scores, k):
+    """
+    나머지 행들의 기존 top-k(current_*, 바뀐 항목이 없는 행만 결과를 쓴다) 에
+    changed 행들과의 새 점수를 합쳐 다시 top-k.
+    """
+    step = get_chunk_rows(X.shape[0])
+    best_idx, best_scores = current_idx, current_scores
+    for start in range(0, len(changed), step):
+        cols = np.asarray(changed[start:start + step])
+        scores = (X @ X[cols].T).toarray().astype(np.float32, copy=False)
+        scores[cols, np.arange(len(cols))] = -np.inf
+        chunk_idx, chunk_scores = top_k_of(scores, k)
+        merged_idx = np.hstack([best_idx, cols[chunk_idx]])
+        merged_scores = np.hstack([best_scores, chunk_scores])
+        order_idx, best_scores = top_k_of(merged_scores, k)
+        best_idx = np.take_along_axis(merged_idx, order_idx, axis=1)
+    return best_idx, best_scores
+
+
+# ──────────────────────────────────────
+# 저장
+# ──────────────────────────────────────
+def write_neighbors(neighbor_lists, batch_size=500):
+    """neighbor_lists: [(movie_id, [(similar_id, score), ...]), ...] → 영화 단위로 교체"""
+    written = 0
+    batch_ids, objs = [], []
+
+    def flush():
+        with transaction.atomic():
+            MovieSimilarity.objects.filter(movie_id__in=batch_ids).delete()
+            MovieSimilarity.objects.bulk_create(objs)
+            # 비슷한 영화 응답 캐시 무효화
+            movie_cache.bump('similarity')
+
+    for movie_id, neighbors in neighbor_lists:
+        batch_ids.append(movie_id)
+        objs.extend(
+            MovieSimilarity(movie_id=movie_id, similar_id=similar_id, score=score, rank=rank)
+            for rank, (similar_id, score) in enumerate(neighbors, start=1)
+        )
+        if len(batch_ids) >= batch_size:
+            flush()
+            written += len(batch_ids)
+            batch_ids, objs = [], []
+
+    if batch_ids:
+        flush()
+        written += len(batch_ids)
+    return written
+
+
+def load_neighbors(movie_ids, k):
+    """저장된 top-k 를 (n × k) 인덱스/점수 배열로 (없는 칸은 -inf)"""
+    n = len(movie_ids)
+    idx = np.zeros((n, k), dtype=np.int64)
+    scores = np.full((n, k), -np.inf, dtype=np.float32)
+    rows = values_array(
+        MovieSimilarity.objects.filter(rank__lte=k),
+        ['movie_id', 'similar_id', 'rank', 'score'],
+        dtype=np.float64,
+    )
+    if len(rows):
+        movie_pos = np.searchsorted(movie_ids, rows[:, 0].astype(np.int64))
+        similar_pos = np.searchsorted(movie_ids, rows[:, 1].astype(np.int64))
+        valid = (
+            (movie_pos < n) & (similar_pos < n)
+            & (movie_ids[np.minimum(movie_pos, n - 1)] == rows[:, 0])
+            & (movie_ids[np.minimum(similar_pos, n - 1)] == rows[:, 1])
+        )
+        rank_pos = rows[:, 2].astype(np.int64) - 1
+        idx[movie_pos[valid], rank_pos[valid]] = similar_pos[valid]
+        scores[movie_pos[valid], rank_pos[valid]] = rows[valid, 3]
+    return idx, scores
+
+
+def changed_movie_ids(since):
+    """since 이후 특징 벡터가 바뀐 영화 id (정보 / 장르·출연진 / 평점, 평점은 유저 평균 변화까지)"""
+    changed = set(Movie.objects.filter(updated_at__gt=since).values_list('id', flat=True))
+    raters = Rating.objects.filter(updated_at__gt=since).values('user_id')
+    changed.update(
+        Rating.objects.filter(user_id__in=raters).values_list('movie_id', flat=True).distinct()
+    )
+    return changed
+
+
+def build_similarity(full=False, movie_ids=None, top_k=None, log=None):
+    """
+    유사도 빌드. 처리한(다시 쓴) 영화 수를 반환.
+      full=True      : 전체 다시 계산
+      movie_ids=[..] : 지정한 영화를 바뀐 것으로 간주
+      기본           : JobState 워터마크 이후 바뀐 영화만 증분 계산
+    """
+    log = log or (lambda msg: None)
+    k = top_k or get_top_k()
+    started = timezone.now()
+
+    all_ids, X = build_feature_matrix()
+    n = len(all_ids)
+    log(f"특징 행렬: 영화 {n}편 × 특징 {X.shape[1]}개")
+
+    watermark = JobState.get_watermark(JOB_NAME)
+    changed = set(movie_ids or [])
+    if not full and watermark is not None:
+        changed |= changed_movie_ids(watermark)
+    elif not movie_ids:
+        full = True
+
+    if full or len(changed) * 2 >= n:
+        rows = np.arange(n)
+        lists = (
+            (int(all_ids[row]), list(zip(all_ids[idx].tolist(), scores.tolist())))
+            for row, idx, scores in iter_top_k(X, rows, k)
+        )
+        written = write_neighbors(lists)
+        JobState.set_watermark(JOB_NAME, started)
+        log(f"전체 계산: 영화 {written}편")
+        return written
+
+    changed_rows = np.flatnonzero(np.isin(all_ids, list(changed)))
+    if not len(changed_rows):
+        JobState.set_watermark(JOB_NAME, started)
+        log("바뀐 영화 없음")
+        return 0
+
+    is_changed = np.zeros(n, dtype=bool)
+    is_changed[changed_rows] = True
+    current_idx, current_scores = load_neighbors(all_ids, k)
+    had_changed = (is_changed[current_idx] & np.isfinite(current_scores)).any(axis=1)
+
+    # 1) 바뀐 영화 + 기존 top-k 에 바뀐 영화가 있던 영화는 전체와 다시 계산
+    recompute = is_changed | had_changed
+    written = write_neighbors(
+        (int(all_ids[row]), list(zip(all_ids[idx].tolist(), scores.tolist())))
+        for row, idx, scores in iter_top_k(X, np.flatnonzero(recompute), k)
+    )
+
+    # 2) 나머지 영화는 기존 top-k 에 바뀐 영화와의 새 점수만 합치기
+    best_idx, best_scores = merge_changed_columns(X, changed_rows, current_idx, current_scores, k)
+    has_changed = (is_changed[best_idx] & (best_scores > 0)).any(axis=1)
+    rewrite = np.flatnonzero(has_changed & ~recompute)
+
+    def other_lists():
+        for row in rewrite:
+            keep = best_scores[row] > 0
+            yield (
+                int(all_ids[row]),
+                list(zip(all_ids[best_idx[row][keep]].tolist(), best_scores[row][keep].tolist())),
+            )
+
+    written += write_neighbors(other_lists())
+    JobState.set_watermark(JOB_NAME, started)
+    log(f"증분 계산: 바뀐 영화 {len(changed_rows)}편, 다시 쓴 영화 {written}편")
+    return written
@@ -1,3 +1,1641 @@
-from django.test import TestCase
+import base64
+import io
+import json
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import requests
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from asgiref.sync import async_to_sync
+from django.urls import resolve
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import (
+    async_views, benchmark, cache as movie_cache, facets, fastpath, profiling, ranking, recommend, routers, search,
+    similarity, tmdb, user_similarity,
+)
+from .urls import urlpatterns
+from .aggregates import (
+    rebuild_rating_stats, reconcile_like_counts, save_rating, save_ratings, toggle_review_like,
+)
+from .fastpath import FastJSONRenderer
+from .pagination import MovieCursorPagination
+from .models import (
+    Genre, JobState, LikeReview, Movie, MovieCast, MovieGenre, MovieSimilarity, Person, Rating, Review, UserNeighbors,
+    WatchList,
+)
+from .serializers import MovieListSerializer, MovieSerializer, WatchListItemSerializer
+from .views import with_user_score
+
+
+# ─────────────────────────────────────────────
+# TMDB 대역 서버 (import_tmdb 테스트용)
+# ─────────────────────────────────────────────
+
+class FakeTMDB:
+    """
+    /movie/popular?page=N  → 페이지마다 영화 2편
+    /movie/{id}            → 상세 + 크레딧
+    throttle_once 에 든 id 는 처음 한 번 429(Retry-After: 0) 응답
+    missing_pages 에 든 페이지는 404
+    """
+
+    def __init__(self):
+        self.hits = []
+        self.throttle_once = set()
+        self.missing_pages = set()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                fake.hits.append(url.path)
+                if url.path == '/movie/popular':
+                    page = int(parse_qs(url.query)['page'][0])
+                    if page in fake.missing_pages:
+                        return self.reply(404, {})
+                    return self.reply(200, {'results': [{'id': page * 10 + i} for i in range(2)]})
+
+                tmdb_id = int(url.path.rsplit('/', 1)[1])
+                if tmdb_id in fake.throttle_once:
+                    fake.throttle_once.discard(tmdb_id)
+                    return self.reply(429, {}, {'Retry-After': '0'})
+                return self.reply(200, fake.detail(tmdb_id))
+
+            def reply(self, status, body, headers=None):
+                raw = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(raw)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(raw)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @staticmethod
+    def detail(tmdb_id):
+        return {
+            'id': tmdb_id,
+            'title': f'영화 {tmdb_id}',
+            'release_date': '2020-01-01',
+            'runtime': 100,
+            'popularity': tmdb_id / 10,
+            'production_countries': [{'iso_3166_1': 'KR'}],
+            'genres': [{'name': '드라마'}],
+            'credits': {
+                'crew': [{'id': 1, 'job': 'Director', 'name': '감독'}],
+                'cast': [
+                    {'id': 1000 + tmdb_id, 'name': f'배우 {tmdb_id}', 'character': '주인공'},
+                    {'id': 2, 'name': '단골 배우'},
+                    # 이름만 같은 다른 사람 (페이지마다 다른 tmdb id)
+                    {'id': 3 + tmdb_id // 10, 'name': '김동명'},
+                ],
+            },
+        }
+
+
+class ImportTMDBTests(TestCase):
+    def setUp(self):
+        self.tmdb = FakeTMDB()
+        self.addCleanup(self.tmdb.stop)
+        self.checkpoint = Path(tempfile.mkdtemp()) / 'import.json'
+
+    def run_import(self, *args):
+        call_command(
+            'import_tmdb', '--base-url', self.tmdb.url, '--checkpoint', str(self.checkpoint),
+            *args, stdout=StringIO(),
+        )
+
+    def test_import_retries_throttled_requests(self):
+        self.tmdb.throttle_once = {10, 21}
+        self.run_import('--pages', '2', '--workers', '4')
+
+        self.assertEqual(Movie.objects.count(), 4)
+        self.assertEqual(Person.objects.filter(name='단골 배우').count(), 1)
+        self.assertEqual(MovieCast.objects.filter(person__name='단골 배우').count(), 4)
+        self.assertEqual(Person.objects.filter(name='김동명').count(), 2)
+        self.assertEqual(self.tmdb.hits.count('/movie/10'), 2)
+        self.assertFalse(self.checkpoint.exists())
+
+    def test_reimport_updates_in_place(self):
+        self.run_import('--pages', '1')
+        self.run_import('--pages', '1')
+
+        self.assertEqual(Movie.objects.count(), 2)
+        self.assertEqual(MovieCast.objects.count(), 8)
+
+    def test_import_links_rows_saved_before_tmdb_id(self):
+        legacy = Movie.objects.create(title='영화 10', release_year=2020)
+        director = Person.objects.create(name='감독')
+
+        self.run_import('--pages', '1')
+
+        legacy.refresh_from_db()
+        director.refresh_from_db()
+        self.assertEqual(legacy.tmdb_id, 10)
+        self.assertEqual(director.tmdb_id, 1)
+        self.assertEqual(Movie.objects.count(), 2)
+        self.assertEqual(Person.objects.filter(name='감독').count(), 1)
+
+    def test_resume_from_checkpoint(self):
+        self.tmdb.missing_pages = {2}
+        with self.assertRaises(requests.HTTPError):
+            self.run_import('--pages', '3')
+        self.assertEqual(json.loads(self.checkpoint.read_text())['last_page'], 1)
+
+        self.tmdb.missing_pages = set()
+        self.tmdb.hits.clear()
+        self.run_import('--pages', '3', '--resume')
+
+        self.assertEqual(Movie.objects.count(), 6)
+        self.assertNotIn('/movie/10', self.tmdb.hits)
+
+    def test_reimport_query_count_does_not_grow_with_cast(self):
+        def reimport(cast_size):
+            parsed = []
+            for tmdb_id in range(10, 14):
+                data = FakeTMDB.detail(tmdb_id)
+                data['credits']['cast'] = [
+                    {'id': 5000 + tmdb_id * 100 + i, 'name': f'배우 {tmdb_id}-{i}'} for i in range(cast_size)
+                ]
+                parsed.append(tmdb.parse_movie(data))
+            tmdb.write_movies(parsed)
+            # 두 번째 가져오기: 장르 / 출연진 행을 지우고 다시 (캐시 버전 올리기까지 포함해서 센다)
+            with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks(execute=True) as callbacks:
+                tmdb.write_movies(parsed)
+            return len(ctx), len(callbacks)
+
+        small = reimport(2)
+        with mock.patch.object(tmdb, 'MAX_ACTORS', 20):
+            large = reimport(20)
+        # (.delete() 는 행을 pk 100개씩 지우므로 묶음의 출연진 행이 100개 미만인 범위에서 비교)
+        self.assertEqual(large, small)
+        # 배우 20명 + 감독 1명씩
+        self.assertEqual(MovieCast.objects.count(), 4 * 21)
+
+    def test_movie_delete_bumps_do_not_grow_with_cast(self):
+        def delete_callbacks(cast_size):
+            movie = Movie.objects.create(title=f'영화 {cast_size}', release_year=2019)
+            MovieCast.objects.bulk_create([
+                MovieCast(movie=movie, person=Person.objects.create(name=f'배우 {cast_size}-{i}'), role='actor')
+                for i in range(cast_size)
+            ])
+            with self.captureOnCommitCallbacks() as callbacks:
+                movie.delete()  # 출연진 행은 CASCADE
+            return len(callbacks)
+
+        self.assertEqual(delete_callbacks(20), delete_callbacks(0))
+
+
+# ─────────────────────────────────────────────
+# 키셋 페이지네이션: 동점 / NULL 이 많아도 빠짐·중복 없이, 깊이와 상관없이 페이지당 쿼리 1번
+# ─────────────────────────────────────────────
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        years = [2019, 2019, None, 2020, None, 2019, 2018, 2020, None, 2019, 2019, None, 2018]
+        self.movies = [Movie.objects.create(title=f'영화 {i}', release_year=year) for i, year in enumerate(years)]
+
+    def expected(self, ordering):
+        """NULL 은 방향과 상관없이 맨 뒤, 동점은 id 로 같은 방향"""
+        descending = ordering.startswith('-')
+        present = sorted(
+            (m for m in self.movies if m.release_year is not None),
+            key=lambda m: (m.release_year, m.pk), reverse=descending,
+        )
+        missing = sorted((m for m in self.movies if m.release_year is None), key=lambda m: m.pk, reverse=descending)
+        return [m.pk for m in present + missing]
+
+    def page(self, url):
+        """(id 목록, 다음 링크, 이전 링크, 쿼리 수)"""
+        paginator = MovieCursorPagination()
+        request = Request(RequestFactory().get(url))
+        with CaptureQueriesContext(connection) as ctx:
+            rows = paginator.paginate_queryset(Movie.objects.all(), request)
+        return [m.pk for m in rows], paginator.get_next_link(), paginator.get_previous_link(), len(ctx)
+
+    def test_walk_forward_and_back(self):
+        for ordering in ('-release_year', 'release_year'):
+            with self.subTest(ordering=ordering):
+                pages, url = [], f'/api/v1/movies/?ordering={ordering}&page_size=3'
+                while url:
+                    ids, url, previous, queries = self.page(url)
+                    pages.append((ids, previous))
+                    self.assertEqual(queries, 1)
+                self.assertEqual([pk for ids, _ in pages for pk in ids], self.expected(ordering))
+                self.assertIsNone(pages[0][1])
+
+                # 마지막 페이지의 previous 를 따라 거꾸로 → 같은 페이지들
+                back, url = [], pages[-1][1]
+                while url:
+                    ids, _, url, queries = self.page(url)
+                    back.append(ids)
+                    self.assertEqual(queries, 1)
+                self.assertEqual(back[::-1], [ids for ids, _ in pages[:-1]])
+
+    def test_malformed_cursor_is_bad_request(self):
+        def encode(data):
+            return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+
+        valid = {'o': '-release_year', 'v': 2019, 'id': self.movies[1].pk}
+        cursors = [
+            'bad',
+            '%%%',
+            encode([1, 2]),
+            encode({'o': '-release_year', 'v': {'a': 1}, 'id': 1}),
+            encode({'o': '-release_year', 'v': [2019], 'id': 1}),
+            encode({'o': '-release_year', 'v': 'abc', 'id': 1}),
+            encode({'o': '-release_year', 'v': 2019, 'id': 'x'}),
+            encode({**valid, 'o': '-popularity'}),
+        ]
+        client = APIClient()
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                res = client.get('/api/v1/movies/', {'ordering': '-release_year', 'cursor': cursor})
+                self.assertEqual(res.status_code, 400)
+                self.assertIn('detail', res.json())
+        res = client.get('/api/v1/movies/', {'ordering': '-release_year', 'cursor': encode(valid)})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(client.get(f'/api/v1/movies/{self.movies[0].pk}/reviews/', {'cursor': 'bad'}).status_code, 400)
+
+    def test_unsupported_ordering_is_bad_request(self):
+        res = APIClient().get('/api/v1/movies/', {'ordering': 'title'})
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.json(), {'detail': MovieCursorPagination.invalid_ordering_message})
+
+
+# ─────────────────────────────────────────────
+# 영화 상세: 출연진 수와 상관없이 쿼리 수 고정
+# (캐시/ETag 버전 조회 1번 + 영화 / 장르 / 출연진 3번)
+# ─────────────────────────────────────────────
+
+class MovieDetailQueryCountTests(TestCase):
+    def setUp(self):
+        movie_cache.get_cache().clear()
+        self.user = get_user_model().objects.create_user('viewer', password='pw')
+        self.client = APIClient()
+        genre = Genre.objects.create(name='드라마')
+        self.small = self.make_movie('출연진 1명', cast_size=1, genre=genre)
+        self.large = self.make_movie('출연진 30명', cast_size=30, genre=genre)
+
+    @staticmethod
+    def make_movie(title, cast_size, genre):
+        movie = Movie.objects.create(title=title)
+        MovieGenre.objects.create(movie=movie, genre=genre)
+        for i in range(cast_size):
+            person = Person.objects.create(name=f'{title} 배우 {i}')
+            MovieCast.objects.create(movie=movie, person=person, role='actor')
+        return movie
+
+    def test_anonymous_query_count_is_constant(self):
+        for movie in (self.small, self.large):
+            with self.assertNumQueries(4):
+                res = self.client.get(f'/api/v1/movies/{movie.id}/')
+            self.assertIsNone(res.data['user_score'])
+            self.assertFalse(res.data['is_in_watchlist'])
+        self.assertEqual(len(res.data['casts']), 30)
+
+    def test_user_fields_are_annotated(self):
+        save_rating(self.user, self.large.id, 4)
+        WatchList.objects.create(user=self.user, movie=self.large)
+        self.client.force_authenticate(self.user)
+
+        for movie in (self.small, self.large):
+            with self.assertNumQueries(4):
+                res = self.client.get(f'/api/v1/movies/{movie.id}/')
+
+        self.assertEqual(res.data['user_score'], 4.0)
+        self.assertTrue(res.data['is_in_watchlist'])
+        self.assertEqual(res.data['avg_score'], 4.0)
+        self.assertEqual(res.data['casts'][0]['person']['name'], '출연진 30명 배우 0')
+
+
+# ─────────────────────────────────────────────
+# 유사도 빌드: 증분 결과 = 전체 재계산 결과
+# ─────────────────────────────────────────────
+
+class SimilarityBuildTests(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.genres = [Genre.objects.create(name=f'장르{i}') for i in range(5)]
+        self.people = Person.objects.bulk_create([Person(name=f'배우{i}') for i in range(15)])
+        self.movies = [
+            Movie.objects.create(title=f'영화{i}', country=rng.choice(['KR', 'US', 'JP'])) for i in range(16)
+        ]
+        for movie in self.movies:
+            self.set_features(movie, rng)
+        # 평점 블록이 점수 동률(= top-k 경계에서 순서가 임의)을 없앤다
+        # (유저마다 일부 영화만 → 평점 하나가 바뀌어도 증분 경로로 계산될 만큼만 영향)
+        self.users = [get_user_model().objects.create_user(username=f'rater{i}') for i in range(10)]
+        Rating.objects.bulk_create([
+            Rating(user=user, movie=self.movies[index], score=Decimal(int(rng.integers(1, 11))) / 2)
+            for user in self.users for index in rng.choice(16, 6, replace=False)
+        ])
+
+    def set_features(self, movie, rng):
+        MovieGenre.objects.filter(movie=movie).delete()
+        MovieCast.objects.filter(movie=movie).delete()
+        for index in rng.choice(5, 2, replace=False):
+            MovieGenre.objects.create(movie=movie, genre=self.genres[index])
+        for index in rng.choice(15, 3, replace=False):
+            MovieCast.objects.create(movie=movie, person=self.people[index], role='actor')
+        movie.save()  # updated_at → 워터마크 이후 바뀐 영화
+
+    def stored(self):
+        lists = {}
+        for movie_id, similar_id, score in MovieSimilarity.objects.order_by('movie_id', 'rank').values_list(
+            'movie_id', 'similar_id', 'score',
+        ):
+            lists.setdefault(movie_id, []).append((similar_id, score))
+        return lists
+
+    def assert_same_lists(self, actual, expected):
+        self.assertEqual(actual.keys(), expected.keys())
+        for movie_id, neighbors in expected.items():
+            self.assertEqual([i for i, _ in actual[movie_id]], [i for i, _ in neighbors], movie_id)
+            np.testing.assert_allclose([s for _, s in actual[movie_id]], [s for _, s in neighbors], rtol=1e-5)
+
+    def assert_incremental_matches_full(self):
+        messages = []
+        self.assertGreater(similarity.build_similarity(top_k=3, log=messages.append), 0)
+        self.assertTrue(messages[-1].startswith('증분 계산'), messages[-1])
+        incremental = self.stored()
+        similarity.build_similarity(full=True, top_k=3)
+        self.assert_same_lists(incremental, self.stored())
+
+    def test_incremental_matches_full(self):
+        self.assertEqual(similarity.build_similarity(full=True, top_k=3), 16)
+        rng = np.random.default_rng(8)
+        for movie in self.movies[:3]:
+            self.set_features(movie, rng)
+        self.assert_incremental_matches_full()
+
+    def test_cast_row_edit_outside_import(self):
+        similarity.build_similarity(full=True, top_k=3)
+        # admin 에서 출연진 한 줄만 고친 것처럼 (Movie 는 저장하지 않음)
+        cast = MovieCast.objects.filter(movie=self.movies[0]).first()
+        cast.person = next(person for person in self.people if not self.movies[0].casts.filter(person=person))
+        cast.save()
+        MovieGenre.objects.filter(movie=self.movies[1]).first().delete()
+        self.assert_incremental_matches_full()
+
+    def test_rating_delete_and_new_rating(self):
+        similarity.build_similarity(full=True, top_k=3)
+        # 평점 삭제: 그 영화 + 유저 평균이 바뀌어 그 유저가 평점 준 다른 영화들도
+        Rating.objects.filter(user=self.users[0]).first().delete()
+        self.assert_incremental_matches_full()
+
+        # 새 평점: 그 유저가 평점 준 다른 영화들의 평점 벡터도 바뀜
+        unrated = Movie.objects.exclude(ratings__user=self.users[1]).first()
+        save_rating(self.users[1], unrated.id, Decimal('0.5'))
+        self.assert_incremental_matches_full()
+
+    def test_missing_watermark_builds_everything(self):
+        self.assertIsNone(JobState.get_watermark(similarity.JOB_NAME))
+        self.assertEqual(similarity.build_similarity(top_k=3), 16)
+        first = self.stored()
+        self.assertIsNotNone(JobState.get_watermark(similarity.JOB_NAME))
+        # 워터마크 이후 바뀐 게 없으면 아무것도 다시 쓰지 않음
+        self.assertEqual(similarity.build_similarity(top_k=3), 0)
+
+        JobState.objects.filter(name=similarity.JOB_NAME).delete()
+        self.assertEqual(similarity.build_similarity(top_k=3), 16)
+        self.assert_same_lists(self.stored(), first)
+
+
+# ─────────────────────────────────────────────
+# 검색: FTS5 / python 역색인 둘 다 같은 결과
+# ─────────────────────────────────────────────
+
+class MovieSearchTests(TestCase):
+    def setUp(self):
+        # python 색인 / 응답 캐시는 프로세스 전역이라 테스트마다 새로
+        search._backends.pop('python', None)
+        movie_cache.get_cache().clear()
+        self.parasite = Movie.objects.create(
+            title='기생충', original_title='Parasite', overview='전원 백수인 기택네 가족 이야기',
+        )
+        self.mother = Movie.objects.create(
+            title='마더', original_title='Mother', overview='기생하듯 살아가는 모자',
+        )
+        director = Person.objects.create(name='봉준호')
+        for movie in (self.parasite, self.mother):
+            MovieCast.objects.create(movie=movie, person=director, role='director')
+        search.index_movies([self.parasite.id, self.mother.id])
+
+    def search(self, q):
+        res = self.client.get('/api/v1/movies/search/', {'q': q})
+        self.assertEqual(res.status_code, 200)
+        return [item['id'] for item in res.json()]
+
+    def check_backend(self):
+        # 제목이 줄거리보다 위, 접두어(자동완성), 출연진 이름, 여러 단어는 AND
+        self.assertEqual(self.search('기생'), [self.parasite.id, self.mother.id])
+        self.assertEqual(self.search('paras'), [self.parasite.id])
+        self.assertEqual(set(self.search('봉준')), {self.parasite.id, self.mother.id})
+        self.assertEqual(self.search('봉준호 마더'), [self.mother.id])
+        self.assertEqual(self.search(''), [])
+
+        # 제목이 바뀌면 색인도 바로
+        self.mother.title = '마더 (리마스터)'
+        self.mother.save()
+        self.assertEqual(self.search('리마'), [self.mother.id])
+        self.mother.delete()
+        self.assertEqual(self.search('봉준호'), [self.parasite.id])
+
+    def test_fts5_backend(self):
+        self.assertEqual(search.get_backend().name, 'fts5')
+        self.check_backend()
+
+    @override_settings(MOVIE_SEARCH_BACKEND='python')
+    def test_python_backend(self):
+        self.assertEqual(search.get_backend().name, 'python')
+        self.check_backend()
+
+    @override_settings(MOVIE_SEARCH_BACKEND='python')
+    def test_python_search_does_not_wait_for_updates(self):
+        backend = search.get_backend()
+        self.assertEqual(self.search('기생'), [self.parasite.id, self.mother.id])
+        before = backend.index_data
+
+        # 색인을 고치는 중(lock 을 잡고 있는 동안)에도 검색은 바로 끝난다
+        # (스레드는 테스트 트랜잭션 밖의 DB 연결이라 워터마크 확인은 빼고)
+        results = []
+        with backend.lock, mock.patch.object(backend, '_sync'):
+            reader = threading.Thread(target=lambda: results.append(backend.search(['기생충'], 10)))
+            reader.start()
+            reader.join(timeout=5)
+        self.assertEqual(results, [[self.parasite.id]])
+
+        # 갱신은 새 색인으로 바꿔 끼움 → 이미 읽던 색인은 그대로
+        self.parasite.title = '기생충 (흑백판)'
+        self.parasite.save()
+        self.assertIsNot(backend.index_data, before)
+        self.assertEqual(before.search(['흑백판'], 10), [])
+        self.assertEqual(backend.search(['흑백판'], 10), [self.parasite.id])
+
+    @override_settings(MOVIE_SEARCH_BACKEND='python')
+    def test_python_sync_drops_movies_deleted_elsewhere(self):
+        # 다른 프로세스의 색인: 이미 로드된 상태
+        other = search.PythonBackend()
+        self.assertEqual(other.search(['봉준호'], 10), [self.parasite.id, self.mother.id])
+
+        # 이 프로세스에서 삭제 → 워터마크가 올라감
+        self.mother.delete()
+        self.assertEqual(other.search(['봉준호'], 10), [self.parasite.id])
+        self.assertEqual(len(other.index_data), 1)
+
+
+# ─────────────────────────────────────────────
+# 응답 캐시 / ETag: 바뀐 데이터에 걸린 버전만 올라감, 유저 필드는 캐시 밖에서
+# (버전은 커밋 직후에 올리므로 쓰기는 captureOnCommitCallbacks 로 감싼다)
+# ─────────────────────────────────────────────
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        movie_cache.get_cache().clear()
+        self.user = get_user_model().objects.create_user('viewer', password='pw')
+        self.client = APIClient()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.first = Movie.objects.create(title='첫 번째', release_year=2001)
+            self.second = Movie.objects.create(title='두 번째', release_year=2002)
+
+    def rate(self, movie, score):
+        with self.captureOnCommitCallbacks(execute=True):
+            save_rating(self.user, movie.id, score)
+
+    def test_detail_is_cached_until_the_movie_changes(self):
+        url = f'/api/v1/movies/{self.first.id}/'
+        self.client.get(url)
+        self.client.get(f'/api/v1/movies/{self.second.id}/')
+        with self.assertNumQueries(1):
+            self.client.get(url)
+
+        self.rate(self.first, 4)
+        with self.assertNumQueries(4):
+            res = self.client.get(url)
+        self.assertEqual(res.data['avg_score'], 4.0)
+        with self.assertNumQueries(1):
+            self.client.get(f'/api/v1/movies/{self.second.id}/')
+
+    def test_user_fields_are_merged_after_cache_hit(self):
+        url = f'/api/v1/movies/{self.first.id}/'
+        self.rate(self.first, 3)
+        self.client.get(url)
+
+        self.client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            WatchList.objects.create(user=self.user, movie=self.first)
+        with self.assertNumQueries(2):
+            res = self.client.get(url)
+        self.assertEqual(res.data['user_score'], 3.0)
+        self.assertTrue(res.data['is_in_watchlist'])
+        self.assertEqual(list(res.data)[-2:], ['user_score', 'is_in_watchlist'])
+
+    def test_list_refetches_only_changed_cards(self):
+        self.client.get('/api/v1/movies/')
+        with self.assertNumQueries(2):
+            self.client.get('/api/v1/movies/')
+
+        # 평점: 최신순 목록의 순서는 그대로 → 바뀐 카드 하나만 다시
+        self.rate(self.second, 5)
+        with self.assertNumQueries(3):
+            res = self.client.get('/api/v1/movies/')
+        self.assertEqual(
+            [(m['id'], m['avg_score']) for m in res.data['results']],
+            [(self.second.id, 5.0), (self.first.id, None)],
+        )
+
+        # 새 영화: 목록 순서가 바뀜
+        with self.captureOnCommitCallbacks(execute=True):
+            third = Movie.objects.create(title='세 번째')
+        res = self.client.get('/api/v1/movies/')
+        self.assertEqual(res.data['results'][0]['id'], third.id)
+
+    def assert_revalidates(self, url, change):
+        """같은 버전이면 직렬화 없이 304, 데이터가 바뀌면 새 ETag 로 200"""
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        etag = res['ETag']
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn('Last-Modified', res)
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.content, b'')
+        self.assertEqual(res['ETag'], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res['ETag'], etag)
+        return res
+
+    def test_conditional_get(self):
+        self.client.force_authenticate(self.user)
+        review = Review.objects.create(movie=self.first, author='익명', content='좋아요')
+
+        self.assert_revalidates(
+            f'/api/v1/movies/{self.first.id}/',
+            lambda: save_rating(self.user, self.first.id, 2),
+        )
+        self.assert_revalidates(
+            '/api/v1/movies/?ordering=-avg_score',
+            lambda: save_rating(self.user, self.second.id, 5),
+        )
+        res = self.assert_revalidates(
+            f'/api/v1/movies/{self.first.id}/reviews/',
+            lambda: toggle_review_like(self.user, review.id),
+        )
+        self.assertTrue(res.data['results'][0]['is_liked'])
+        self.assert_revalidates(
+            '/api/v1/watchlist/me/',
+            lambda: WatchList.objects.create(user=self.user, movie=self.second),
+        )
+
+    def test_not_modified_skips_serialization(self):
+        url = f'/api/v1/movies/{self.first.id}/'
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1):
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+
+
+# ─────────────────────────────────────────────
+# Movie.latest_review: 어디서 만들든/지우든 최신 리뷰를 가리킴
+# ─────────────────────────────────────────────
+
+class LatestReviewTests(TestCase):
+    def setUp(self):
+        self.movie = Movie.objects.create(title='기생충', release_year=2019)
+
+    def latest(self):
+        return Movie.objects.values_list('latest_review_id', flat=True).get(pk=self.movie.pk)
+
+    def test_create_delete_and_repoint(self):
+        res = APIClient().post(
+            f'/api/v1/movies/{self.movie.id}/reviews/', {'author': '첫 리뷰', 'content': '좋아요'}, format='json',
+        )
+        self.assertEqual(res.status_code, 201)
+        first = res.json()['id']
+        self.assertEqual(self.latest(), first)
+
+        # 뷰 밖(admin / shell)에서 만든 리뷰도
+        second = Review.objects.create(movie=self.movie, content='두 번째')
+        self.assertEqual(self.latest(), second.pk)
+
+        # 최신이 아닌 리뷰를 지우면 그대로, 최신을 지우면 그 전 리뷰로
+        third = Review.objects.create(movie=self.movie, content='세 번째')
+        second.delete()
+        self.assertEqual(self.latest(), third.pk)
+        third.delete()
+        self.assertEqual(self.latest(), first)
+        Review.objects.filter(pk=first).delete()
+        self.assertIsNone(self.latest())
+
+
+# ─────────────────────────────────────────────
+# 평점 / 워치리스트 일괄 저장: 영화 수와 상관없이 쿼리 수 고정, 집계는 같은 트랜잭션
+# ─────────────────────────────────────────────
+
+class BulkEndpointTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('newbie', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.movies = Movie.objects.bulk_create([Movie(title=f'영화 {i}') for i in range(50)])
+
+    def post_ratings(self, scores):
+        return self.client.post('/api/v1/ratings/bulk/', {
+            'items': [{'movie': movie.id, 'score': score} for movie, score in scores],
+        }, format='json')
+
+    def test_bulk_ratings_update_aggregates(self):
+        save_rating(self.user, self.movies[0].id, 1)
+        other = get_user_model().objects.create_user('other', password='pw')
+        save_rating(other, self.movies[0].id, 5)
+
+        res = self.post_ratings([(self.movies[0], 3), (self.movies[1], 4.5), (self.movies[1], 4)])
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data, {'created': 1, 'updated': 1})
+
+        first, second = Movie.objects.filter(id__in=[self.movies[0].id, self.movies[1].id]).order_by('id')
+        self.assertEqual((first.rating_count, first.rating_avg), (2, 4.0))
+        self.assertEqual(first.rating_histogram, {'3.0': 1, '5.0': 1})
+        self.assertEqual((second.rating_count, second.rating_avg), (1, 4.0))
+
+    def test_bulk_query_count_is_constant(self):
+        with CaptureQueriesContext(connection) as few:
+            self.post_ratings([(movie, 4) for movie in self.movies[:5]])
+        with CaptureQueriesContext(connection) as many:
+            self.post_ratings([(movie, 3) for movie in self.movies])
+        self.assertEqual(len(few), len(many))
+        self.assertEqual(Movie.objects.filter(rating_count=1, rating_avg=3.0).count(), 50)
+
+        with CaptureQueriesContext(connection) as few:
+            self.client.post('/api/v1/watchlist/bulk/', {
+                'items': [{'movie': movie.id} for movie in self.movies[:5]],
+            }, format='json')
+        with CaptureQueriesContext(connection) as many:
+            res = self.client.post('/api/v1/watchlist/bulk/', {
+                'items': [{'movie': movie.id, 'status': 'DONE'} for movie in self.movies],
+            }, format='json')
+        self.assertEqual(len(few), len(many))
+        self.assertEqual(res.data, {'created': 45, 'updated': 5})
+        self.assertEqual(WatchList.objects.filter(user=self.user, status='DONE').count(), 50)
+
+    def test_unknown_movie_rejects_whole_batch(self):
+        res = self.post_ratings([(self.movies[0], 4)] + [(Movie(id=999999), 4)])
+        self.assertEqual(res.status_code, 400)
+        self.assertIn('999999', str(res.data['items']))
+        self.assertFalse(Rating.objects.exists())
+
+
+# ─────────────────────────────────────────────
+# 평점 집계: 증분 경로(저장 / 수정 / 삭제 / 유저 삭제) = rebuild_rating_stats
+# ─────────────────────────────────────────────
+
+class RatingAggregateTests(TestCase):
+    FIELDS = ('id', 'rating_count', 'rating_sum', 'rating_avg', 'rating_histogram')
+
+    def setUp(self):
+        User = get_user_model()
+        self.movies = Movie.objects.bulk_create([Movie(title=f'영화 {i}') for i in range(6)])
+        self.users = [User.objects.create_user(username=f'rater{i}') for i in range(5)]
+
+    def aggregates(self):
+        return list(Movie.objects.order_by('id').values(*self.FIELDS))
+
+    def assert_matches_rebuild(self):
+        incremental = self.aggregates()
+        rebuild_rating_stats()
+        self.assertEqual(incremental, self.aggregates())
+
+    def test_incremental_matches_rebuild(self):
+        rng = np.random.default_rng(3)
+        for user in self.users:
+            for movie in self.movies[:4]:
+                save_rating(user, movie.id, Decimal(int(rng.integers(1, 11))) / 2)
+            # 일부는 수정, 일부는 새로
+            save_ratings(user, {movie.id: Decimal(int(rng.integers(1, 11))) / 2 for movie in self.movies[2:]})
+        self.assert_matches_rebuild()
+
+        # 평점 한 개 삭제 (admin 등)
+        Rating.objects.filter(user=self.users[0], movie=self.movies[0]).get().delete()
+        self.assertEqual(Movie.objects.get(pk=self.movies[0].pk).rating_count, 4)
+        self.assert_matches_rebuild()
+
+        # 유저 삭제 → 평점 CASCADE
+        self.users[1].delete()
+        self.users[2].delete()
+        self.assertEqual(Movie.objects.get(pk=self.movies[5].pk).rating_count, 3)
+        self.assert_matches_rebuild()
+
+        # 전부 지우면 0 / 빈 히스토그램
+        get_user_model().objects.all().delete()
+        self.assertEqual(
+            set(Movie.objects.values_list('rating_count', 'rating_sum', 'rating_avg')), {(0, Decimal(0), 0)},
+        )
+        self.assertEqual(list(Movie.objects.values_list('rating_histogram', flat=True)), [{}] * len(self.movies))
+
+    def test_user_delete_query_count_does_not_grow_with_ratings(self):
+        few, many = self.users[:2]
+        save_ratings(few, {movie.id: 4 for movie in self.movies[:1]})
+        save_ratings(many, {movie.id: 4 for movie in self.movies})
+        with CaptureQueriesContext(connection) as ctx_few:
+            few.delete()
+        with CaptureQueriesContext(connection) as ctx_many:
+            many.delete()
+        self.assertEqual(len(ctx_few), len(ctx_many))
+        self.assertFalse(Movie.objects.exclude(rating_count=0).exists())
+
+
+# ─────────────────────────────────────────────
+# 리뷰 좋아요: 토글마다 like_count ±1, 어긋나면 reconcile_like_counts
+# ─────────────────────────────────────────────
+
+class ReviewLikeTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user, self.other = User.objects.create_user(username='fan'), User.objects.create_user(username='critic')
+        self.review = Review.objects.create(movie=Movie.objects.create(title='기생충'), content='좋아요')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def like_count(self):
+        return Review.objects.values_list('like_count', flat=True).get(pk=self.review.pk)
+
+    def test_toggle(self):
+        self.assertEqual(toggle_review_like(self.user, self.review.pk), (True, 1))
+        self.assertEqual(toggle_review_like(self.other, self.review.pk), (True, 2))
+        self.assertEqual(toggle_review_like(self.user, self.review.pk), (False, 1))
+        self.assertEqual(toggle_review_like(self.user, self.review.pk), (True, 2))
+
+        res = self.client.post(f'/api/v1/reviews/{self.review.pk}/like/')
+        self.assertEqual(res.json(), {'liked': False, 'like_count': 1})
+        self.assertEqual(self.like_count(), LikeReview.objects.filter(review=self.review).count())
+        self.assertEqual(self.client.post('/api/v1/reviews/999999/like/').status_code, 404)
+
+    def test_reconcile_fixes_drifted_count(self):
+        toggle_review_like(self.user, self.review.pk)
+        Review.objects.filter(pk=self.review.pk).update(like_count=7)
+
+        self.assertEqual(reconcile_like_counts(), 1)
+        self.assertEqual(self.like_count(), 1)
+        self.assertEqual(reconcile_like_counts(), 0)
+
+    def test_review_deleted_while_toggling(self):
+        def delete_review(sender, instance, **kwargs):
+            # 좋아요 행을 넣은 직후 다른 요청이 리뷰를 지운 것처럼
+            Review.objects.filter(pk=instance.review_id).delete()
+
+        post_save.connect(delete_review, sender=LikeReview)
+        self.addCleanup(post_save.disconnect, delete_review, sender=LikeReview)
+
+        self.assertIsNone(toggle_review_like(self.other, self.review.pk))
+        review = Review.objects.create(movie=self.review.movie, content='두 번째')
+        self.assertEqual(self.client.post(f'/api/v1/reviews/{review.pk}/like/').status_code, 404)
+
+
+# ─────────────────────────────────────────────
+# 내 상태 일괄 조회: 영화 수와 상관없이 쿼리 2번
+# ─────────────────────────────────────────────
+
+class MyMovieStateTests(TestCase):
+    def test_state_for_many_movies(self):
+        user = get_user_model().objects.create_user('viewer', password='pw')
+        movies = Movie.objects.bulk_create([Movie(title=f'영화 {i}') for i in range(40)])
+        save_rating(user, movies[0].id, 4.5)
+        WatchList.objects.create(user=user, movie=movies[0], status='DONE')
+        WatchList.objects.create(user=user, movie=movies[1])
+        reviews = Review.objects.bulk_create([
+            Review(movie=movies[2], content='a'), Review(movie=movies[2], content='b'),
+        ])
+        for review in reviews:
+            toggle_review_like(user, review.id)
+
+        client = APIClient()
+        client.force_authenticate(user)
+        ids = ','.join(str(movie.id) for movie in movies)
+        with self.assertNumQueries(2):
+            res = client.get('/api/v1/me/state/', {'ids': ids})
+
+        self.assertEqual(res.json(), {
+            str(movies[0].id): {'score': 4.5, 'status': 'DONE'},
+            str(movies[1].id): {'status': 'WANT'},
+            str(movies[2].id): {'liked_reviews': 2},
+        })
+        self.assertEqual(client.get('/api/v1/me/state/', {'ids': 'x'}).status_code, 400)
+
+
+# ─────────────────────────────────────────────
+# 상호작용 내보내기 (명령 / 관리자 스트리밍 엔드포인트)
+# ─────────────────────────────────────────────
+
+class InteractionExportTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('rater', password='pw')
+        self.movies = Movie.objects.bulk_create([Movie(title=f'영화 {i}') for i in range(3)])
+        save_rating(self.user, self.movies[0].id, 4.5)
+        WatchList.objects.create(user=self.user, movie=self.movies[1], status='DONE')
+        review = Review.objects.create(movie=self.movies[2], content='좋아요')
+        toggle_review_like(self.user, review.id)
+
+    def export(self, *args):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'out'
+            call_command('export_interactions', *args, '--output', str(path), stdout=StringIO())
+            return path.read_bytes()
+
+    def test_formats(self):
+        m0, m1, m2 = (movie.id for movie in self.movies)
+        uid = self.user.id
+        rows = self.export('--format', 'csv', '--chunk-size', '1').decode().splitlines()
+        self.assertEqual(rows[0], 'kind,user_id,movie_id,value,timestamp')
+        self.assertEqual([row.rsplit(',', 1)[0] for row in rows[1:]], [
+            f'rating,{uid},{m0},4.5', f'watchlist,{uid},{m1},DONE', f'like,{uid},{m2},1',
+        ])
+
+        lines = [json.loads(line) for line in self.export('--format', 'jsonl').splitlines()]
+        self.assertEqual([(r['kind'], r['movie_id'], r['value']) for r in lines], [
+            ('rating', m0, 4.5), ('watchlist', m1, 'DONE'), ('like', m2, 1),
+        ])
+
+        with np.load(io.BytesIO(self.export('--format', 'npz'))) as data:
+            self.assertEqual(data['rating_movie_id'].tolist(), [m0])
+            self.assertEqual(data['rating_value'].tolist(), [4.5])
+            self.assertEqual(data['watchlist_value_labels'][data['watchlist_value']].tolist(), ['DONE'])
+            self.assertEqual(data['like_timestamp'].dtype, np.dtype('datetime64[us]'))
+
+    def test_incremental_watermark(self):
+        self.export('--incremental')
+        self.assertIsNotNone(JobState.get_watermark('export_interactions'))
+        save_rating(self.user, self.movies[1].id, 3.0)
+
+        rows = self.export('--incremental', '--kinds', 'rating').decode().splitlines()
+        self.assertEqual(len(rows), 2)
+        self.assertIn(f',{self.movies[1].id},3.0,', rows[1])
+
+    def test_streaming_endpoint_is_admin_only(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get('/api/v1/export/interactions/').status_code, 403)
+
+        admin = get_user_model().objects.create_superuser('admin', password='pw')
+        client.force_authenticate(admin)
+        res = client.get('/api/v1/export/interactions/', {'type': 'jsonl', 'kinds': 'like'})
+        self.assertTrue(res.streaming)
+        self.assertIn('X-Export-Until', res)
+        body = b''.join(res.streaming_content).decode()
+        self.assertEqual(json.loads(body)['movie_id'], self.movies[2].id)
+        self.assertEqual(client.get('/api/v1/export/interactions/', {'type': 'xml'}).status_code, 400)
+
+
+# ─────────────────────────────────────────────
+# 랭킹: 트렌딩(시간 감쇠) / 베이즈 평균
+# ─────────────────────────────────────────────
+
+class RankingTests(TestCase):
+    def setUp(self):
+        movie_cache.get_cache().clear()
+        User = get_user_model()
+        self.users = User.objects.bulk_create([User(username=f'u{i}') for i in range(20)])
+        self.fresh, self.stale, self.quiet = Movie.objects.bulk_create([
+            Movie(title='요즘 화제작', popularity=1),
+            Movie(title='한물간 영화', popularity=2),
+            Movie(title='조용한 영화', popularity=3),
+        ])
+        # 화제작: 평점 1개(5점)가 방금. 한물간 영화: 평점 20개(4.5점)가 20일 전, 조용한 영화: 2.5점 20개가 22일 전
+        save_rating(self.users[0], self.fresh.id, 5.0)
+        for user in self.users:
+            save_rating(user, self.stale.id, 4.5)
+            save_rating(user, self.quiet.id, 2.5)
+        now = timezone.now()
+        Rating.objects.filter(movie=self.stale).update(updated_at=now - timedelta(days=20))
+        Rating.objects.filter(movie=self.quiet).update(updated_at=now - timedelta(days=22))
+
+    def ids(self, url):
+        return [movie['id'] for movie in self.client.get(url).json()['results']]
+
+    def test_trending_and_top_rated(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ranking.update_rankings()
+
+        self.assertEqual(self.ids('/api/v1/movies/trending/'), [self.fresh.id, self.stale.id, self.quiet.id])
+        # 평점 1개짜리 5점보다 평점 20개짜리 4.5점이 위
+        self.assertEqual(self.ids('/api/v1/movies/top-rated/'), [self.stale.id, self.fresh.id, self.quiet.id])
+        self.assertEqual(self.client.get('/api/v1/movies/trending/?ordering=-id').status_code, 400)
+
+        # 유사도 계산 전 영화의 비슷한 영화: 트렌딩 순, 모자라면 TMDB popularity 순
+        similar = [movie['id'] for movie in self.client.get(f'/api/v1/movies/{self.quiet.id}/similar/').json()]
+        self.assertEqual(similar, [self.fresh.id, self.stale.id])
+
+    def test_incremental_update_touches_only_active_movies(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ranking.update_rankings()
+        stale_score = Movie.objects.get(id=self.stale.id).trending_score
+
+        review = Review.objects.create(movie=self.quiet, content='숨은 명작')
+        for user in self.users[:5]:
+            toggle_review_like(user, review.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(ranking.update_trending(), 1)
+
+        self.assertEqual(Movie.objects.get(id=self.stale.id).trending_score, stale_score)
+        self.assertEqual(self.ids('/api/v1/movies/trending/')[0], self.quiet.id)
+
+    def test_rebase_without_events_refreshes_cached_list(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ranking.update_rankings()
+        self.assertEqual(self.ids('/api/v1/movies/trending/'), [self.fresh.id, self.stale.id, self.quiet.id])
+
+        # 이벤트 없이 기준 시각만 옮겨짐 → 오래된 두 편은 0 이 되어 목록에서 빠진다
+        later = timezone.now() + ranking.get_half_life() * (ranking.WINDOW_HALF_LIVES + 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(ranking.update_trending(now=later), 0)
+        self.assertEqual(self.ids('/api/v1/movies/trending/'), [self.fresh.id])
+
+
+# ─────────────────────────────────────────────
+# 목록 필터 + 패싯 카운트 (비트맵 색인)
+# ─────────────────────────────────────────────
+
+class MovieFacetTests(TestCase):
+    def setUp(self):
+        movie_cache.get_cache().clear()
+        facets._index = None
+        drama, comedy, thriller = Genre.objects.bulk_create([
+            Genre(name='드라마'), Genre(name='코미디'), Genre(name='스릴러'),
+        ])
+        self.genres = {'drama': drama.id, 'comedy': comedy.id, 'thriller': thriller.id}
+        director = Person.objects.create(name='봉준호')
+        self.director = director.id
+        specs = [
+            # 제목, 나라, 연도, 상영 시간, 장르, 감독 여부
+            ('살인의 추억', 'KR', 2003, 131, [drama, thriller], True),
+            ('기생충', 'KR', 2019, 132, [drama, comedy], True),
+            ('극한직업', 'KR', 2019, 111, [comedy], False),
+            ('조디악', 'US', 2007, 157, [thriller], False),
+            ('리틀 미스 선샤인', 'US', 2006, 101, [comedy, drama], False),
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.movies = {}
+            for title, country, year, runtime, genres, directed in specs:
+                movie = Movie.objects.create(
+                    title=title, country=country, release_year=year, runtime=runtime,
+                )
+                self.movies[title] = movie.id
+                for genre in genres:
+                    MovieGenre.objects.create(movie=movie, genre=genre)
+                if directed:
+                    MovieCast.objects.create(movie=movie, person=director, role='director')
+
+    def get(self, **params):
+        res = self.client.get('/api/v1/movies/', params)
+        self.assertEqual(res.status_code, 200, res.content)
+        return res.json()
+
+    def titles(self, data):
+        ids = {movie_id: title for title, movie_id in self.movies.items()}
+        return [ids[movie['id']] for movie in data['results']]
+
+    def test_filters_and_counts(self):
+        data = self.get(country='KR', genre=self.genres['drama'])
+        self.assertEqual(self.titles(data), ['기생충', '살인의 추억'])
+        self.assertEqual(data['count'], 2)
+        # 장르 패싯은 장르 필터를 빼고(한국 영화 3편) 센다
+        genre_counts = {item['name']: item['count'] for item in data['facets']['genre']}
+        self.assertEqual(genre_counts, {'코미디': 2, '드라마': 2, '스릴러': 1})
+        self.assertEqual(
+            {item['value']: item['count'] for item in data['facets']['country']}, {'KR': 2, 'US': 1},
+        )
+        self.assertEqual(data['facets']['decade'], [{'value': 2000, 'count': 1}, {'value': 2010, 'count': 1}])
+
+        data = self.get(year_min=2005, runtime_max=140, ordering='release_year')
+        self.assertEqual(self.titles(data), ['리틀 미스 선샤인', '기생충', '극한직업'])
+        self.assertEqual(
+            [(item['value'], item['count']) for item in data['facets']['runtime']],
+            [('90~120', 2), ('120~150', 1), ('150~', 1)],
+        )
+
+        data = self.get(person=self.director, role='director', page_size=1)
+        self.assertEqual((data['count'], self.titles(data)), (2, ['기생충']))
+        # 다음 페이지에는 패싯 없이 결과만
+        page = self.client.get(data['next']).json()
+        self.assertEqual(self.titles(page), ['살인의 추억'])
+        self.assertNotIn('facets', page)
+
+        self.assertEqual(self.client.get('/api/v1/movies/', {'year_min': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/movies/', {'role': 'director'}).status_code, 400)
+
+    def test_sql_path_and_index_refresh(self):
+        # 결과가 많을 때의 SQL 조건(EXISTS) 경로도 같은 결과
+        with mock.patch.object(facets, 'MAX_ID_FILTER', 0):
+            data = self.get(genre=f"{self.genres['thriller']},{self.genres['comedy']}", country='US')
+        self.assertEqual(self.titles(data), ['리틀 미스 선샤인', '조디악'])
+
+        # 장르가 바뀌면 facets 버전이 올라가서 색인과 필터된 페이지가 다시 만들어진다
+        self.get(genre=self.genres['thriller'])
+        with self.captureOnCommitCallbacks(execute=True):
+            MovieGenre.objects.create(movie_id=self.movies['극한직업'], genre_id=self.genres['thriller'])
+        data = self.get(genre=self.genres['thriller'])
+        self.assertEqual(self.titles(data), ['조디악', '극한직업', '살인의 추억'])
+        self.assertEqual(data['count'], 3)
+
+
+# ─────────────────────────────────────────────
+# 인물 페이지 / 필모그래피: 출연 수와 상관없이 쿼리 1~2번
+# ─────────────────────────────────────────────
+
+class PersonEndpointTests(TestCase):
+    def setUp(self):
+        self.person = Person.objects.create(name='클린트 이스트우드')
+        self.movies = Movie.objects.bulk_create([
+            Movie(
+                title=f'영화 {i}', release_year=1970 + i,
+                rating_count=i % 3, rating_avg=(i % 5) + 0.5 if i % 3 else 0,
+            )
+            for i in range(30)
+        ])
+        MovieCast.objects.bulk_create(
+            [MovieCast(movie=movie, person=self.person, role='actor', character_name=f'역 {i}')
+             for i, movie in enumerate(self.movies)]
+            + [MovieCast(movie=movie, person=self.person, role='director') for movie in self.movies[::3]]
+        )
+
+    def test_person_detail(self):
+        with self.assertNumQueries(2):
+            data = self.client.get(f'/api/v1/persons/{self.person.id}/').json()
+        self.assertEqual(data['name'], '클린트 이스트우드')
+        self.assertEqual(data['credits'], {'actor': 30, 'director': 10})
+        self.assertEqual(self.client.get('/api/v1/persons/0/').status_code, 404)
+
+    def test_filmography(self):
+        url = f'/api/v1/persons/{self.person.id}/movies/'
+        with self.assertNumQueries(1):
+            data = self.client.get(url).json()
+        self.assertEqual(len(data), 30)
+        newest = data[0]
+        self.assertEqual(newest['id'], self.movies[-1].id)
+        self.assertEqual(newest['roles'], [{'role': 'actor', 'character_name': '역 29'}])
+        # 감독 겸 배우인 영화는 한 번만, 역할 두 개
+        self.assertEqual(
+            sorted(role['role'] for role in data[-1]['roles']), ['actor', 'director'],
+        )
+
+        directed = self.client.get(url, {'role': 'director', 'ordering': 'year'}).json()
+        self.assertEqual([movie['id'] for movie in directed], [movie.id for movie in self.movies[::3]])
+
+        # 평점순: 평점 없는 영화(None)는 맨 뒤
+        scores = [movie['avg_score'] for movie in self.client.get(url, {'ordering': '-rating'}).json()]
+        rated = [score for score in scores if score is not None]
+        self.assertEqual(scores, sorted(rated, reverse=True) + [None] * (30 - len(rated)))
+
+        self.assertEqual(self.client.get(url, {'role': 'writer'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/persons/0/movies/').status_code, 404)
+
+
+# ─────────────────────────────────────────────
+# 읽기 복제본 라우터: 카탈로그 뷰의 읽기만 복제본으로
+# ─────────────────────────────────────────────
+
+@override_settings(DATABASE_REPLICAS=['replica_0'])
+class ReplicaRouterTests(TestCase):
+    def test_only_marked_reads_go_to_replica(self):
+        router = routers.ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Movie))
+        with routers.replica_reads():
+            self.assertEqual(router.db_for_read(Movie), 'replica_0')
+            self.assertEqual(router.db_for_write(Movie), 'default')
+        self.assertFalse(router.allow_migrate('replica_0', 'movies'))
+
+        seen = []
+
+        def fake_search(q, limit):
+            seen.append(router.db_for_read(Movie))
+            return []
+
+        with mock.patch('movies.views.search_movie_ids', fake_search):
+            self.client.get('/api/v1/movies/search/', {'q': '기생충'})
+        self.assertEqual(seen, ['replica_0'])
+        # 요청이 끝나면 원래대로
+        self.assertIsNone(router.db_for_read(Movie))
+
+
+# ─────────────────────────────────────────────
+# 벤치마크: 모든 엔드포인트의 요청당 쿼리 수가 예산(bench_budgets.json) 안
+# (on_commit 캐시 버전 갱신까지 요청 안에서 세도록 TransactionTestCase)
+# ─────────────────────────────────────────────
+
+class BenchmarkSuiteTests(TransactionTestCase):
+    def setUp(self):
+        movie_cache.get_cache().clear()
+        facets._index = None
+
+    def tearDown(self):
+        facets._index = None
+
+    def test_every_endpoint_within_query_budget(self):
+        benchmark.seed_catalogue(
+            movies=60, people=40, casts_per_movie=4, users=12, ratings=300,
+            reviews=40, likes=60, watchlist=40,
+        )
+        fixtures = benchmark.find_fixtures()
+        endpoints = benchmark.build_endpoints(fixtures)
+
+        # movies/urls.py 의 URL 이 빠짐없이 들어 있어야 한다
+        covered = {resolve(endpoint.path.split('?')[0]).route for endpoint in endpoints}
+        self.assertEqual(covered, {'api/v1/' + str(pattern.pattern) for pattern in urlpatterns})
+
+        results = benchmark.run_client(endpoints, benchmark.auth_tokens(fixtures), requests=2, host='testserver')
+        self.assertEqual(benchmark.check_budgets(results, benchmark.load_budgets(), latency=False), [])
+        self.assertEqual(set(results), set(benchmark.load_budgets()))
+
+
+# ─────────────────────────────────────────────
+# 프로파일링 미들웨어: Server-Timing / 히스토그램 / N+1 / cProfile 표본
+# ─────────────────────────────────────────────
+
+PROFILED_MIDDLEWARE = [
+    'movies.profiling.ProfilingMiddleware',
+    *(name for name in settings.MIDDLEWARE if name != 'movies.profiling.ProfilingMiddleware'),
+]
+
+
+@override_settings(MIDDLEWARE=PROFILED_MIDDLEWARE, PROFILING_SAMPLE_RATE=1.0, PROFILING_CPROFILE_RATE=0)
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        profiling.install()
+        profiling.reset_metrics()
+        movie_cache.get_cache().clear()
+        for i in range(3):
+            Movie.objects.create(title=f'영화{i}')
+
+    @staticmethod
+    def timings(response):
+        """Server-Timing → {이름: {dur, desc}}"""
+        parsed = {}
+        for part in response['Server-Timing'].split(', '):
+            name, *params = part.split(';')
+            parsed[name] = dict(param.split('=', 1) for param in params)
+        return parsed
+
+    def test_server_timing_and_metrics(self):
+        with CaptureQueriesContext(connection) as captured:
+            res = self.client.get('/api/v1/movies/')
+        self.assertEqual(res.status_code, 200)
+
+        timings = self.timings(res)
+        self.assertEqual(timings['sql']['desc'], f'"{len(captured.captured_queries)} queries"')
+        for name in ('total', 'serialize', 'render'):
+            self.assertGreaterEqual(float(timings[name]['dur']), 0)
+
+        text = profiling.render_metrics()
+        self.assertIn('movies_request_duration_seconds_count{view="api/v1/movies/",method="GET"} 1', text)
+        self.assertIn(
+            f'movies_request_sql_queries_sum{{view="api/v1/movies/",method="GET"}} {len(captured.captured_queries)}',
+            text,
+        )
+        self.assertIn('movies_request_phase_seconds_bucket{view="api/v1/movies/",method="GET",phase="render",le="+Inf"} 1', text)
+
+    @override_settings(PROFILING_SAMPLE_RATE=0)
+    def test_unsampled_requests_untouched(self):
+        res = self.client.get('/api/v1/movies/')
+        self.assertNotIn('Server-Timing', res)
+        self.assertNotIn('movies_request_duration_seconds_count', profiling.render_metrics())
+
+    def test_detects_n_plus_one_and_duplicates(self):
+        profile = profiling.RequestProfile()
+        ids = list(Movie.objects.values_list('id', flat=True))
+        with connection.execute_wrapper(profile.record_query):
+            for movie_id in ids * 2:
+                Movie.objects.filter(pk=movie_id).first()
+            Movie.objects.filter(pk__in=ids[:1]).count()
+            Movie.objects.filter(pk__in=ids).count()
+
+        self.assertEqual(profile.query_count, 8)
+        self.assertEqual(len(profile.duplicates()), 3)
+        [(shape, n)] = profile.n_plus_one(threshold=3)
+        self.assertEqual(n, 3)
+        # IN (...) 길이만 다른 쿼리는 같은 모양
+        self.assertEqual(len(profile.shapes), 2)
+        self.assertIn('dup;desc="3 duplicate queries"', profile.server_timing())
+
+    @override_settings(PROFILING_SAMPLE_RATE=0, PROFILING_CPROFILE_RATE=1.0, PROFILING_KEEP=2)
+    def test_cprofile_dumps_per_view(self):
+        with tempfile.TemporaryDirectory() as tmp, self.settings(PROFILING_DIR=Path(tmp)):
+            for _ in range(3):
+                self.client.get('/api/v1/movies/')
+            dumps = list(Path(tmp, 'api_v1_movies').glob('*.prof'))
+        self.assertEqual(len(dumps), 2)
+
+    def test_metrics_endpoint_access(self):
+        factory = RequestFactory()
+        self.assertEqual(profiling.metrics_view(factory.get('/metrics', REMOTE_ADDR='10.0.0.1')).status_code, 403)
+        res = profiling.metrics_view(factory.get('/metrics'))
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res['Content-Type'].startswith('text/plain; version=0.0.4'))
+        with self.settings(PROFILING_METRICS_TOKEN='secret'):
+            self.assertEqual(profiling.metrics_view(factory.get('/metrics')).status_code, 403)
+            request = factory.get('/metrics', HTTP_AUTHORIZATION='Bearer secret', REMOTE_ADDR='10.0.0.1')
+            self.assertEqual(profiling.metrics_view(request).status_code, 200)
+
+
+class FastPathTests(TestCase):
+    """values() 행 직렬화 + orjson 렌더링이 DRF serializer + JSONRenderer 와 바이트까지 같은지"""
+
+    def setUp(self):
+        movie_cache.get_cache().clear()
+        self.user = get_user_model().objects.create_user(username='fast', password='pw')
+        self.movies = [
+            Movie.objects.create(
+                title='기생충 "Parasite" ', poster_url='https://img/a.jpg', release_year=2019,
+                country='KR', runtime=132, rating_count=3, rating_avg=13 / 3,
+            ),
+            Movie.objects.create(title='No poster \\   é', rating_count=0, rating_avg=0),
+            Movie.objects.create(title='1e5 tiny', release_year=1999, rating_count=1, rating_avg=1e-05),
+        ]
+        for i, movie in enumerate(self.movies):
+            WatchList.objects.create(user=self.user, movie=movie, status=('WANT', 'DONE')[i % 2])
+        WatchList.objects.filter(movie=self.movies[0]).update(
+            created_at=timezone.now().replace(microsecond=123456),
+        )
+        save_rating(self.user, self.movies[0].id, Decimal('4.5'))
+
+    def assertSameBytes(self, data, expected):
+        drf = JSONRenderer().render(expected)
+        self.assertEqual(FastJSONRenderer().render(data), drf)
+        with mock.patch.object(fastpath, 'orjson', None):
+            self.assertEqual(FastJSONRenderer().render(data), drf)
+
+    def test_row_serializers_match_drf(self):
+        movies = Movie.objects.order_by('id')
+        entries = with_user_score(WatchList.objects.select_related('movie').order_by('id'), self.user)
+        for rows, serializer_class, queryset in (
+            (fastpath.MOVIE_LIST_ROWS, MovieListSerializer, movies),
+            (fastpath.MOVIE_ROWS, MovieSerializer, movies),
+            (fastpath.WATCHLIST_ITEM_ROWS, WatchListItemSerializer, entries),
+        ):
+            with self.subTest(serializer=serializer_class.__name__):
+                expected = serializer_class(queryset, many=True).data
+                self.assertSameBytes(rows.serialize_many(queryset.values(*rows.columns)), expected)
+                self.assertSameBytes(rows.serialize_objects(queryset), expected)
+
+        entries = with_user_score(WatchList.objects.select_related('movie').order_by('id'), self.user)
+        with timezone.override('Asia/Seoul'):
+            rows = fastpath.WATCHLIST_ITEM_ROWS
+            expected = WatchListItemSerializer(entries, many=True).data
+            self.assertIn('+09:00', expected[0]['created_at'])
+            self.assertSameBytes(rows.serialize_many(entries.values(*rows.columns)), expected)
+
+    def test_renderer_edge_values_match_drf(self):
+        data = {
+            'floats': [0.1 + 0.2, 3.0, 1e16, 2.5e-7, -1e-05, 1.2345678901234568e+18],
+            'big': 2 ** 70,
+            'when': timezone.now(),
+            'text': '   "quoted" \\ \n 한글',
+            'nested': [{'none': None, 'flag': True}],
+        }
+        self.assertSameBytes(data, data)
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_endpoints_match_drf(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        res = client.get('/api/v1/watchlist/me/')
+        self.assertEqual(res.status_code, 200)
+        entries = with_user_score(WatchList.objects.filter(user=self.user), self.user).order_by('-created_at', '-id')
+        self.assertEqual(res.content, JSONRenderer().render({
+            'next': None,
+            'previous': None,
+            'results': WatchListItemSerializer(entries.select_related('movie'), many=True).data,
+            'counts': {'WANT': 2, 'DONE': 1, 'DROP': 0},
+        }))
+
+        res = client.get('/api/v1/movies/?ordering=-id')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()['results'], MovieListSerializer(Movie.objects.order_by('-id'), many=True).data)
+
+
+class MyWatchListTests(TestCase):
+    def setUp(self):
+        movie_cache.get_cache().clear()
+        self.user = get_user_model().objects.create_user(username='watcher', password='pw')
+        other = get_user_model().objects.create_user(username='other', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        statuses = ['WANT'] * 5 + ['DONE'] * 3 + ['DROP']
+        base = timezone.now()
+        self.movies = []
+        for i, status_ in enumerate(statuses):
+            movie = Movie.objects.create(title=f'영화{i}')
+            entry = WatchList.objects.create(user=self.user, movie=movie, status=status_)
+            WatchList.objects.filter(pk=entry.pk).update(created_at=base + timedelta(minutes=i))
+            WatchList.objects.create(user=other, movie=movie, status='DONE')
+            self.movies.append(movie)
+        save_rating(self.user, self.movies[4].id, Decimal('3.5'))
+        save_rating(other, self.movies[3].id, Decimal('1.0'))
+
+    def test_status_filter_pagination_and_counts(self):
+        res = self.client.get('/api/v1/watchlist/me/?status=WANT&page_size=3')
+        self.assertEqual(res.status_code, 200)
+        data = res.json()
+        self.assertEqual(data['counts'], {'WANT': 5, 'DONE': 3, 'DROP': 1})
+        self.assertEqual([item['movie']['title'] for item in data['results']], ['영화4', '영화3', '영화2'])
+        self.assertEqual([item['user_score'] for item in data['results']], [3.5, None, None])
+        self.assertIsNone(data['previous'])
+
+        res = self.client.get(data['next'])
+        data = res.json()
+        self.assertNotIn('counts', data)
+        self.assertEqual([item['movie']['title'] for item in data['results']], ['영화1', '영화0'])
+        self.assertIsNone(data['next'])
+
+        res = self.client.get('/api/v1/watchlist/me/')
+        self.assertEqual([item['status'] for item in res.json()['results']], ['DROP'] + ['DONE'] * 3 + ['WANT'] * 5)
+
+    def test_invalid_status(self):
+        res = self.client.get('/api/v1/watchlist/me/?status=LATER')
+        self.assertEqual(res.status_code, 400)
+
+    def test_query_count_independent_of_page_size(self):
+        for page_size in (2, 9):
+            with self.subTest(page_size=page_size), self.assertNumQueries(4):
+                # 버전, 페이지 행(+평점 조인), 페이지 영화 버전, 상태별 개수
+                self.client.get(f'/api/v1/watchlist/me/?page_size={page_size}')
+
+    def test_status_change_invalidates_etag(self):
+        res = self.client.get('/api/v1/watchlist/me/?status=DONE')
+        self.assertEqual(
+            self.client.get('/api/v1/watchlist/me/?status=DONE', HTTP_IF_NONE_MATCH=res['ETag']).status_code, 304,
+        )
+        self.client.post(f'/api/v1/movies/{self.movies[0].id}/watchlist-toggle/', {'status': 'DONE'}, format='json')
+        res = self.client.get('/api/v1/watchlist/me/?status=DONE', HTTP_IF_NONE_MATCH=res['ETag'])
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()['counts']['DONE'], 4)
+
+
+# ─────────────────────────────────────────────
+# 개인화 추천: ALS 학습 → 버전 디렉터리 저장 → 서빙
+# ─────────────────────────────────────────────
+
+class RecommenderTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        model_dir = override_settings(RECOMMEND_MODEL_DIR=Path(tempfile.mkdtemp()))
+        model_dir.enable()
+        self.addCleanup(model_dir.disable)
+        self.addCleanup(setattr, recommend, '_model', None)
+        recommend._model = None
+
+        # 0~3 / 4~7 두 묶음을 각각 좋아하는 유저들
+        self.movies = [Movie.objects.create(title=f'영화{i}', popularity=i) for i in range(8)]
+        self.users = [User.objects.create_user(username=f'user{i}') for i in range(6)]
+        for i, user in enumerate(self.users):
+            liked = range(4) if i < 3 else range(4, 8)
+            self.rate(user, {index: '5' for index in liked if index != i % 4 + (0 if i < 3 else 4)})
+        self.me = User.objects.create_user(username='me')
+        self.rate(self.me, {0: '5', 1: '4.5'})
+        WatchList.objects.create(user=self.me, movie=self.movies[2], status='WANT')
+
+    def rate(self, user, scores):
+        for index, score in scores.items():
+            save_rating(user, self.movies[index].id, Decimal(score))
+
+    def train(self, **kwargs):
+        factors = recommend.train_als(factors=4, iterations=10, **kwargs)
+        return recommend.save_model(*factors)
+
+    def ids(self, movies):
+        return [self.movies.index(movie) for movie in movies]
+
+    def test_trained_user_gets_recommendations(self):
+        self.train()
+        recommended = self.ids(recommend.recommend_for_user(self.me, limit=3))
+        # 평점 준 0, 1 과 워치리스트의 2 는 빠지고, 같은 묶음의 3 이 먼저
+        self.assertEqual(len(recommended), 3)
+        self.assertEqual(recommended[0], 3)
+        self.assertFalse({0, 1, 2} & set(recommended))
+
+    def test_unknown_user_falls_back_to_popular(self):
+        stranger = get_user_model().objects.create_user(username='stranger')
+        WatchList.objects.create(user=stranger, movie=self.movies[7], status='WANT')
+        # 모델이 아직 없을 때
+        self.assertEqual(self.ids(recommend.recommend_for_user(stranger, limit=3)), [6, 5, 4])
+        # 모델은 있지만 학습 뒤에 들어온 유저
+        self.train()
+        newcomer = get_user_model().objects.create_user(username='newcomer')
+        self.assertEqual(self.ids(recommend.recommend_for_user(newcomer, limit=3)), [7, 6, 5])
+
+    def test_reload_after_retrain(self):
+        self.train()
+        model = recommend.get_model()
+        newcomer = get_user_model().objects.create_user(username='newcomer')
+        self.rate(newcomer, {4: '5', 5: '5'})
+        self.assertIsNone(model.recommend(newcomer.pk))
+
+        self.train()
+        self.train()
+        reloaded = recommend.get_model()
+        self.assertIsNot(reloaded, model)
+        self.assertEqual(reloaded.meta['users'], len(self.users) + 2)
+        self.assertIn(self.ids(recommend.recommend_for_user(newcomer, limit=1))[0], {6, 7})
+        # 현재 + 바로 전 버전만 남는다
+        versions = sorted(path.name for path in (recommend.get_model_dir() / 'versions').iterdir())
+        self.assertEqual(len(versions), recommend.KEEP_VERSIONS)
+        self.assertEqual(versions[-1], reloaded.meta['version'])
+
+    def test_low_rating_is_a_stronger_dislike(self):
+        # 같은 대접을 받는 0 / 1 에 0.5점 / 2.5점 → 0.5점 쪽 점수가 더 낮아야
+        self.rate(self.me, {0: '0.5', 1: '2.5', 3: '5'})
+        self.train()
+        model = recommend.get_model()
+        scores = model.item_factors @ model.user_factors[model.user_row(self.me.pk)]
+        row = {movie_id: pos for pos, movie_id in enumerate(model.item_ids.tolist())}
+        self.assertLess(scores[row[self.movies[0].id]], scores[row[self.movies[1].id]])
+
+
+class UserSimilarityTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.movies = [Movie.objects.create(title=f'영화{i}') for i in range(6)]
+        self.me, self.twin, self.opposite, self.cousin = (
+            User.objects.create_user(username=name, password='pw') for name in ('me', 'twin', 'opposite', 'cousin')
+        )
+        self.rate(self.me, {0: '5', 1: '4', 2: '1'})
+        self.rate(self.twin, {0: '5', 1: '4.5', 2: '1.5', 3: '5', 4: '4'})
+        self.rate(self.cousin, {0: '4.5', 1: '5', 2: '1', 3: '4.5', 5: '2'})
+        self.rate(self.opposite, {0: '1', 1: '1.5', 2: '5', 4: '5'})
+
+    def rate(self, user, scores):
+        for index, score in scores.items():
+            save_rating(user, self.movies[index].id, Decimal(score))
+
+    def stored(self):
+        return {
+            user_id: (ids.tolist(), scores.tolist())
+            for user_id, *packed in UserNeighbors.objects.values_list('user_id', 'neighbor_ids', 'scores')
+            for ids, scores in [user_similarity.unpack(*packed)]
+        }
+
+    def test_mean_centered_neighbors(self):
+        user_similarity.build_user_similarity(full=True)
+        neighbor_ids, scores = user_similarity.get_neighbors(self.me.pk)
+        self.assertEqual(sorted(neighbor_ids.tolist()), sorted([self.twin.pk, self.cousin.pk]))
+        self.assertTrue((scores > 0).all() and (scores <= 1).all())
+        # 평점 성향이 반대인 유저는 이웃이 아님
+        self.assertNotIn(self.opposite.pk, neighbor_ids.tolist())
+
+    def test_incremental_matches_full(self):
+        user_similarity.build_user_similarity(full=True, top_k=2)
+        self.rate(self.opposite, {0: '5', 1: '4', 2: '1'})
+        self.rate(self.twin, {5: '5'})
+        written = user_similarity.build_user_similarity(top_k=2)
+        self.assertGreater(written, 0)
+        incremental = self.stored()
+        user_similarity.build_user_similarity(full=True, top_k=2)
+        full = self.stored()
+        self.assertEqual(incremental.keys(), full.keys())
+        for user_id, (ids, scores) in full.items():
+            self.assertEqual(incremental[user_id][0], ids)
+            np.testing.assert_allclose(incremental[user_id][1], scores, rtol=1e-5)
+
+    def test_feed(self):
+        client = APIClient()
+        self.assertEqual(client.get('/api/v1/feed/me/').status_code, 401)
+        client.force_authenticate(self.me)
+        self.assertEqual(client.get('/api/v1/feed/me/').json(), [])
+
+        user_similarity.build_user_similarity(full=True)
+        res = client.get('/api/v1/feed/me/')
+        self.assertEqual([(m['id'], m['liked_by']) for m in res.json()], [(self.movies[3].id, 2)])
+
+        with override_settings(FEED_MIN_NEIGHBORS=1):
+            res = client.get('/api/v1/feed/me/')
+            self.assertEqual([m['id'] for m in res.json()], [self.movies[3].id, self.movies[4].id])
+            # 워치리스트에 넣은 영화는 빠진다
+            WatchList.objects.create(user=self.me, movie=self.movies[3])
+            res = client.get('/api/v1/feed/me/')
+            self.assertEqual([m['id'] for m in res.json()], [self.movies[4].id])
+
+
+# ─────────────────────────────────────────────
+# ASGI async 뷰: sync 뷰와 같은 응답 (ASYNC_VIEWS=1 일 때 쓰는 경로)
+# ─────────────────────────────────────────────
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        movie_cache.get_cache().clear()
+        self.user = get_user_model().objects.create_user(username='async', password='pw')
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.user)}'}
+        drama = Genre.objects.create(name='드라마')
+        director = Person.objects.create(name='봉준호')
+        self.movies = []
+        for i in range(5):
+            movie = Movie.objects.create(
+                title=f'영화{i}', release_year=2000 + i % 2, country='KR', runtime=100 + i, popularity=i, trending_score=i,
+            )
+            MovieGenre.objects.create(movie=movie, genre=drama)
+            MovieCast.objects.create(movie=movie, person=director, role='director')
+            self.movies.append(movie)
+        movie = self.movies[0]
+        save_rating(self.user, movie.id, Decimal('4.5'))
+        WatchList.objects.create(user=self.user, movie=movie, status='WANT')
+        WatchList.objects.create(user=self.user, movie=self.movies[1], status='DONE')
+        reviews = [Review.objects.create(movie=movie, author=f'작성자{i}', content='좋아요') for i in range(3)]
+        LikeReview.objects.create(user=self.user, review=reviews[1])
+
+    def get_async(self, path, **extra):
+        request = RequestFactory().get(path, **extra)
+        match = resolve(path.split('?')[0].removeprefix('/api/v1'), 'movies.async_views')
+        return async_to_sync(match.func)(request, *match.args, **match.kwargs)
+
+    def paths(self):
+        movie_id = self.movies[0].id
+        return [
+            '/api/v1/movies/?page_size=2',
+            '/api/v1/movies/?ordering=-release_year&genre=1,2&country=kr',
+            '/api/v1/movies/trending/',
+            f'/api/v1/movies/{movie_id}/',
+            f'/api/v1/movies/{movie_id}/reviews/?page_size=2',
+            f'/api/v1/movies/{movie_id}/similar/',
+            '/api/v1/watchlist/me/?status=WANT',
+            '/api/v1/movies/?cursor=bad',
+            '/api/v1/movies/999999/',
+            '/api/v1/watchlist/me/?status=LATER',
+        ]
+
+    def test_same_response_as_sync_views(self):
+        for extra in ({}, self.auth):
+            for path in self.paths():
+                with self.subTest(path=path, authenticated=bool(extra)):
+                    # 캐시 미스(빌드)와 캐시 히트 모두 sync 뷰와 같은 바이트
+                    movie_cache.get_cache().clear()
+                    cold = self.get_async(path, **extra)
+                    movie_cache.get_cache().clear()
+                    expected = self.client.get(path, **extra)
+                    warm = self.get_async(path, **extra)
+                    for res in (cold, warm):
+                        self.assertEqual(res.status_code, expected.status_code)
+                        self.assertEqual(res.content, expected.content)
+                        self.assertEqual(res.get('ETag'), expected.get('ETag'))
+                        self.assertEqual(res['Content-Type'], expected['Content-Type'])
+                    if 'ETag' in expected:
+                        res = self.get_async(path, HTTP_IF_NONE_MATCH=expected['ETag'], **extra)
+                        self.assertEqual(res.status_code, 304)
+
+    def test_user_fields_and_auth_errors(self):
+        movie_id = self.movies[0].id
+        data = json.loads(self.get_async(f'/api/v1/movies/{movie_id}/', **self.auth).content)
+        self.assertEqual((data['user_score'], data['is_in_watchlist']), (4.5, True))
+        self.assertEqual([cast['person']['name'] for cast in data['casts']], ['봉준호'])
+        reviews = json.loads(self.get_async(f'/api/v1/movies/{movie_id}/reviews/', **self.auth).content)
+        self.assertEqual([review['is_liked'] for review in reviews['results']], [False, True, False])
+
+        res = self.get_async(f'/api/v1/movies/{movie_id}/', HTTP_AUTHORIZATION='Bearer not-a-token')
+        expected = self.client.get(f'/api/v1/movies/{movie_id}/', HTTP_AUTHORIZATION='Bearer not-a-token')
+        self.assertEqual(res.status_code, 401)
+        self.assertEqual(res.content, expected.content)
+        self.assertEqual(res['WWW-Authenticate'], expected['WWW-Authenticate'])
+
+    def test_other_methods_go_to_drf_views(self):
+        movie_id = self.movies[0].id
+        request = RequestFactory().post(
+            f'/api/v1/movies/{movie_id}/reviews/', {'author': '새 리뷰', 'content': '내용'},
+            content_type='application/json',
+        )
+        res = async_to_sync(async_views.review_list)(request, movie_id=movie_id)
+        self.assertEqual(res.status_code, 201)
+        self.assertTrue(Review.objects.filter(movie_id=movie_id, author='새 리뷰').exists())
 
-# Create your tests here.
@@ -0,0 +1,256 @@
+# movies/tmdb.py
+"""
+TMDB 가져오기 (import_tmdb 명령에서 사용)
+
+- TMDBClient   : 하나의 requests.Session 으로 커넥션 재사용 + 429/5xx 재시도(Retry-After 준수)
+- parse_movie  : /movie/{id}?append_to_response=credits 응답 → 저장용 dict
+- write_movies : 한 묶음(페이지)을 트랜잭션 하나에서 저장
+                 Movie / Person 은 tmdb_id 유니크 인덱스 기준 upsert (bulk_create(update_conflicts=True))
+"""
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from . import cache as movie_cache
+from .models import Genre, Movie, MovieCast, MovieGenre, Person
+
+TMDB_API_BASE = "https://api.themoviedb.org/3"
+TMDB_IMAGE_BASE = "https://image.tmdb.org/t/p/w500"
+
+# 배우는 상위 몇 명만 저장
+MAX_ACTORS = 5
+
+MOVIE_FIELDS = (
+    "original_title", "overview", "runtime", "country", "poster_url", "popularity",
+)
+
+
+class TMDBClient:
+    def __init__(self, api_key=None, base_url=None, pool_size=8, retries=5, timeout=10):
+        self.api_key = api_key if api_key is not None else settings.TMDB_API_KEY
+        self.base_url = (base_url or getattr(settings, "TMDB_API_BASE", TMDB_API_BASE)).rstrip("/")
+        self.timeout = timeout
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self):
+        self.session.close()
+
+    def get(self, path, **params):
+        params = {"api_key": self.api_key, "language": "ko-KR", **params}
+        return self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+
+    def popular(self, page):
+        """인기 영화 한 페이지의 TMDB id 목록"""
+        res = self.get("/movie/popular", page=page)
+        res.raise_for_status()
+        return [result["id"] for result in res.json().get("results", [])]
+
+    def movie_detail(self, tmdb_id):
+        """영화 상세 + 크레딧. 실패하면 (None, status_code)"""
+        try:
+            res = self.get(f"/movie/{tmdb_id}", append_to_response="credits")
+        except requests.RequestException as e:
+            return None, str(e)
+        if res.status_code != 200:
+            return None, res.status_code
+        return res.json(), 200
+
+    def search(self, kind, query, **params):
+        """/search/movie, /search/person 결과 목록 (실패하면 빈 목록)"""
+        try:
+            res = self.get(f"/search/{kind}", query=query, **params)
+        except requests.RequestException:
+            return []
+        if res.status_code != 200:
+            return []
+        return res.json().get("results", [])
+
+
+def parse_movie(data, image_base=None):
+    image_base = image_base or getattr(settings, "TMDB_IMAGE_BASE", TMDB_IMAGE_BASE)
+
+    title = data.get("title") or data.get("original_title")
+    release_date = data.get("release_date")  # '2016-12-25'
+    countries = data.get("production_countries") or []
+    poster_path = data.get("poster_path")
+
+    credits = data.get("credits") or {}
+    people = []
+    # 감독: crew 에서 job == 'Director'
+    for crew in credits.get("crew") or []:
+        if crew.get("job") == "Director" and crew.get("id") and crew.get("name"):
+            people.append((crew["id"], crew["name"], "director", ""))
+    # 배우: 상위 몇 명만
+    for cast in (credits.get("cast") or [])[:MAX_ACTORS]:
+        if cast.get("id") and cast.get("name"):
+            people.append((cast["id"], cast["name"], "actor", cast.get("character") or ""))
+
+    return {
+        "tmdb_id": data.get("id"),
+        "title": title,
+        "release_year": int(release_date.split("-")[0]) if release_date else None,
+        "original_title": data.get("original_title") or title,
+        "overview": data.get("overview") or "",
+        "runtime": data.get("runtime"),
+        # country: 첫 번째 production_countries 기준
+        "country": countries[0]["iso_3166_1"] if countries else "",
+        "poster_url": image_base + poster_path if poster_path else "",
+        "popularity": data.get("popularity") or 0,
+        "genres": [g["name"] for g in data.get("genres") or [] if g.get("name")],
+        "people": people,
+    }
+
+
+def _get_or_create_genres(names):
+    """name 기준으로 한 번에 조회 + 없는 것만 bulk_create → {name: id}"""
+    names = set(names)
+    if not names:
+        return {}
+    found = dict(Genre.objects.filter(name__in=names).values_list("name", "id"))
+    missing = names - found.keys()
+    if missing:
+        Genre.objects.bulk_create([Genre(name=name) for name in missing], ignore_conflicts=True)
+        found.update(Genre.objects.filter(name__in=missing).values_list("name", "id"))
+    return found
+
+
+def _claim_legacy_rows(model, keys, candidates, row_key):
+    """
+    tmdb_id 컬럼이 생기기 전에 저장된 행(tmdb_id NULL)을 제목/이름으로 찾아 tmdb_id 를 채워 준다.
+    후보가 딱 하나일 때만 연결 (동명이인이면 새로 만든다). 이미 DB 에 있던 tmdb_id 집합 반환
+      keys       : {tmdb_id: 기존 행과 비교할 키}
+      candidates : 키 집합 → 후보 queryset
+      row_key    : 기존 행 → 키
+    """
+    known = set(model.objects.filter(tmdb_id__in=keys.keys()).values_list("tmdb_id", flat=True))
+    wanted = {}
+    for tmdb_id, key in keys.items():
+        if tmdb_id not in known:
+            wanted.setdefault(key, []).append(tmdb_id)
+    if not wanted:
+        return known
+
+    found = {}
+    for row in candidates(wanted.keys()).filter(tmdb_id__isnull=True):
+        found.setdefault(row_key(row), []).append(row)
+
+    claimed = []
+    for key, tmdb_ids in wanted.items():
+        rows = found.get(key, [])
+        if len(rows) == 1 and len(tmdb_ids) == 1:
+            rows[0].tmdb_id = tmdb_ids[0]
+            claimed.append(rows[0])
+    model.objects.bulk_update(claimed, ["tmdb_id"])
+    return known | {row.tmdb_id for row in claimed}
+
+
+def write_movies(parsed):
+    """
+    한 묶음의 영화를 트랜잭션 하나로 저장. (생성 수, 갱신 수, 저장된 Movie id 목록) 반환
+    영화 수와 상관없이 쿼리 수가 일정하고, 조회/충돌 판단은 전부 tmdb_id 유니크 인덱스로 한다.
+    """
+    # 같은 묶음에 같은 영화가 두 번 오면 마지막 것만
+    movies = {item["tmdb_id"]: item for item in parsed if item["tmdb_id"] and item["title"]}
+    if not movies:
+        return 0, 0, []
+
+    people = {}
+    for item in movies.values():
+        for person_tmdb_id, name, _, _ in item["people"]:
+            people[person_tmdb_id] = name
+
+    now = timezone.now()
+    with transaction.atomic():
+        # ── Movie: tmdb_id 기준 upsert (예전 데이터는 제목+연도로 한 번 연결)
+        known = _claim_legacy_rows(
+            Movie,
+            {tmdb_id: (item["title"], item["release_year"]) for tmdb_id, item in movies.items()},
+            candidates=lambda keys: Movie.objects.filter(title__in={title for title, _ in keys}),
+            row_key=lambda movie: (movie.title, movie.release_year),
+        )
+        Movie.objects.bulk_create(
+            [
+                Movie(
+                    tmdb_id=tmdb_id,
+                    title=item["title"],
+                    release_year=item["release_year"],
+                    updated_at=now,
+                    **{field: item[field] for field in MOVIE_FIELDS},
+                )
+                for tmdb_id, item in movies.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["tmdb_id"],
+            update_fields=["title", "release_year", *MOVIE_FIELDS, "updated_at"],
+        )
+        movie_ids = dict(
+            Movie.objects.filter(tmdb_id__in=movies.keys()).values_list("tmdb_id", "id")
+        )
+
+        # ── Person: tmdb_id 기준 upsert (예전 데이터는 이름이 유일할 때만 연결)
+        if people:
+            _claim_legacy_rows(
+                Person,
+                people,
+                candidates=lambda names: Person.objects.filter(name__in=names),
+                row_key=lambda person: person.name,
+            )
+            Person.objects.bulk_create(
+                [Person(tmdb_id=tmdb_id, name=name) for tmdb_id, name in people.items()],
+                update_conflicts=True,
+                unique_fields=["tmdb_id"],
+                update_fields=["name"],
+            )
+        person_ids = dict(
+            Person.objects.filter(tmdb_id__in=people.keys()).values_list("tmdb_id", "id")
+        )
+
+        genre_ids = _get_or_create_genres(
+            name for item in movies.values() for name in item["genres"]
+        )
+
+        # ── 연결 테이블: 묶음 전체를 지우고 다시 채우기
+        ids = list(movie_ids.values())
+        # (행마다 오는 post_delete 의 캐시 bump 는 건너뛰고 아래에서 묶음 단위로)
+        with movie_cache.batched_bumps():
+            MovieGenre.objects.filter(movie_id__in=ids).delete()
+            MovieCast.objects.filter(movie_id__in=ids).delete()
+
+        movie_genres, movie_casts = [], []
+        for tmdb_id, item in movies.items():
+            movie_id = movie_ids[tmdb_id]
+            for name in dict.fromkeys(item["genres"]):
+                movie_genres.append(MovieGenre(movie_id=movie_id, genre_id=genre_ids[name]))
+            seen = set()
+            for person_tmdb_id, _, role, character in item["people"]:
+                person_id = person_ids[person_tmdb_id]
+                if (person_id, role) in seen:
+                    continue
+                seen.add((person_id, role))
+                movie_casts.append(MovieCast(
+                    movie_id=movie_id, person_id=person_id, role=role, character_name=character[:100],
+                ))
+        MovieGenre.objects.bulk_create(movie_genres)
+        MovieCast.objects.bulk_create(movie_casts)
+
+        # bulk 쓰기는 시그널이 없으므로 응답 캐시 버전은 직접
+        movie_cache.bump_movies(ids)
+        movie_cache.bump('facets')
+
+    created = len(movies.keys() - known)
+    return created, len(movies) - created, ids
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
@@ -9,21 +10,35 @@ from .views import (
     ReviewListCreateAPIView, ReviewLikeToggleAPIView,
     WatchListToggleAPIView, SimilarMovieAPIView, MyWatchListAPIView,
     MovieListAPIView, MovieDetailAPIView, SimilarMovieAPIView,
-    RegisterAPIView, MeAPIView
+    RegisterAPIView, MeAPIView, RecommendationAPIView, MovieSearchAPIView,
+    RatingBulkAPIView, WatchListBulkAPIView, MyMovieStateAPIView,
+    InteractionExportAPIView, TrendingMovieListAPIView, TopRatedMovieListAPIView,
+    PersonDetailAPIView, PersonMovieListAPIView, FeedAPIView,
 )
 
 urlpatterns = [
     path('movies/', MovieListAPIView.as_view()),
+    path('movies/search/', MovieSearchAPIView.as_view()),
+    path('movies/trending/', TrendingMovieListAPIView.as_view()),
+    path('movies/top-rated/', TopRatedMovieListAPIView.as_view()),
     path('movies/<int:pk>/', MovieDetailAPIView.as_view()),
 
     # ⭐ 반드시 ratings로!
     path('movies/<int:movie_pk>/ratings/', RatingCreateUpdateAPIView.as_view()),
+    path('ratings/bulk/', RatingBulkAPIView.as_view()),
 
     path('movies/<int:movie_id>/reviews/', ReviewListCreateAPIView.as_view()),
     path('reviews/<int:review_pk>/like/', ReviewLikeToggleAPIView.as_view()),
     path('movies/<int:movie_pk>/watchlist-toggle/', WatchListToggleAPIView.as_view()),
     path('movies/<int:movie_id>/similar/', SimilarMovieAPIView.as_view()),
     path('watchlist/me/', MyWatchListAPIView.as_view()),
+    path('watchlist/bulk/', WatchListBulkAPIView.as_view()),
+    path('persons/<int:pk>/', PersonDetailAPIView.as_view()),
+    path('persons/<int:pk>/movies/', PersonMovieListAPIView.as_view()),
+    path('recommendations/me/', RecommendationAPIView.as_view()),
+    path('feed/me/', FeedAPIView.as_view()),
+    path('me/state/', MyMovieStateAPIView.as_view()),
+    path('export/interactions/', InteractionExportAPIView.as_view()),
 
     path('auth/register/', RegisterAPIView.as_view()),
     path('auth/login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
@@ -31,3 +46,7 @@ urlpatterns = [
     path('auth/me/', MeAPIView.as_view()),
 ]
 
+if settings.ASYNC_VIEWS:
+    # ASGI 로 띄울 때: 읽기 위주 엔드포인트의 GET 은 async 뷰가 먼저 받는다 (나머지 메서드는 위 뷰로)
+    from .async_views import urlpatterns as async_urlpatterns
+    urlpatterns = async_urlpatterns + urlpatterns
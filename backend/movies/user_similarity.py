@@ -0,0 +1,288 @@
+# movies/user_similarity.py
+"""
+유저-유저 협업 필터링 (오프라인 계산 → UserNeighbors 테이블, "나와 취향이 비슷한 사람들이 좋아한 영화" 피드)
+
+유저 한 명 = 희소 벡터 [영화별 평점]
+  pearson(기본): 유저 평균을 뺀 뒤 L2 정규화 → 두 벡터 내적 = 평균 중심화 코사인(피어슨 근사)
+  cosine       : 평점 그대로 L2 정규화
+  공동 평점이 적은 쌍은 우연히 높게 나오므로 n / (n + shrinkage) 를 곱한다 (n = 같이 평가한 영화 수)
+행 묶음 단위로 X[rows] @ X.T (희소 × 희소) → dense 로 펼쳐 유저마다 top-K 만 저장한다.
+
+증분 빌드 (기본):
+  마지막 빌드(JobState 'user_similarity') 이후 평점이 바뀐 유저 집합 C 에 대해
+  1) C 의 행은 전체 유저와 다시 계산
+  2) 나머지 유저는 기존 top-K 에서 C 항목을 빼고, 1) 에서 나온 점수(대칭이라 전치하면 그대로)만 합쳐서 다시 top-K
+     C 유저가 빠져 K 번째 점수가 예전보다 낮아진 유저는 top-K 밖 후보를 모르므로 그 행만 전체와 다시 계산
+  유저 벡터는 그 유저의 평점에만 달려 있어서 증분 결과가 전체 계산과 같다.
+  (--top-k / --metric / --shrinkage 를 바꿀 때는 --full)
+  (평점 삭제는 updated_at 으로 안 보이므로 가끔 --full 권장)
+"""
+import numpy as np
+from scipy import sparse
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import JobState, Rating, UserNeighbors
+from .similarity import get_chunk_rows, top_k_of, values_array
+
+JOB_NAME = 'user_similarity'
+METRICS = ('pearson', 'cosine')
+
+
+def get_top_k():
+    return getattr(settings, 'USER_SIMILARITY_TOP_K', 50)
+
+
+def get_metric():
+    return getattr(settings, 'USER_SIMILARITY_METRIC', 'pearson')
+
+
+def get_shrinkage():
+    return getattr(settings, 'USER_SIMILARITY_SHRINKAGE', 10)
+
+
+# ──────────────────────────────────────
+# 평점 행렬
+# ──────────────────────────────────────
+def build_rating_matrix(metric=None):
+    """
+    (유저 id 배열(오름차순), X, B) 반환
+      X: 유저 × 영화 (metric 에 따라 평균 중심화) 행 L2 정규화
+      B: 같은 모양의 평가 여부 (0/1) - B @ B.T 가 공동 평점 수
+    """
+    metric = metric or get_metric()
+    if metric not in METRICS:
+        raise ValueError(f'지원하지 않는 유사도입니다: {metric} ({", ".join(METRICS)})')
+
+    ratings = values_array(Rating.objects.all(), ['user_id', 'movie_id', 'score'], dtype=np.float64)
+    user_ids, rows = np.unique(ratings[:, 0].astype(np.int64), return_inverse=True)
+    _, cols = np.unique(ratings[:, 1].astype(np.int64), return_inverse=True)
+    shape = (len(user_ids), int(cols.max()) + 1 if len(cols) else 0)
+
+    values = ratings[:, 2]
+    if metric == 'pearson' and len(values):
+        means = np.bincount(rows, weights=values) / np.bincount(rows)
+        values = values - means[rows]
+
+    X = sparse.csr_matrix((values.astype(np.float32), (rows, cols)), shape=shape)
+    X.eliminate_zeros()
+    norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    X = (sparse.diags((1 / norms).astype(np.float32)) @ X).tocsr()
+    B = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=shape)
+    return user_ids, X, B
+
+
+def score_rows(X, B, XT, BT, rows, shrinkage):
+    """rows 유저들과 전체 유저의 유사도 (len(rows) × n, 자기 자신은 -inf)"""
+    scores = (X[rows] @ XT).toarray().astype(np.float32, copy=False)
+    if shrinkage > 0:
+        overlap = (B[rows] @ BT).toarray().astype(np.float32, copy=False)
+        scores *= overlap / (overlap + shrinkage)
+    scores[np.arange(len(rows)), rows] = -np.inf
+    return scores
+
+
+def iter_score_blocks(X, B, rows, shrinkage):
+    """rows 를 메모리 예산(SIMILARITY_CHUNK_CELLS)에 맞게 나눠 (행 묶음, 점수 블록) 을 yield"""
+    XT, BT = X.T.tocsc(), B.T.tocsc()
+    step = get_chunk_rows(X.shape[0])
+    for start in range(0, len(rows), step):
+        block_rows = np.asarray(rows[start:start + step])
+        yield block_rows, score_rows(X, B, XT, BT, block_rows, shrinkage)
+
+
+# ──────────────────────────────────────
+# 저장 (유저당 한 행, 배열은 바이트로)
+# ──────────────────────────────────────
+def pack(neighbor_ids, scores):
+    return (
+        np.asarray(neighbor_ids, dtype='<i4').tobytes(),
+        np.asarray(scores, dtype='<f4').tobytes(),
+    )
+
+
+def unpack(neighbor_ids, scores):
+    """(이웃 유저 id int64 배열, 유사도 float32 배열)"""
+    return (
+        np.frombuffer(bytes(neighbor_ids), dtype='<i4').astype(np.int64),
+        np.frombuffer(bytes(scores), dtype='<f4'),
+    )
+
+
+def write_neighbors(neighbor_lists, computed_at, batch_size=1000):
+    """neighbor_lists: [(user_id, 이웃 id 배열, 점수 배열), ...] → 유저 단위로 교체 (이웃이 없으면 행 삭제)"""
+    written = 0
+    batch_ids, objs = [], []
+
+    def flush():
+        with transaction.atomic():
+            UserNeighbors.objects.filter(user_id__in=batch_ids).delete()
+            UserNeighbors.objects.bulk_create(objs)
+
+    for user_id, neighbor_ids, scores in neighbor_lists:
+        batch_ids.append(user_id)
+        if len(neighbor_ids):
+            packed_ids, packed_scores = pack(neighbor_ids, scores)
+            objs.append(UserNeighbors(
+                user_id=user_id, neighbor_ids=packed_ids, scores=packed_scores, computed_at=computed_at,
+            ))
+        if len(batch_ids) >= batch_size:
+            flush()
+            written += len(batch_ids)
+            batch_ids, objs = [], []
+
+    if batch_ids:
+        flush()
+        written += len(batch_ids)
+    return written
+
+
+def load_neighbors(user_ids, k):
+    """저장된 top-k 를 (n × k) 위치/점수 배열로 (없는 칸, 평점이 없어진 이웃은 -inf)"""
+    n = len(user_ids)
+    idx = np.zeros((n, k), dtype=np.int64)
+    scores = np.full((n, k), -np.inf, dtype=np.float32)
+    for user_id, packed_ids, packed_scores in UserNeighbors.objects.values_list(
+        'user_id', 'neighbor_ids', 'scores',
+    ).iterator(chunk_size=2000):
+        row = np.searchsorted(user_ids, user_id)
+        if row >= n or user_ids[row] != user_id:
+            continue
+        neighbor_ids, neighbor_scores = unpack(packed_ids, packed_scores)
+        neighbor_ids, neighbor_scores = neighbor_ids[:k], neighbor_scores[:k]
+        pos = np.minimum(np.searchsorted(user_ids, neighbor_ids), n - 1)
+        valid = user_ids[pos] == neighbor_ids
+        count = int(valid.sum())
+        idx[row, :count] = pos[valid]
+        scores[row, :count] = neighbor_scores[valid]
+    return idx, scores
+
+
+def top_lists(user_ids, rows, top_idx, top_scores):
+    """(user_id, 이웃 id 배열, 점수 배열) - 점수 0 이하는 버린다"""
+    for row, idx, vals in zip(rows, top_idx, top_scores):
+        keep = vals > 0
+        yield int(user_ids[row]), user_ids[idx[keep]], vals[keep]
+
+
+def changed_user_ids(since):
+    """since 이후 평점을 남기거나 고친 유저 id"""
+    return set(Rating.objects.filter(updated_at__gt=since).values_list('user_id', flat=True).distinct())
+
+
+def build_user_similarity(full=False, user_ids=None, top_k=None, metric=None, shrinkage=None, log=None):
+    """
+    유저 유사도 빌드. 처리한(다시 쓴) 유저 수를 반환.
+      full=True     : 전체 다시 계산
+      user_ids=[..] : 지정한 유저를 바뀐 것으로 간주
+      기본          : JobState 워터마크 이후 평점이 바뀐 유저만 증분 계산
+    """
+    log = log or (lambda msg: None)
+    k = top_k or get_top_k()
+    shrinkage = get_shrinkage() if shrinkage is None else shrinkage
+    started = timezone.now()
+
+    all_ids, X, B = build_rating_matrix(metric)
+    n = len(all_ids)
+    log(f"평점 행렬: 유저 {n}명 × 영화 {X.shape[1]}편, 평점 {B.nnz}개")
+
+    watermark = JobState.get_watermark(JOB_NAME)
+    changed = set(user_ids or [])
+    if not full and watermark is not None:
+        changed |= changed_user_ids(watermark)
+    elif not user_ids:
+        full = True
+
+    if full or len(changed) * 2 >= n:
+        def all_lists():
+            for rows, scores in iter_score_blocks(X, B, np.arange(n), shrinkage):
+                yield from top_lists(all_ids, rows, *top_k_of(scores, k))
+
+        written = write_neighbors(all_lists(), started)
+        # 평점이 모두 없어진 유저
+        UserNeighbors.objects.filter(computed_at__lt=started).delete()
+        JobState.set_watermark(JOB_NAME, started)
+        log(f"전체 계산: 유저 {written}명")
+        return written
+
+    UserNeighbors.objects.filter(user__ratings__isnull=True).delete()
+    changed_rows = np.flatnonzero(np.isin(all_ids, list(changed)))
+    if not len(changed_rows):
+        JobState.set_watermark(JOB_NAME, started)
+        log("바뀐 유저 없음")
+        return 0
+
+    is_changed = np.zeros(n, dtype=bool)
+    is_changed[changed_rows] = True
+    best_idx, best_scores = load_neighbors(all_ids, k)
+    # 저장 안 된(top-k 밖) 유저의 점수는 모두 이 값 이하 (목록이 덜 찼으면 0 이하라 버려짐)
+    old_kth = best_scores[:, -1].copy()
+    had_changed = (is_changed[best_idx] & np.isfinite(best_scores)).any(axis=1)
+    best_scores[is_changed[best_idx]] = -np.inf
+
+    # 1) 바뀐 유저 행은 전체와 다시 계산, 2) 같은 블록을 전치해서 나머지 유저의 top-k 에 합치기
+    written = 0
+    for rows, scores in iter_score_blocks(X, B, changed_rows, shrinkage):
+        written += write_neighbors(top_lists(all_ids, rows, *top_k_of(scores, k)), started)
+        chunk_idx, chunk_scores = top_k_of(np.ascontiguousarray(scores.T), k)
+        merged_idx = np.hstack([best_idx, rows[chunk_idx]])
+        merged_scores = np.hstack([best_scores, chunk_scores])
+        order, best_scores = top_k_of(merged_scores, k)
+        best_idx = np.take_along_axis(merged_idx, order, axis=1)
+
+    # 바뀐 유저가 빠져서 k 번째 점수가 예전보다 낮아졌으면, top-k 밖이던 유저가 들어올 수 있으니 그 행만 전체 계산
+    recompute = ~is_changed & (best_scores[:, -1] < old_kth)
+    for rows, scores in iter_score_blocks(X, B, np.flatnonzero(recompute), shrinkage):
+        written += write_neighbors(top_lists(all_ids, rows, *top_k_of(scores, k)), started)
+
+    has_changed = (is_changed[best_idx] & (best_scores > 0)).any(axis=1)
+    rewrite = np.flatnonzero((had_changed | has_changed) & ~is_changed & ~recompute)
+    written += write_neighbors(top_lists(all_ids, rewrite, best_idx[rewrite], best_scores[rewrite]), started)
+    JobState.set_watermark(JOB_NAME, started)
+    log(f"증분 계산: 바뀐 유저 {len(changed_rows)}명, 다시 쓴 유저 {written}명")
+    return written
+
+
+# ──────────────────────────────────────
+# 피드
+# ──────────────────────────────────────
+def get_neighbors(user_id):
+    """저장된 (이웃 id 배열, 유사도 배열). 아직 계산 안 됐으면 빈 배열"""
+    row = UserNeighbors.objects.filter(user_id=user_id).values_list('neighbor_ids', 'scores').first()
+    if row is None:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    return unpack(*row)
+
+
+def feed_for_user(user, limit=20, min_score=None, min_neighbors=None):
+    """
+    이웃들이 min_score 이상 준 영화를 유사도 합(이웃들의 "좋아요" 가중 투표)으로 순위.
+    내가 평점을 줬거나 워치리스트에 넣은 영화는 제외. [(movie_id, 점수, 좋아한 이웃 수), ...]
+    """
+    min_score = getattr(settings, 'FEED_MIN_SCORE', 4.0) if min_score is None else min_score
+    min_neighbors = getattr(settings, 'FEED_MIN_NEIGHBORS', 2) if min_neighbors is None else min_neighbors
+    neighbor_ids, similarities = get_neighbors(user.pk)
+    if not len(neighbor_ids):
+        return []
+
+    liked = values_array(
+        Rating.objects.filter(user_id__in=neighbor_ids.tolist(), score__gte=min_score)
+        .exclude(movie_id__in=Rating.objects.filter(user=user).values('movie_id'))
+        .exclude(movie_id__in=user.watchlist.values('movie_id')),
+        ['user_id', 'movie_id'],
+    )
+    if not len(liked):
+        return []
+
+    order = np.argsort(neighbor_ids)
+    weights = similarities[order][np.searchsorted(neighbor_ids[order], liked[:, 0])]
+    movie_ids, movie_index = np.unique(liked[:, 1], return_inverse=True)
+    scores = np.bincount(movie_index, weights=weights)
+    counts = np.bincount(movie_index)
+
+    keep = np.flatnonzero(counts >= min_neighbors)
+    # 점수 내림차순, 같으면 좋아한 이웃 수, 영화 id 순
+    ranked = keep[np.lexsort((movie_ids[keep], -counts[keep], -scores[keep]))][:limit]
+    return [(int(movie_ids[i]), float(scores[i]), int(counts[i])) for i in ranked]
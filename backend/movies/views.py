@@ -1,16 +1,34 @@
 # movies/views.py
+from django.db import transaction
+from django.db.models import CharField, Count, Exists, F, FilteredRelation, OuterRef, Prefetch, Q, Subquery, Value
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
 from rest_framework import generics, status, permissions
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Movie, Rating, Review, WatchList, LikeReview
+from . import cache as movie_cache, export, facets
+from .aggregates import save_rating, save_ratings, toggle_review_like
+from .conditional import not_modified, set_validators
+from .fastpath import MOVIE_ROWS, WATCHLIST_ITEM_ROWS
+from .models import Movie, MovieCast, MovieSimilarity, Person, Rating, Review, WatchList, LikeReview
+from .pagination import (
+    MovieCursorPagination, ReviewCursorPagination, TopRatedCursorPagination, TrendingCursorPagination,
+    WatchListCursorPagination,
+)
+from .recommend import recommend_for_user
+from .routers import ReplicaReadMixin
+from .search import search_movie_ids
+from .user_similarity import feed_for_user
 from .serializers import (
     MovieListSerializer, MovieDetailSerializer,
     RatingSerializer, ReviewSerializer, WatchListSerializer,
     MovieSerializer, UserSerializer, UserRegisterSerializer, WatchListItemSerializer,
+    BulkRatingSerializer, BulkWatchListSerializer,
 )
 
 from django.utils.decorators import method_decorator
@@ -28,14 +46,182 @@ def get_dummy_user():
 # 영화 목록 / 상세
 # ─────────────────────────────────────────────
 
-class MovieListAPIView(generics.ListAPIView):
-    queryset = Movie.objects.all().order_by('-id')
+class MovieListAPIView(ReplicaReadMixin, generics.ListAPIView):
+    """
+    GET /api/v1/movies/?ordering=-id|-release_year|-avg_score|-popularity&page_size=20&cursor=...
+    정렬은 MovieCursorPagination 이 (정렬값, id) 키셋으로 처리 → 페이지당 쿼리 1번
+
+    필터: genre / country / year_min·max / runtime_min·max / person·role (movies.facets)
+      첫 페이지(cursor 없음)에는 count 와 facets(장르/국가/연대/상영 시간별 수)를 같이 보낸다.
+
+    캐시: 페이지(영화 id 목록 + 이전/다음 링크)는 정렬 필드 버전으로 (필터가 있으면 facets 버전도),
+          영화 카드는 영화별 버전으로 따로 캐시 (movies.cache)
+    """
+    queryset = Movie.objects.only(
+        'id', 'release_year', 'rating_avg', 'popularity', 'trending_score', 'bayesian_avg',
+    )
+    card_queryset = Movie.objects.only(
+        'id', 'title', 'poster_url', 'release_year', 'rating_count', 'rating_avg',
+    )
     serializer_class = MovieListSerializer
+    pagination_class = MovieCursorPagination
+    facet_filters = True
+    filters = {}
+    matched_ids = None
+
+    def get_filters(self):
+        if not self.facet_filters:
+            return {}
+        try:
+            return facets.parse_filters(self.request.query_params)
+        except ValueError as e:
+            raise ValidationError({'detail': str(e)})
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if not self.filters:
+            return queryset
+        # 걸러진 영화가 적으면 비트맵 결과 id 로, 많으면 SQL 조건으로
+        if self.matched_ids is not None and len(self.matched_ids) <= facets.MAX_ID_FILTER:
+            return queryset.filter(id__in=self.matched_ids.tolist())
+        return facets.apply_filters(queryset, self.filters)
+
+    def list(self, request, *args, **kwargs):
+        paginator = self.paginator
+        field, _ = paginator.orderings[paginator.get_ordering(request)]
+        name = f'movies:{movie_cache.url_key(request)}'
+        self.filters = self.get_filters()
+        with_facets = self.facet_filters and not request.query_params.get(paginator.cursor_query_param)
+
+        names = ['all', movie_cache.order_key(field)]
+        if self.filters or with_facets:
+            names.append(facets.FACETS_KEY)
+        all_versions = movie_cache.get_versions(names)
+        # 필터 없는 페이지는 영화/장르가 바뀌어도(facets) 순서가 그대로
+        order_versions = all_versions if self.filters else all_versions.only(*names[:2])
+
+        index = found = None
+        if self.filters or with_facets:
+            facet_version = (all_versions['all'], all_versions[facets.FACETS_KEY])
+            index = facets.get_index(facet_version)
+            found = index.search(self.filters)
+            # 다른 요청이 색인을 다시 만드는 중이면 (이전 색인) 결과 id 는 쓰지 않는다
+            if index.version == facet_version:
+                self.matched_ids = found[0]
+
+        def build_page():
+            page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+            return {
+                'ids': [movie.id for movie in page],
+                'next': paginator.get_next_link(),
+                'previous': paginator.get_previous_link(),
+            }
+
+        page = movie_cache.cached(name, order_versions, build_page)
+
+        # ETag = 페이지 순서 버전 + 페이지에 든 영화들 버전 → 맞으면 카드는 꺼내지도 않고 304
+        versions = (all_versions if with_facets else order_versions).merge(
+            movie_cache.get_versions(movie_cache.movie_key(movie_id) for movie_id in page['ids'])
+        )
+        etag = versions.etag(name)
+        response = not_modified(request, etag, versions.last_modified)
+        if response is not None:
+            return response
+
+        body = {
+            'next': page['next'],
+            'previous': page['previous'],
+            'results': movie_cache.cached_cards(
+                self.serializer_class, self.card_queryset, page['ids'], versions=versions,
+            ),
+        }
+        if with_facets:
+            body['count'], body['facets'] = found[1], found[2]
+            if index.version != facet_version:
+                return Response(body)
+        return set_validators(Response(body), etag, versions.last_modified)
+
+
+class TrendingMovieListAPIView(MovieListAPIView):
+    """
+    GET /api/v1/movies/trending/?page_size=20&cursor=...
+    최근 평점/리뷰/좋아요/워치리스트 활동을 시간 감쇠로 합친 점수순 (update_rankings 배치가 갱신)
+    (trending_score, id) 인덱스 키셋 → 페이지 크기만큼만 읽는다
+    """
+    queryset = MovieListAPIView.queryset.filter(trending_score__gt=0)
+    pagination_class = TrendingCursorPagination
+    facet_filters = False
+
+
+class TopRatedMovieListAPIView(MovieListAPIView):
+    """
+    GET /api/v1/movies/top-rated/?page_size=20&cursor=...
+    베이즈 평균순: 평점 몇 개뿐인 5점 영화가 평점 많은 4.5점 영화보다 위로 가지 않게
+    """
+    queryset = MovieListAPIView.queryset.filter(rating_count__gt=0)
+    pagination_class = TopRatedCursorPagination
+    facet_filters = False
+
+
+class MovieSearchAPIView(ReplicaReadMixin, APIView):
+    """
+    GET /api/v1/movies/search/?q=봉준호&limit=20
+    제목 / 원제 / 줄거리 / 출연진 이름 검색. 단어마다 접두어로 찾으므로 입력 중 자동완성에도 사용
+    순위는 search 모듈(FTS5 bm25 또는 python 역색인)이 정하고, 영화 카드는 목록과 같은 캐시에서
+    """
+    max_limit = 50
+
+    def get(self, request):
+        q = request.query_params.get('q', '').strip()
+        try:
+            limit = int(request.query_params.get('limit', 20))
+        except ValueError:
+            limit = 20
+        limit = max(1, min(limit, self.max_limit))
+
+        movie_ids = search_movie_ids(q, limit=limit)
+        return Response(movie_cache.cached_cards(
+            MovieListSerializer, MovieListAPIView.card_queryset, movie_ids,
+        ))
 
 
-class MovieDetailAPIView(generics.RetrieveAPIView):
-    queryset = Movie.objects.all()
+class MovieDetailAPIView(ReplicaReadMixin, generics.RetrieveAPIView):
+    """
+    출연진 수와 상관없이 쿼리 3번
+      1) 영화 + (로그인 시) 내 평점 / 워치리스트 여부 annotate
+      2) 장르 prefetch
+      3) 출연진 prefetch (person 은 select_related 로 같이)
+
+    캐시: 내 평점 / 워치리스트 여부를 뺀 나머지를 movie:<id> 버전으로 캐시.
+          캐시에서 꺼낸 뒤에는 로그인 유저 필드만 쿼리 1번으로 채운다. (익명은 0번)
+    """
     serializer_class = MovieDetailSerializer
+    user_fields = ('user_score', 'is_in_watchlist')
+
+    def use_replica(self, request):
+        # 평점/워치리스트를 누른 직후 다시 읽는 "내 평점" 은 복제 지연이 보이면 안 된다
+        return not request.user.is_authenticated
+
+    @staticmethod
+    def annotate_user_fields(queryset, user):
+        return queryset.annotate(
+            user_score=Subquery(
+                Rating.objects.filter(movie=OuterRef('pk'), user=user).values('score')[:1]
+            ),
+            in_watchlist=Exists(
+                WatchList.objects.filter(movie=OuterRef('pk'), user=user)
+            ),
+        )
+
+    def get_queryset(self):
+        queryset = Movie.objects.prefetch_related(
+            'genres',
+            Prefetch('casts', queryset=MovieCast.objects.select_related('person').order_by('id')),
+        )
+        user = self.request.user
+        if user.is_authenticated:
+            queryset = self.annotate_user_fields(queryset, user)
+        return queryset
 
     # request 넣어주려고 override
     def get_serializer_context(self):
@@ -43,6 +229,54 @@ class MovieDetailAPIView(generics.RetrieveAPIView):
         context['request'] = self.request
         return context
 
+    @classmethod
+    def user_fields_query(cls, movie_id, user):
+        return cls.annotate_user_fields(
+            Movie.objects.filter(pk=movie_id), user,
+        ).values('user_score', 'in_watchlist')
+
+    def get_user_fields(self, movie_id):
+        user = self.request.user
+        if not user.is_authenticated:
+            return {'user_score': None, 'is_in_watchlist': False}
+        return self.to_user_fields(self.user_fields_query(movie_id, user).first())
+
+    @staticmethod
+    def to_user_fields(row):
+        row = row or {}
+        score = row.get('user_score')
+        return {
+            'user_score': float(score) if score is not None else None,
+            'is_in_watchlist': bool(row.get('in_watchlist')),
+        }
+
+    def retrieve(self, request, *args, **kwargs):
+        movie_id = self.kwargs['pk']
+        movie_key = movie_cache.movie_key(movie_id)
+        name = f'movie-detail:{movie_id}'
+        versions = movie_cache.get_versions(['all', movie_key, movie_cache.user_key(request.user.pk)])
+
+        etag = versions.etag(name)
+        response = not_modified(request, etag, versions.last_modified)
+        if response is not None:
+            return response
+
+        built = {}
+
+        def build():
+            built.update(self.get_serializer(self.get_object()).data)
+            return {k: v for k, v in built.items() if k not in self.user_fields}
+
+        # 캐시 키에는 유저 버전을 빼고 (익명 공통 부분만)
+        data = movie_cache.cached(name, versions.only('all', movie_key), build)
+        if built:
+            user_fields = {k: built[k] for k in self.user_fields}
+        else:
+            user_fields = self.get_user_fields(movie_id)
+        return set_validators(
+            Response({**data, **user_fields}), etag, versions.last_modified,
+        )
+
 
 # ─────────────────────────────────────────────
 # 평점 생성/수정
@@ -54,12 +288,12 @@ class RatingCreateUpdateAPIView(APIView):
 
     def post(self, request, movie_pk):
         movie = get_object_or_404(Movie, pk=movie_pk)
-        score = request.data.get('score')
+        serializer = RatingSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
-        rating, created = Rating.objects.update_or_create(
-            user=request.user,
-            movie=movie,
-            defaults={'score': score},
+        # 평점 저장 + Movie 집계(count/sum/histogram) 갱신을 한 트랜잭션으로
+        rating, created = save_rating(
+            request.user, movie.id, serializer.validated_data['score'],
         )
         serializer = RatingSerializer(rating)
         return Response(
@@ -69,6 +303,59 @@ class RatingCreateUpdateAPIView(APIView):
 
 
 
+# ─────────────────────────────────────────────
+# 평점 / 워치리스트 일괄 저장 (온보딩)
+# ─────────────────────────────────────────────
+
+class RatingBulkAPIView(APIView):
+    """
+    POST /api/v1/ratings/bulk/
+      body: { "items": [{ "movie": 1, "score": 4.5 }, ...] }  (최대 100개)
+    영화 id 검증 1번 + upsert / 집계 갱신은 한 트랜잭션 (영화 수와 상관없이 쿼리 수 일정)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = BulkRatingSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        scores = {item['movie']: item['score'] for item in serializer.validated_data['items']}
+        created, updated = save_ratings(request.user, scores)
+        return Response({'created': created, 'updated': updated})
+
+
+class WatchListBulkAPIView(APIView):
+    """
+    POST /api/v1/watchlist/bulk/
+      body: { "items": [{ "movie": 1, "status": "WANT" }, ...] }  (status 생략 시 WANT, 최대 100개)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = BulkWatchListSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user = request.user
+        statuses = {item['movie']: item['status'] for item in serializer.validated_data['items']}
+        with transaction.atomic():
+            existing = set(
+                WatchList.objects.filter(user=user, movie_id__in=statuses.keys())
+                .values_list('movie_id', flat=True)
+            )
+            WatchList.objects.bulk_create(
+                [WatchList(user=user, movie_id=movie_id, status=status_value)
+                 for movie_id, status_value in statuses.items()],
+                update_conflicts=True,
+                unique_fields=['user', 'movie'],
+                update_fields=['status', 'updated_at'],
+            )
+            # bulk_create 는 시그널이 없으므로 내 워치리스트 버전은 직접
+            movie_cache.bump(movie_cache.user_key(user.pk))
+
+        created = len(statuses.keys() - existing)
+        return Response({'created': created, 'updated': len(statuses) - created})
+
+
 # ─────────────────────────────────────────────
 # 리뷰 목록 / 생성 (익명 닉네임 + 내용)
 # ─────────────────────────────────────────────
@@ -82,18 +369,55 @@ class ReviewListCreateAPIView(generics.ListCreateAPIView):
     serializer_class = ReviewSerializer
     # ✅ 로그인 안 해도 작성 가능하게 풀기 (임시)
     permission_classes = [permissions.AllowAny]
+    # 최신순 cursor 페이지네이션 ((movie, -created_at, -id) 인덱스)
+    pagination_class = ReviewCursorPagination
 
     def get_queryset(self):
         movie_id = self.kwargs['movie_id']
-        return Review.objects.filter(movie_id=movie_id).order_by('-created_at')
+        return Review.objects.filter(movie_id=movie_id)
+
+    def list(self, request, *args, **kwargs):
+        # 리뷰 버전(작성/삭제/좋아요) + 내 좋아요 버전이 그대로면 304
+        versions = movie_cache.get_versions([
+            'all',
+            movie_cache.review_key(self.kwargs['movie_id']),
+            movie_cache.user_key(request.user.pk),
+        ])
+        etag = versions.etag(f'reviews:{movie_cache.url_key(request)}')
+        response = not_modified(request, etag, versions.last_modified)
+        if response is not None:
+            return response
+
+        return set_validators(self.list_page(request), etag, versions.last_modified)
+
+    def list_page(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        reviews = page if page is not None else list(queryset)
+
+        # "내가 좋아요 누른 리뷰" 는 목록 전체를 쿼리 한 번으로
+        context = self.get_serializer_context()
+        if request.user.is_authenticated:
+            context['liked_review_ids'] = set(
+                LikeReview.objects.filter(
+                    user=request.user, review_id__in=[r.id for r in reviews],
+                ).values_list('review_id', flat=True)
+            )
+        else:
+            context['liked_review_ids'] = set()
+
+        serializer = self.get_serializer(reviews, many=True, context=context)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
 
     def perform_create(self, serializer):
         movie_id = self.kwargs['movie_id']
         # Review 모델에 user 필드 없으니까 movie 만 저장
+        # (Movie.latest_review 는 signals.set_latest_review 에서)
         serializer.save(movie_id=movie_id)
 
 
-
 # ─────────────────────────────────────────────
 # 리뷰 좋아요 토글
 # ─────────────────────────────────────────────
@@ -102,20 +426,15 @@ class ReviewLikeToggleAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, review_pk):
-        review = get_object_or_404(Review, pk=review_pk)
-        like, created = LikeReview.objects.get_or_create(
-            review=review,
-            user=request.user,
-        )
-        if not created:
-            like.delete()
-            liked = False
-        else:
-            liked = True
+        # LikeReview 추가/삭제 + Review.like_count ±1 을 한 트랜잭션으로
+        result = toggle_review_like(request.user, review_pk)
+        if result is None:
+            raise Http404
+        liked, like_count = result
 
         return Response({
             'liked': liked,
-            'like_count': review.likes.count(),
+            'like_count': like_count,
         })
 
 
@@ -157,33 +476,275 @@ class WatchListToggleAPIView(APIView):
 
 
 # ─────────────────────────────────────────────
-# 비슷한 영화 (나라 기준 간단 추천)
+# 비슷한 영화 (build_similarity 로 미리 계산한 top-K)
 # ─────────────────────────────────────────────
 
-class SimilarMovieAPIView(generics.ListAPIView):
+class SimilarMovieAPIView(ReplicaReadMixin, generics.ListAPIView):
+    """
+    이웃 id 목록은 유사도 빌드(similarity) / 인기순(order:trending_score, order:popularity) 버전으로,
+    영화 카드는 영화별 버전으로 캐시
+    """
     serializer_class = MovieSerializer
+    card_queryset = Movie.objects.only(
+        'id', 'title', 'poster_url', 'release_year', 'country', 'runtime',
+        'rating_count', 'rating_avg',
+    )
+    limit = 10
+
+    def get_neighbor_ids(self):
+        # (movie, rank) 인덱스로 한 번에 조회
+        movie_id = self.kwargs['movie_id']
+        ids = list(
+            MovieSimilarity.objects.filter(movie_id=movie_id)
+            .order_by('rank').values_list('similar_id', flat=True)[:self.limit]
+        )
 
-    def get_queryset(self):
+        # 아직 유사도 계산 전인 영화면 인기순 몇 개 (우리 트렌딩 점수, 활동이 없으면 TMDB popularity)
+        if not ids:
+            ids = list(
+                Movie.objects.exclude(id=movie_id).filter(trending_score__gt=0)
+                .order_by('-trending_score', '-id').values_list('id', flat=True)[:self.limit]
+            )
+        if len(ids) < self.limit:
+            ids += list(
+                Movie.objects.exclude(id__in=[movie_id, *ids])
+                .order_by('-popularity', '-id').values_list('id', flat=True)[:self.limit - len(ids)]
+            )
+        return ids
+
+    def list(self, request, *args, **kwargs):
         movie_id = self.kwargs['movie_id']
-        movie = Movie.objects.get(id=movie_id)
+        ids = movie_cache.cached(
+            f'similar:{movie_id}',
+            movie_cache.get_versions([
+                'all', 'similarity',
+                movie_cache.order_key('trending_score'), movie_cache.order_key('popularity'),
+            ]),
+            self.get_neighbor_ids,
+        )
+        return Response(movie_cache.cached_cards(self.serializer_class, self.card_queryset, ids))
 
-        # 1) 장르 기준
-        qs = Movie.objects.filter(
-            genres__in=movie.genres.all()
-        ).exclude(id=movie.id).distinct()
 
-        # 2) 없으면 같은 country
-        if not qs.exists():
-            qs = Movie.objects.filter(
-                country=movie.country
-            ).exclude(id=movie.id)
 
-        # 3) 그것도 없으면 그냥 인기순 몇 개
-        if not qs.exists():
-            qs = Movie.objects.exclude(id=movie.id)
+# ─────────────────────────────────────────────
+# 인물 (배우 / 감독) 페이지
+# ─────────────────────────────────────────────
+
+class PersonDetailAPIView(ReplicaReadMixin, APIView):
+    """
+    GET /api/v1/persons/<pk>/
+    응답: {id, name, profile, credits: {"actor": 12, "director": 3}}
+    쿼리 2번: 인물 values() + 역할별 출연 수 ((person, role) 인덱스로 GROUP BY)
+    """
+
+    def get(self, request, pk):
+        person = Person.objects.filter(pk=pk).values('id', 'name', 'profile').first()
+        if person is None:
+            raise Http404
+        person['credits'] = dict(
+            MovieCast.objects.filter(person_id=pk)
+            .values_list('role').annotate(n=Count('id')).order_by('role')
+        )
+        return Response(person)
+
+
+class PersonMovieListAPIView(ReplicaReadMixin, APIView):
+    """
+    GET /api/v1/persons/<pk>/movies/?role=director&ordering=-year|year|-rating|rating
+    필모그래피: 영화마다 한 번, 그 영화에서 맡은 역할들은 roles 로 묶어서
+      [{id, title, poster_url, release_year, avg_score, roles: [{role, character_name}]}, ...]
+    - (person, role) 인덱스 + 영화 JOIN 쿼리 1번을 values() 로 읽는다 (행마다 ORM 객체를 만들지 않음)
+    - 결과가 비었을 때만 인물이 있는지 한 번 더 확인 (없으면 404)
+    """
+    orderings = {
+        '-year': (F('movie__release_year').desc(nulls_last=True), '-movie_id'),
+        'year': (F('movie__release_year').asc(nulls_last=True), 'movie_id'),
+        '-rating': ('-movie__rating_avg', '-movie__rating_count', '-movie_id'),
+        'rating': ('movie__rating_avg', 'movie__rating_count', 'movie_id'),
+    }
+    default_ordering = '-year'
+    roles = tuple(role for role, _ in MovieCast.ROLE_CHOICES)
+
+    def get(self, request, pk):
+        role = request.query_params.get('role')
+        if role and role not in self.roles:
+            raise ValidationError({'role': f'{", ".join(self.roles)} 중 하나여야 합니다.'})
+        ordering = request.query_params.get('ordering') or self.default_ordering
+        if ordering not in self.orderings:
+            raise ValidationError({'ordering': f'{", ".join(self.orderings)} 중 하나여야 합니다.'})
+
+        credits = MovieCast.objects.filter(person_id=pk)
+        if role:
+            credits = credits.filter(role=role)
+        rows = credits.order_by(*self.orderings[ordering], 'id').values_list(
+            'movie_id', 'movie__title', 'movie__poster_url', 'movie__release_year',
+            'movie__rating_count', 'movie__rating_avg', 'role', 'character_name',
+        )
+
+        movies = {}
+        for movie_id, title, poster_url, year, rating_count, rating_avg, cast_role, character in rows:
+            movie = movies.get(movie_id)
+            if movie is None:
+                movie = movies[movie_id] = {
+                    'id': movie_id,
+                    'title': title,
+                    'poster_url': poster_url,
+                    'release_year': year,
+                    'avg_score': rating_avg if rating_count else None,
+                    'roles': [],
+                }
+            movie['roles'].append({'role': cast_role, 'character_name': character})
+
+        if not movies and not Person.objects.filter(pk=pk).exists():
+            raise Http404
+        return Response(list(movies.values()))
+
+
+# ─────────────────────────────────────────────
+# 개인화 추천 (train_recommender 로 학습한 ALS 모델)
+# ─────────────────────────────────────────────
+
+class RecommendationAPIView(APIView):
+    """
+    GET /api/v1/recommendations/me/?limit=20
+    이미 평점을 줬거나 워치리스트에 넣은 영화는 제외
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    max_limit = 100
 
-        return qs[:10]
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get('limit', 20))
+        except ValueError:
+            limit = 20
+        limit = max(1, min(limit, self.max_limit))
 
+        movies = recommend_for_user(request.user, limit=limit)
+        return Response(MOVIE_ROWS.serialize_objects(movies))
+
+
+# ─────────────────────────────────────────────
+# 취향이 비슷한 사람들이 좋아한 영화 (build_user_similarity 로 계산한 이웃)
+# ─────────────────────────────────────────────
+
+class FeedAPIView(APIView):
+    """
+    GET /api/v1/feed/me/?limit=20
+    이웃 유저들이 높게 준(FEED_MIN_SCORE) 영화를 유사도 가중 합으로 순위, liked_by = 좋아한 이웃 수
+    이미 평점을 줬거나 워치리스트에 넣은 영화는 제외. 이웃이 아직 없으면 빈 리스트
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    max_limit = 100
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get('limit', 20))
+        except ValueError:
+            limit = 20
+        limit = max(1, min(limit, self.max_limit))
+
+        ranked = feed_for_user(request.user, limit=limit)
+        rows = Movie.objects.filter(id__in=[movie_id for movie_id, _, _ in ranked]).values(*MOVIE_ROWS.columns)
+        cards = {card['id']: card for card in MOVIE_ROWS.serialize_many(rows)}
+        return Response([
+            {**cards[movie_id], 'liked_by': liked_by}
+            for movie_id, _, liked_by in ranked if movie_id in cards
+        ])
+
+
+# ─────────────────────────────────────────────
+# 영화 여러 편에 대한 내 상태 (포스터 그리드 배지용)
+# ─────────────────────────────────────────────
+
+class MyMovieStateAPIView(APIView):
+    """
+    GET /api/v1/me/state/?ids=1,2,3  (최대 100편)
+    응답: { "1": {"score": 4.5, "status": "WANT", "liked_reviews": 2}, ... }
+      - 상태가 하나도 없는 영화는 빠지고, 없는 항목(평점 없음 등)도 키를 생략
+    쿼리 2번 (둘 다 user 인덱스)
+      1) 평점 UNION ALL 워치리스트
+      2) 내가 좋아요 누른 리뷰 수 (영화별 GROUP BY)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    max_ids = 100
+
+    def get_movie_ids(self, request):
+        raw = ','.join(request.query_params.getlist('ids'))
+        try:
+            ids = list(dict.fromkeys(int(part) for part in raw.split(',') if part.strip()))
+        except ValueError:
+            raise ValidationError({'ids': '영화 id 는 쉼표로 구분한 숫자여야 합니다.'})
+        if len(ids) > self.max_ids:
+            raise ValidationError({'ids': f'한 번에 최대 {self.max_ids}편까지 조회할 수 있습니다.'})
+        return ids
+
+    def get(self, request):
+        movie_ids = self.get_movie_ids(request)
+        if not movie_ids:
+            return Response({})
+        user = request.user
+
+        ratings = Rating.objects.filter(user=user, movie_id__in=movie_ids).annotate(
+            rating=F('score'), watch=Value(None, output_field=CharField()),
+        ).values_list('movie_id', 'rating', 'watch')
+        watchlist = WatchList.objects.filter(user=user, movie_id__in=movie_ids).annotate(
+            rating=Value(None, output_field=Rating._meta.get_field('score')),
+            watch=F('status'),
+        ).values_list('movie_id', 'rating', 'watch')
+
+        states = {}
+        for movie_id, score, watch in ratings.union(watchlist, all=True):
+            state = states.setdefault(str(movie_id), {})
+            if score is not None:
+                state['score'] = float(score)
+            if watch is not None:
+                state['status'] = watch
+
+        liked = (
+            LikeReview.objects.filter(user=user, review__movie_id__in=movie_ids)
+            .values_list('review__movie_id')
+            .annotate(n=Count('id'))
+            .order_by()
+        )
+        for movie_id, count in liked:
+            states.setdefault(str(movie_id), {})['liked_reviews'] = count
+
+        return Response(states)
+
+
+# ─────────────────────────────────────────────
+# 상호작용 내보내기 (관리자, 오프라인 학습용)
+# ─────────────────────────────────────────────
+
+class InteractionExportAPIView(APIView):
+    """
+    GET /api/v1/export/interactions/?type=csv|jsonl|npz&kinds=rating,like&since=2025-01-01T00:00:00Z
+      - 청크 단위로 흘려보내서(StreamingHttpResponse) 행 수와 상관없이 메모리 일정
+      - 응답 헤더 X-Export-Until 을 다음 요청의 since 로 넘기면 그 뒤로 바뀐 행만
+      (?format= 은 DRF 의 렌더러 선택에 쓰이므로 형식은 type 으로 받는다)
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        fmt = request.query_params.get('type', 'csv')
+        if fmt not in export.FORMATS:
+            raise ValidationError({'type': f'{", ".join(export.FORMATS)} 중 하나여야 합니다.'})
+        try:
+            kinds = export.parse_kinds(request.query_params.get('kinds'))
+            since = export.parse_since(request.query_params.get('since'))
+        except ValueError as e:
+            raise ValidationError({'detail': str(e)})
+
+        until = timezone.now()
+        response = StreamingHttpResponse(
+            export.export_interactions(fmt, kinds=kinds, since=since, until=until),
+            content_type=export.CONTENT_TYPES[fmt],
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="interactions-{until:%Y%m%dT%H%M%S}.{fmt}"'
+        )
+        response['X-Export-Until'] = until.isoformat()
+        return response
 
 
 # ─────────────────────────────────────────────
@@ -203,24 +764,82 @@ class MeAPIView(APIView):
         serializer = UserSerializer(request.user)
         return Response(serializer.data)
 
+def with_user_score(queryset, user):
+    """WatchList 목록에 그 유저의 평점(user_score)을 LEFT JOIN 한 번으로 (행마다 조회하지 않음)"""
+    return queryset.annotate(
+        own_rating=FilteredRelation('movie__ratings', condition=Q(movie__ratings__user=user)),
+        user_score=F('own_rating__score'),
+    )
+
+
 class MyWatchListAPIView(generics.ListAPIView):
     """
-    GET /api/v1/watchlist/me/
+    GET /api/v1/watchlist/me/?status=WANT|DONE|DROP&page_size=20&cursor=...
     임시: 로그인 안 되어 있으면 dummy 유저 기준으로 조회
+    - 최신순 cursor 페이지네이션 ((user, status, created_at) / (user, created_at) 인덱스)
+    - 항목마다 내 평점(user_score)을 같은 쿼리에서 조인
+    - 첫 페이지(cursor 없음)에는 상태별 개수 counts 를 GROUP BY 쿼리 한 번으로
+    ETag: 내 워치리스트 버전(상태 / 평점) + 페이지에 든 영화들 버전
     """
     serializer_class = WatchListItemSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = WatchListCursorPagination
+    statuses = tuple(status for status, _ in WatchList.STATUS_CHOICES)
 
-    def get_queryset(self):
+    def get_user(self):
         if self.request.user.is_authenticated:
-            user = self.request.user
-        else:
-            user = get_dummy_user()
+            return self.request.user
+        return get_dummy_user()
+
+    def get_status(self):
+        status_param = self.request.query_params.get('status')
+        if status_param and status_param not in self.statuses:
+            raise ValidationError({'status': f'{", ".join(self.statuses)} 중 하나여야 합니다.'})
+        return status_param
+
+    def get_queryset(self):
+        return self.get_user_queryset(self.get_user())
 
+    def get_user_queryset(self, user):
         if user is None:
             return WatchList.objects.none()
 
-        return WatchList.objects.filter(
-            user=user
-        ).select_related('movie').order_by('-created_at')
+        queryset = WatchList.objects.filter(user=user)
+        status_param = self.get_status()
+        if status_param:
+            queryset = queryset.filter(status=status_param)
+        return with_user_score(queryset, user)
 
+    def count_query(self, user):
+        return WatchList.objects.filter(user=user).values_list('status').annotate(n=Count('id')).order_by()
+
+    def get_counts(self, user):
+        counts = dict.fromkeys(self.statuses, 0)
+        counts.update(self.count_query(user))
+        return counts
+
+    def list(self, request, *args, **kwargs):
+        user = self.get_user()
+        first_page = not request.query_params.get(self.paginator.cursor_query_param)
+        if user is None:
+            body = {'next': None, 'previous': None, 'results': []}
+            if first_page:
+                body['counts'] = dict.fromkeys(self.statuses, 0)
+            return Response(body)
+
+        # 내 상태 / 평점 버전은 행보다 먼저 읽는다 (cache.py 의 순서 규칙)
+        versions = movie_cache.get_versions(['all', movie_cache.user_key(user.pk)])
+        # 모델 객체 대신 values() 행으로 (WatchListItemSerializer 와 같은 결과)
+        rows = self.paginate_queryset(self.get_queryset().values(*WATCHLIST_ITEM_ROWS.columns))
+        versions = versions.merge(
+            movie_cache.get_versions(movie_cache.movie_key(row['movie__id']) for row in rows)
+        )
+        etag = versions.etag(f'watchlist:{user.pk}:{movie_cache.url_key(request)}')
+        response = not_modified(request, etag, versions.last_modified)
+        if response is not None:
+            return response
+
+        response = self.get_paginated_response(WATCHLIST_ITEM_ROWS.serialize_many(rows))
+        if first_page:
+            response.data['counts'] = self.get_counts(user)
+        return set_validators(response, etag, versions.last_modified)
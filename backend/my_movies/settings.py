@@ -14,6 +14,7 @@ load_dotenv(BASE_DIR / ".env")
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 TMDB_API_KEY = os.getenv("TMDB_API_KEY")
+TMDB_API_BASE = os.getenv("TMDB_API_BASE", "https://api.themoviedb.org/3")
 
 # 환경변수에서 DEBUG 가져오기 (기본값 True)
 DEBUG = os.getenv("DEBUG", "True") == "True"
@@ -80,13 +81,64 @@ WSGI_APPLICATION = 'my_movies.wsgi.application'
 
 # -------------------------------------------------------------------
 # 데이터베이스
+#   DB_ENGINE=sqlite(기본) | postgres
+#   sqlite   : DB_NAME(파일 경로). 연결마다 WAL / synchronous=NORMAL / mmap / busy timeout,
+#              쓰기 트랜잭션은 BEGIN IMMEDIATE (잠금 승격 중 "database is locked" 방지)
+#              SQLITE_TUNING=0 이면 Django 기본값 (벤치마크 비교용)
+#   postgres : DB_NAME / DB_USER / DB_PASSWORD / DB_HOST / DB_PORT
+#              DB_CONN_MAX_AGE(초, 지속 연결) 또는 DB_POOL=1 (psycopg 3 연결 풀)
+#              pip install "psycopg[binary,pool]" 필요
+#              DB_REPLICA_HOSTS=host1,host2 → 읽기 전용 카탈로그 뷰는 복제본에서 (movies.routers)
 # -------------------------------------------------------------------
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+DB_ENGINE = os.getenv("DB_ENGINE", "sqlite")
+
+if DB_ENGINE == "postgres":
+    DB_POOL = os.getenv("DB_POOL", "0") == "1"
+    _default_db = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.getenv("DB_NAME", "my_movies"),
+        "USER": os.getenv("DB_USER", "postgres"),
+        "PASSWORD": os.getenv("DB_PASSWORD", ""),
+        "HOST": os.getenv("DB_HOST", "127.0.0.1"),
+        "PORT": os.getenv("DB_PORT", "5432"),
+        # 풀을 쓰면 연결 재사용은 풀이 맡는다 (Django 는 CONN_MAX_AGE=0 이어야 함)
+        "CONN_MAX_AGE": 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "pool": {
+                "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+                "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+                "timeout": int(os.getenv("DB_POOL_TIMEOUT", "10")),
+            },
+        } if DB_POOL else {},
     }
-}
+    DATABASES = {"default": _default_db}
+    _replica_hosts = [host.strip() for host in os.getenv("DB_REPLICA_HOSTS", "").split(",") if host.strip()]
+    for _i, _host in enumerate(_replica_hosts):
+        # 테스트 때는 복제본을 따로 만들지 않고 default 를 그대로 본다
+        DATABASES[f"replica_{_i}"] = {**_default_db, "HOST": _host, "TEST": {"MIRROR": "default"}}
+else:
+    SQLITE_TUNING = os.getenv("SQLITE_TUNING", "1") == "1"
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("DB_NAME", BASE_DIR / "db.sqlite3"),
+            "OPTIONS": {
+                # 다른 연결이 쓰는 중이면 이 시간(초)까지 기다림 (busy_timeout)
+                "timeout": float(os.getenv("SQLITE_BUSY_TIMEOUT", "20")),
+                "transaction_mode": "IMMEDIATE",
+                "init_command": (
+                    "PRAGMA journal_mode=WAL;"
+                    "PRAGMA synchronous=NORMAL;"
+                    f"PRAGMA mmap_size={int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))};"
+                    "PRAGMA temp_store=MEMORY;"
+                ),
+            } if SQLITE_TUNING else {},
+        }
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["movies.routers.ReplicaRouter"] if DATABASE_REPLICAS else []
 
 # -------------------------------------------------------------------
 # 비밀번호 정책
@@ -133,8 +185,102 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.AllowAny',
     ),
+    # orjson 이 있으면 orjson 으로 (응답 바이트는 DRF JSONRenderer 와 같음, movies.fastpath)
+    'DEFAULT_RENDERER_CLASSES': (
+        'movies.fastpath.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+}
+
+# 페이지네이션은 뷰마다 pagination_class 로 지정 (movies.pagination)
+# 기본 페이지 크기 / ?page_size= 로 요청할 수 있는 최대 크기
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "20"))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "100"))
+
+# -------------------------------------------------------------------
+# 추천 / 유사도 (오프라인 계산 결과)
+# -------------------------------------------------------------------
+SIMILARITY_TOP_K = int(os.getenv("SIMILARITY_TOP_K", "20"))
+RECOMMEND_MODEL_DIR = Path(os.getenv("RECOMMEND_MODEL_DIR", BASE_DIR / "var" / "recommend"))
+# 유저-유저 협업 필터링 (build_user_similarity → /api/v1/feed/me/)
+USER_SIMILARITY_TOP_K = int(os.getenv("USER_SIMILARITY_TOP_K", "50"))
+USER_SIMILARITY_METRIC = os.getenv("USER_SIMILARITY_METRIC", "pearson")       # pearson | cosine
+USER_SIMILARITY_SHRINKAGE = float(os.getenv("USER_SIMILARITY_SHRINKAGE", "10"))
+FEED_MIN_SCORE = float(os.getenv("FEED_MIN_SCORE", "4.0"))        # 이웃이 "좋아한" 평점
+FEED_MIN_NEIGHBORS = int(os.getenv("FEED_MIN_NEIGHBORS", "2"))    # 좋아한 이웃이 이 수 이상인 영화만
+
+# -------------------------------------------------------------------
+# 랭킹 (update_rankings 배치: 트렌딩 / 베이즈 평균)
+# -------------------------------------------------------------------
+TRENDING_HALF_LIFE_DAYS = float(os.getenv("TRENDING_HALF_LIFE_DAYS", "3"))
+RANKING_PRIOR_VOTES = int(os.getenv("RANKING_PRIOR_VOTES", "10"))
+
+# -------------------------------------------------------------------
+# 검색 (fts5: SQLite FTS5 테이블, python: 프로세스 메모리 역색인)
+# -------------------------------------------------------------------
+MOVIE_SEARCH_BACKEND = os.getenv("MOVIE_SEARCH_BACKEND", "fts5")
+
+# -------------------------------------------------------------------
+# 응답 캐시 (movies.cache, 버전 키 방식이라 TIMEOUT 은 메모리 회수용)
+#   locmem(기본, 프로세스별 LRU) | file | redis(호환 서버) | dummy(끄기)
+# -------------------------------------------------------------------
+MOVIE_CACHE_BACKEND = os.getenv("MOVIE_CACHE_BACKEND", "locmem")
+MOVIE_CACHE_MAX_ENTRIES = int(os.getenv("MOVIE_CACHE_MAX_ENTRIES", "50000"))
+MOVIE_CACHE_BACKENDS = {
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "movies",
+        "OPTIONS": {"MAX_ENTRIES": MOVIE_CACHE_MAX_ENTRIES},
+    },
+    "file": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv("MOVIE_CACHE_LOCATION", str(BASE_DIR / "var" / "cache")),
+        "OPTIONS": {"MAX_ENTRIES": MOVIE_CACHE_MAX_ENTRIES},
+    },
+    "redis": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("MOVIE_CACHE_LOCATION", "redis://127.0.0.1:6379/1"),
+    },
+    "dummy": {
+        "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+    },
+}
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "movies": {
+        **MOVIE_CACHE_BACKENDS[MOVIE_CACHE_BACKEND],
+        "TIMEOUT": int(os.getenv("MOVIE_CACHE_TIMEOUT", "86400")),
+        "KEY_PREFIX": "movies",
+    },
 }
 
+# -------------------------------------------------------------------
+# 프로파일링 (movies.profiling, 기본 꺼짐. 켜면 미들웨어 + /metrics)
+#   PROFILING_SAMPLE_RATE   : SQL / 직렬화 / 렌더링 시간을 잴 요청 비율 → Server-Timing 헤더, /metrics
+#   PROFILING_CPROFILE_RATE : cProfile 로 떠서 PROFILING_DIR/<view>/ 에 남길 요청 비율
+#   PROFILING_METRICS_TOKEN : /metrics 에 필요한 Bearer 토큰 (없으면 로컬에서만)
+# -------------------------------------------------------------------
+PROFILING = os.getenv("PROFILING", "0") == "1"
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "1.0"))
+PROFILING_CPROFILE_RATE = float(os.getenv("PROFILING_CPROFILE_RATE", "0"))
+PROFILING_N_PLUS_ONE = int(os.getenv("PROFILING_N_PLUS_ONE", "5"))
+PROFILING_DIR = Path(os.getenv("PROFILING_DIR", BASE_DIR / "var" / "profiles"))
+PROFILING_KEEP = int(os.getenv("PROFILING_KEEP", "20"))
+PROFILING_METRICS_TOKEN = os.getenv("PROFILING_METRICS_TOKEN", "")
+if PROFILING:
+    MIDDLEWARE.insert(0, "movies.profiling.ProfilingMiddleware")
+
+# -------------------------------------------------------------------
+# ASGI (my_movies.asgi:application, 예: uvicorn --workers 4)
+#   ASYNC_VIEWS=1 : 영화 목록 / 상세 / 리뷰 목록 / 비슷한 영화 / 내 워치리스트 GET 을
+#                   async 뷰로 (movies.async_views). WSGI 로 띄울 때는 끄는 게 낫다
+#   BENCH_DB_LATENCY_MS : (벤치마크 전용) 쿼리마다 이만큼 기다린다 → 네트워크 너머 DB 흉내 (bench_asgi)
+# -------------------------------------------------------------------
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", "0") == "1"
+BENCH_DB_LATENCY_MS = float(os.getenv("BENCH_DB_LATENCY_MS", "0"))
+
 # -------------------------------------------------------------------
 # CORS / CSRF 설정
 # -------------------------------------------------------------------
@@ -35,4 +35,8 @@ urlpatterns = [
     path('api/v1/auth/me/', MeAPIView.as_view(), name='me'),
 ]
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+if settings.PROFILING:
+    from movies.profiling import metrics_view
+    urlpatterns.append(path('metrics', metrics_view))
\ No newline at end of file